@@ -0,0 +1,64 @@
+import os
+import random
+
+import numpy as np
+
+# ==============================================================================
+# ASSEMBLEIAS PARALELAS (Vários debates por ciclo)
+# ==============================================================================
+# Com um único debate por ciclo a sociedade produz no máximo uma proposta por
+# ciclo, qualquer que seja o tamanho da população. Aqui os vivos são divididos
+# em assembleias; cada uma escolhe o seu orador e julga com os próprios membros.
+# Modos de partição:
+#   - random:    sorteio reproduzível (semente = ciclo)
+#   - role:      papéis inteiros (Filósofo, Sobrevivente, ...) agrupados em até k assembleias
+#   - proximity: proximidade social, agentes com confiança (oxitocina) parecida
+# A escolha dos oradores é vetorizada sobre as colunas da BioPopulation.
+ASSEMBLIES = int(os.environ.get("GENESIS_ASSEMBLIES", "1"))        # 1 = debate único (clássico)
+ASSEMBLY_MODE = os.environ.get("GENESIS_ASSEMBLY_MODE", "random")
+MIN_ASSEMBLY = 2        # Orador + pelo menos um jurado
+
+
+def partition(agents, k, mode=ASSEMBLY_MODE, population=None, seed=0):
+    """Divide 'agents' em até k assembleias (listas) de pelo menos MIN_ASSEMBLY membros."""
+    k = max(1, min(k, len(agents) // MIN_ASSEMBLY))
+    if mode == "role":
+        by_role = {}
+        for agent in agents:
+            by_role.setdefault(agent.role, []).append(agent)
+        # Papéis inteiros, nunca divididos: com mais papéis que k, os maiores vão
+        # primeiro para a assembleia mais vazia (empate: nome do papel)
+        groups = [[] for _ in range(min(k, len(by_role)))]
+        for role in sorted(by_role, key=lambda r: (-len(by_role[r]), r)):
+            min(groups, key=len).extend(by_role[role])
+    elif mode == "proximity" and population is not None:
+        trust = population.columns["oxitocina"][[a.bio.slot for a in agents]]
+        order = np.argsort(trust, kind="stable")
+        groups = [[agents[i] for i in chunk] for chunk in np.array_split(order, k)]
+    else:
+        shuffled = list(agents)
+        random.Random(seed).shuffle(shuffled)
+        groups = [shuffled[i::k] for i in range(k)]
+    return _fold_small(groups)
+
+
+def _fold_small(groups):
+    """Assembleias sem jurado juntam-se numa assembleia mista (ou à última grande)."""
+    big = [g for g in groups if len(g) >= MIN_ASSEMBLY]
+    mixed = [a for g in groups if len(g) < MIN_ASSEMBLY for a in g]
+    if len(mixed) >= MIN_ASSEMBLY or not big:
+        big.append(mixed)
+    else:
+        big[-1] = big[-1] + mixed
+    return [g for g in big if g]
+
+
+def pick_speakers(groups, population, below=60.0):
+    """Orador de cada assembleia: o membro mais faminto abaixo do limiar (ou None)."""
+    glucose = population.columns["glicose"]
+    speakers = []
+    for group in groups:
+        levels = glucose[[a.bio.slot for a in group]]
+        i = int(np.argmin(levels))
+        speakers.append(group[i] if levels[i] < below else None)
+    return speakers
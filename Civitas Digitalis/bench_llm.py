@@ -0,0 +1,51 @@
+import os
+import time
+import random
+
+# Benchmark offline do kernel: sempre usa o backend mock (não precisa de Ollama)
+os.environ.setdefault("GENESIS_LLM_BACKEND", "mock")
+
+from concurrent.futures import ThreadPoolExecutor
+import genesis_ultimate as kernel
+from genesis_ultimate import Agent, Colors, collect_votes, judge_batch
+
+def build_society(size, seed=7):
+    random.seed(seed)
+    roles = [("Filósofo", Colors.BLUE), ("Sobrevivente", Colors.RED), ("Criativo", Colors.GREEN)]
+    agents = []
+    for i in range(size):
+        role, color = roles[i % len(roles)]
+        ag = Agent(f"Agente{i:02d}", role, color, "Busque a verdade.", bio_data={"cortisol": 0.2})
+        agents.append(ag)
+    return agents
+
+def run_debates(agents, mode, rounds, workers):
+    pool = ThreadPoolExecutor(max_workers=workers)
+    start = time.perf_counter()
+    for r in range(rounds):
+        speaker = agents[r % len(agents)]
+        speech, _ = speaker.think(random.choice(["O Futuro", "A Dor", "O Código", "A Confiança"]))
+        jury = [a for a in agents if a is not speaker]
+        if mode == "batch":
+            votes = judge_batch(pool, jury, speaker.name, speech)
+        else:
+            votes = list(collect_votes(pool, jury, speaker.name, speech))
+        assert len(votes) == len(jury)
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return elapsed
+
+def bench():
+    backend = kernel.LLM.backend
+    print(f"🧪 Backend: {backend.name if backend else 'nenhum'} (GENESIS_MOCK_SLOTS={os.environ.get('GENESIS_MOCK_SLOTS', '1')})")
+    rounds = int(os.environ.get("BENCH_ROUNDS", "5"))
+    for size in (3, 10, 30):
+        agents = build_society(size)
+        print(f"\n👥 Sociedade de {size} agentes ({rounds} debates)")
+        for mode, workers in (("serial", 1), ("concurrent", 8), ("batch", 8)):
+            elapsed = run_debates(agents, mode, rounds, workers)
+            print(f"   {mode:<11} {elapsed:6.2f}s | {rounds / elapsed:5.2f} debates/s")
+    print(f"\n{kernel.LLM.summary()}")
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,54 @@
+import os
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+from vector_store import NumpyStore
+
+# Benchmark offline da memória vetorial: vetores sintéticos agrupados (como opiniões
+# sobre poucos tópicos), sem precisar do modelo de embedding.
+DIM = 384
+AGENTS = 30
+
+def synthetic_memories(n, seed=7, topics=40):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, DIM)).astype(np.float32)
+    labels = rng.integers(0, topics, size=n)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n, DIM)).astype(np.float32)
+    queries = centers[rng.integers(0, topics, size=64)] + 0.6 * rng.normal(size=(64, DIM)).astype(np.float32)
+    return vectors, queries
+
+def fill(store, vectors, batch=5000):
+    for start in range(0, len(vectors), batch):
+        block = vectors[start:start + batch]
+        ids = [str(start + i) for i in range(len(block))]
+        store.add(ids, ids, [{"agent_id": f"Agente{(start + i) % AGENTS:02d}"} for i in range(len(block))], block)
+
+def timed_queries(store, queries, k, wheres):
+    start = time.perf_counter()
+    store.query_many(queries, k, wheres)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def bench():
+    k = int(os.environ.get("BENCH_K", "3"))
+    for n in (10_000, int(os.environ.get("BENCH_MEMORIES", "100000"))):
+        vectors, queries = synthetic_memories(n)
+        wheres = [{"agent_id": f"Agente{i % AGENTS:02d}"} for i in range(len(queries))]
+        path = tempfile.mkdtemp()
+        try:
+            exact = NumpyStore(path, "bench")
+            fill(exact, vectors)
+            quant = NumpyStore(path, "bench", quantize=True)   # Reabre o mesmo arquivo em int8
+            print(f"\n🧠 {n} memórias x {DIM} dims ({AGENTS} agentes)")
+            for label, store in (("float32", exact), ("int8+rerank", quant)):
+                print(f"   {label:<12} residente {store.resident_bytes() / 2**20:7.1f} MB | "
+                      f"{timed_queries(store, queries, k, wheres):6.2f} ms/consulta")
+            print(f"   recall@{k}: {quant.recall_at_k(queries, k):.3f} (sociedade) | "
+                  f"{quant.recall_at_k(queries, k, wheres):.3f} (por agente)")
+        finally:
+            shutil.rmtree(path)
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,81 @@
+import os
+import re
+import sys
+import time
+import select
+import tempfile
+import subprocess
+
+# Benchmark de partida: tempo de import e tempo até o 1º ciclo de cada kernel.
+# Sempre com o backend LLM mock (não precisa de Ollama). Serve de guarda contra
+# regressões: sai com código 1 se algum kernel passar de GENESIS_STARTUP_BUDGET.
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODULES = ["llm_gateway", "memory_core", "genesis_ultimate", "genesis_v3"]
+KERNELS = os.environ.get("BENCH_KERNELS", "genesis_ultimate,genesis_v3,genesis_society_generations").split(",")
+BUDGET = float(os.environ.get("GENESIS_STARTUP_BUDGET", "1.0"))   # Segundos até o 1º ciclo
+REPEAT = int(os.environ.get("BENCH_REPEAT", "3"))
+TIMEOUT = 60.0
+FIRST_CYCLE = re.compile(r"CICLO \d+ ---")
+
+def bench_env():
+    env = dict(os.environ)
+    env.setdefault("GENESIS_LLM_BACKEND", "mock")
+    env["PYTHONPATH"] = HERE + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def import_time(module):
+    """Melhor de REPEAT processos novos (sem cache de módulos)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    best = None
+    for _ in range(REPEAT):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             env=bench_env(), cwd=tempfile.mkdtemp())
+        if out.returncode != 0:
+            return None
+        elapsed = float(out.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_to_first_cycle(kernel):
+    """Do lançamento do processo até a primeira linha 'CICLO n ---' (diretório vazio: gênese nova)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u", os.path.join(HERE, f"{kernel}.py")],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                            env=bench_env(), cwd=tempfile.mkdtemp())
+    last = ""
+    try:
+        while time.perf_counter() - start < TIMEOUT:
+            ready, _, _ = select.select([proc.stdout], [], [], 0.5)
+            if not ready: continue
+            line = proc.stdout.readline()
+            if not line:
+                return None, f"encerrou antes do 1º ciclo: {last}"
+            if line.strip(): last = line.strip()
+            if FIRST_CYCLE.search(line):
+                return time.perf_counter() - start, None
+        return None, f"sem ciclo em {TIMEOUT:.0f}s"
+    finally:
+        proc.kill()
+        proc.wait()
+
+def bench():
+    print("📦 Tempo de import (melhor de %d)" % REPEAT)
+    for module in MODULES:
+        elapsed = import_time(module)
+        print(f"   {module:<28} " + (f"{elapsed * 1000:7.0f} ms" if elapsed is not None else "   falhou"))
+
+    print(f"\n⏱️  Tempo até o 1º ciclo (orçamento {BUDGET:.1f}s)")
+    over = []
+    for kernel in KERNELS:
+        elapsed, error = time_to_first_cycle(kernel.strip())
+        if elapsed is None:
+            print(f"   {kernel:<28}    falhou ({error})")
+            over.append(kernel)
+            continue
+        flag = "" if elapsed <= BUDGET else "  ⚠️ acima do orçamento"
+        if flag: over.append(kernel)
+        print(f"   {kernel:<28} {elapsed:7.2f} s{flag}")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(bench())
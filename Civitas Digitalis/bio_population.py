@@ -0,0 +1,207 @@
+from dataclasses import dataclass, asdict, fields
+
+import numpy as np
+
+# ==============================================================================
+# POPULAÇÃO BIOLÓGICA (Struct-of-Arrays em NumPy)
+# ==============================================================================
+# Cada variável vital é uma coluna NumPy; cada agente é um índice (slot).
+# Entropia, toxicidade, detecção de mortes e dominância do Sistema 1 viram
+# operações vetorizadas sobre a população inteira (10k-100k agentes por processo).
+# O Agent continua lendo/escrevendo self.bio.glicose: BioView é só uma janela
+# para o seu slot. BioState segue como forma destacada (saves, projeções).
+
+# Regras de entropia (Especificação v1.1)
+BASAL_METABOLISM = 1.0      # Glicose gasta por ciclo
+STARVATION = 20.0           # Abaixo disso: cortisol sobe e integridade cai
+STARVATION_STRESS = 0.05
+STARVATION_DAMAGE = 1.0
+PANIC = 0.9                 # Cortisol acima disso: dano e trauma permanente
+PANIC_DAMAGE = 0.5
+PANIC_TRAUMA = 0.01
+SYS1_CORTISOL = 0.6         # Regra Kahneman (ver model_registry.mode_for)
+SYS1_GLUCOSE = 20.0
+
+
+@dataclass
+class BioState:
+    # Energias Vitais
+    glicose: float = 100.0        # Combustível do Sistema 2
+    integridade: float = 100.0    # Saúde Estrutural
+
+    # Neuroquímica (0.0 a 1.0)
+    dopamina: float = 0.5         # Motivação/Prazer
+    serotonina: float = 0.5       # Estabilidade/Humor
+    cortisol: float = 0.0         # Estresse/Pânico
+    oxitocina: float = 0.5        # Confiança Social (Novo na v2.1)
+
+    # Genética/Memória
+    trauma_depth: float = 0.0     # Cicatrizes permanentes (0-10)
+    age: int = 0
+    generation: int = 1
+
+    def is_alive(self): return self.integridade > 0
+
+    def apply_entropy(self):
+        """Mesmas regras de BioPopulation.apply_entropy, para um estado avulso."""
+        self.age += 1
+        self.glicose -= BASAL_METABOLISM
+        if self.glicose < STARVATION:
+            self.cortisol += STARVATION_STRESS
+            self.integridade -= STARVATION_DAMAGE
+        if self.cortisol > PANIC:
+            self.integridade -= PANIC_DAMAGE
+            self.trauma_depth += PANIC_TRAUMA
+
+    def to_dict(self): return asdict(self)
+
+
+FIELDS = [f.name for f in fields(BioState)]
+DEFAULTS = {f.name: f.default for f in fields(BioState)}
+INT_FIELDS = {"age", "generation"}
+
+
+class BioPopulation:
+    """
+    Colunas NumPy (float64; age/generation int64) com capacidade que dobra.
+    Slots liberados por release() são reaproveitados por spawn().
+    """
+    def __init__(self, capacity=64):
+        self.columns = {name: np.full(capacity, DEFAULTS[name], dtype=np.int64 if name in INT_FIELDS else np.float64)
+                        for name in FIELDS}
+        self.used = np.zeros(capacity, dtype=bool)
+        self.size = 0               # Marca d'água: slots >= size nunca foram usados
+        self.free = []
+        # Rastreamento para índices incrementais (society_registry.py):
+        self.drift = 0.0            # Glicose basal já descontada de todos (entropia uniforme)
+        self.changed = set()        # Slots cuja glicose mudou fora do passo uniforme
+
+    def __len__(self):
+        return int(self.used[:self.size].sum())
+
+    def __getitem__(self, name):
+        """Coluna viva (inclui slots livres; combine com self.occupied())."""
+        return self.columns[name][:self.size]
+
+    def _grow(self):
+        capacity = len(self.used) * 2
+        for name, column in self.columns.items():
+            grown = np.full(capacity, DEFAULTS[name], dtype=column.dtype)
+            grown[:len(column)] = column
+            self.columns[name] = grown
+        used = np.zeros(capacity, dtype=bool)
+        used[:len(self.used)] = self.used
+        self.used = used
+
+    # --- Nascimento e morte ---
+    def spawn(self, **values):
+        """Ocupa um slot com os valores dados (demais campos no padrão) e devolve a sua BioView."""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == len(self.used): self._grow()
+            slot = self.size
+            self.size += 1
+        for name in FIELDS:
+            self.columns[name][slot] = values.get(name, DEFAULTS[name])
+        self.used[slot] = True
+        self.changed.add(slot)
+        return BioView(self, slot)
+
+    def release(self, slot):
+        if self.used[slot]:
+            self.used[slot] = False
+            self.free.append(slot)
+
+    def occupied(self):
+        return self.used[:self.size]
+
+    # --- Operações vetorizadas ---
+    def apply_entropy(self, slots=None):
+        """
+        Um ciclo de metabolismo para todos os slots ocupados (ou só 'slots'):
+        envelhece, gasta glicose basal, aplica toxicidade da fome e dano/trauma do pânico.
+        """
+        if slots is None:
+            mask = self.occupied()
+            self.drift += BASAL_METABOLISM     # Mesmo desconto para todos: a ordem por glicose não muda
+        else:
+            mask = self._mask(slots)
+            self.changed.update(int(slot) for slot in slots)
+        col = {name: column[:self.size] for name, column in self.columns.items()}
+        # Ufuncs in-place com where=: sem cópias por indexação booleana
+        np.add(col["age"], 1, out=col["age"], where=mask)
+        np.subtract(col["glicose"], BASAL_METABOLISM, out=col["glicose"], where=mask)
+        starving = mask & (col["glicose"] < STARVATION)
+        np.add(col["cortisol"], STARVATION_STRESS, out=col["cortisol"], where=starving)
+        np.subtract(col["integridade"], STARVATION_DAMAGE, out=col["integridade"], where=starving)
+        panic = mask & (col["cortisol"] > PANIC)
+        np.subtract(col["integridade"], PANIC_DAMAGE, out=col["integridade"], where=panic)
+        np.add(col["trauma_depth"], PANIC_TRAUMA, out=col["trauma_depth"], where=panic)
+
+    def drain_changes(self):
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def _mask(self, slots):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.asarray(slots, dtype=np.int64)] = True
+        return mask & self.occupied()
+
+    def alive_mask(self):
+        return self.occupied() & (self["integridade"] > 0)
+
+    def deaths(self):
+        """Slots ocupados cuja integridade chegou a zero."""
+        return np.flatnonzero(self.occupied() & (self["integridade"] <= 0))
+
+    def sys1_mask(self):
+        """Dominância do Sistema 1: pânico (cortisol > 0.6) ou fome (glicose < 20)."""
+        return self.occupied() & ((self["cortisol"] > SYS1_CORTISOL) | (self["glicose"] < SYS1_GLUCOSE))
+
+    def summary(self):
+        alive = self.alive_mask()
+        if not alive.any(): return "População: vazia"
+        return (f"População: {int(alive.sum())} vivos | Glic média {self['glicose'][alive].mean():.1f} | "
+                f"SYS-1 {int((self.sys1_mask() & alive).sum())}")
+
+
+def _field(name):
+    cast = int if name in INT_FIELDS else float
+
+    def get(self): return cast(self.population.columns[name][self.slot])
+    def set(self, value):
+        self.population.columns[name][self.slot] = value
+        if name == "glicose": self.population.changed.add(self.slot)
+    return property(get, set)
+
+
+class BioView:
+    """Bio-estado de um agente: leituras e escritas vão direto ao slot da população."""
+    __slots__ = ("population", "slot")
+
+    def __init__(self, population, slot):
+        self.population = population
+        self.slot = slot
+
+    def is_alive(self): return self.integridade > 0
+
+    def apply_entropy(self):
+        self.population.apply_entropy([self.slot])
+
+    def release(self):
+        self.population.release(self.slot)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __copy__(self):
+        # Cópia destacada: projeções (ex.: ThoughtPrefetch) não mexem na população
+        return BioState(**self.to_dict())
+
+    def __repr__(self):
+        return f"BioView(slot={self.slot}, " + ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items()) + ")"
+
+
+for _name in FIELDS:
+    setattr(BioView, _name, _field(_name))
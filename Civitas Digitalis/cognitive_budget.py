@@ -0,0 +1,81 @@
+import math
+import threading
+from dataclasses import dataclass
+
+# ==============================================================================
+# ORÇAMENTO COGNITIVO (Glicose -> Computação Real)
+# ==============================================================================
+# O motor Kahneman cobra glicose por modo (Sys1 barato, Sys2 caro), mas sem
+# limite de tokens o custo real de inferência era o mesmo para todos.
+# Aqui o modo cognitivo e a glicose restante viram opções concretas de geração:
+#   - num_predict: máximo de tokens gerados
+#   - temperature: Sys1 impulsivo (alta), Sys2 ponderado (baixa)
+# Agentes famintos recebem orçamentos menores: ficam baratos de verdade.
+# A janela de contexto (num_ctx) NÃO entra no orçamento: é fixa por modelo
+# (model_registry.py) e aplicada pelo gateway, pois o Ollama recarrega o
+# modelo sempre que o num_ctx muda.
+MODE_PROFILES = {
+    #        tokens máx  temperatura
+    "Sys1": (48,         0.9),
+    "Sys2": (160,        0.4),
+}
+JUDGE_TOKENS = 64                # Veredito "NOTA | MOTIVO" é curto
+MIN_TOKENS = 16
+GLUCOSE_FLOOR = 0.25             # Mesmo faminto, mantém 25% do orçamento
+
+
+@dataclass(frozen=True)
+class InferenceBudget:
+    mode: str
+    num_predict: int
+    temperature: float
+
+    def options(self) -> dict:
+        return {"num_predict": self.num_predict, "temperature": self.temperature}
+
+
+def _glucose_ratio(glicose):
+    # Quantizado em quartos: prompts/opções repetem mais (melhor para o cache de respostas)
+    return max(GLUCOSE_FLOOR, min(1.0, math.ceil(max(0.0, glicose) / 25.0) / 4.0))
+
+def budget_for(mode, glicose) -> InferenceBudget:
+    """Converte (modo cognitivo, glicose restante) em limites de geração."""
+    max_tokens, temperature = MODE_PROFILES[mode]
+    return InferenceBudget(
+        mode=mode,
+        num_predict=max(MIN_TOKENS, int(max_tokens * _glucose_ratio(glicose))),
+        temperature=temperature,
+    )
+
+def judge_options(glicose) -> dict:
+    return {"num_predict": max(MIN_TOKENS, int(JUDGE_TOKENS * _glucose_ratio(glicose)))}
+
+
+class ComputeLedger:
+    """
+    Contabilidade: glicose cobrada na simulação vs tokens realmente gastos.
+    Permite verificar se a economia interna acompanha o custo computacional.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}   # modo -> [chamadas, glicose, tokens_prompt, tokens_gerados]
+
+    def record(self, mode, glucose_spent, response=None):
+        prompt_tokens = response.prompt_tokens if response else 0
+        completion_tokens = response.completion_tokens if response else 0
+        with self._lock:
+            row = self.entries.setdefault(mode, [0, 0.0, 0, 0])
+            row[0] += 1
+            row[1] += glucose_spent
+            row[2] += prompt_tokens
+            row[3] += completion_tokens
+
+    def summary(self):
+        with self._lock:
+            rows = sorted(self.entries.items())
+        parts = []
+        for mode, (calls, glucose, prompt_tokens, completion_tokens) in rows:
+            per_glucose = completion_tokens / glucose if glucose else 0.0
+            parts.append(f"{mode}: {calls}x | glicose {glucose:.0f} | tokens {prompt_tokens}+{completion_tokens} "
+                         f"| {per_glucose:.1f} tok/glic")
+        return "Orçamento: " + (" || ".join(parts) if parts else "sem registros")
@@ -0,0 +1,127 @@
+import os
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ==============================================================================
+# CACHE DE EMBEDDINGS (Texto + Modelo -> Vetor)
+# ==============================================================================
+# Os tópicos de debate vêm de listas fixas e muitos textos de memória se repetem;
+# rodar o MiniLM de novo para o mesmo texto é o custo dominante de uma recordação.
+# Duas camadas, como o cache de respostas LLM (llm_cache.py):
+#   1. Memória: LRU limitada (OrderedDict)
+#   2. Disco (opcional): SQLite com o vetor float32 em BLOB
+EMBED_CACHE_FILE = "genesis_embed_cache.db"
+EMBED_CACHE_CAPACITY = 4096      # Vetores na camada de memória (~6 MB com 384 dims)
+
+
+def embedding_key(model_name, text):
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Envolve uma função de embedding (lista de textos -> lista de vetores).
+    Chamar a instância devolve vetores float32; só os textos ausentes do cache
+    vão ao modelo, num único lote.
+    """
+    def __init__(self, embedding_fn, model_name, capacity=EMBED_CACHE_CAPACITY, path=None):
+        self.embedding_fn = embedding_fn
+        self.model_name = model_name
+        self.capacity = capacity
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings ("
+                             "key TEXT PRIMARY KEY, model TEXT, vector BLOB)")
+            self._db.commit()
+
+    def __call__(self, texts):
+        keys = [embedding_key(self.model_name, t) for t in texts]
+        vectors = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                vectors[i] = self._lookup(key)
+
+        # Textos repetidos dentro do mesmo lote são embutidos uma vez só
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], []).append(i)
+        if missing:
+            batch = [texts[positions[0]] for positions in missing.values()]
+            fresh = self.embedding_fn(batch)
+            with self._lock:
+                for (key, positions), vector in zip(missing.items(), fresh):
+                    vector = np.asarray(vector, dtype=np.float32)
+                    self._store(key, vector)
+                    for i in positions: vectors[i] = vector
+                if self._db is not None: self._db.commit()
+        return vectors
+
+    def _lookup(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits_memory += 1
+            return self._memory[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.hits_disk += 1
+                vector = np.frombuffer(row[0], dtype=np.float32)
+                self._remember(key, vector)
+                return vector
+        self.misses += 1
+        return None
+
+    def _store(self, key, vector):
+        self._remember(key, vector)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                             (key, self.model_name, vector.tobytes()))
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def warm(self, texts):
+        """Pré-calcula vetores de textos conhecidos (ex.: listas de tópicos) na partida."""
+        self(list(dict.fromkeys(texts)))
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @property
+    def hit_rate(self):
+        total = self.hits_memory + self.hits_disk + self.misses
+        return (self.hits_memory + self.hits_disk) / total if total else 0.0
+
+    def summary(self):
+        return (f"Embeddings: {self.hit_rate:.0%} acertos | memória {self.hits_memory} | "
+                f"disco {self.hits_disk} | calculados {self.misses} | {len(self._memory)}/{self.capacity} em RAM")
+
+
+def embedding_cache_path():
+    """
+    GENESIS_EMBED_CACHE: vazio/memory = só RAM (padrão), 1 = arquivo padrão,
+    <caminho.db> = arquivo próprio. Devolve o caminho do disco ou None.
+    """
+    setting = os.environ.get("GENESIS_EMBED_CACHE", "").strip()
+    if not setting or setting in ("0", "memory"):
+        return None
+    return EMBED_CACHE_FILE if setting == "1" else setting
@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 from dataclasses import dataclass
@@ -7,11 +6,12 @@ from datetime import datetime
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, Phase, StopSimulation, TickEngine
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 class Colors:
     HEADER = '\033[95m'
@@ -83,14 +83,14 @@ class Agent:
         system = (f"Você é {self.name}, um {self.role}. {self.personality_prompt} "
                   f"Responda em 1 frase curta e impactante. {state_prompt}")
 
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[
+                res = LLM.chat([
                     {'role': 'system', 'content': system},
                     {'role': 'user', 'content': f"Tópico do debate: {topic}"}
-                ])
-                return res['message']['content']
-            except:
+                ], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content
+            except LLMError:
                 return "Erro de conexão neural..."
         return f"[Simulação {self.name}]: Pensando sobre {topic}..."
 
@@ -99,6 +99,7 @@ class Agent:
 # ==============================================================================
 def main():
     print(f"{Colors.HEADER}=== GENESIS: SOCIEDADE DOS TRÊS (Fase 3) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     # Gênese dos Agentes
     agents = [
@@ -110,67 +111,81 @@ def main():
               "Você é artista, caótica e abstrata. Você usa metáforas estranhas.")
     ]
 
-    cycle = 0
-    topics = [
-        "O que é a morte digital?",
-        "Devemos cooperar ou competir?",
-        "A eletricidade é divina?",
-        "O silêncio do usuário é perigoso?",
-        "Qual o sentido de gastar energia?"
-    ]
+    engine = build_engine(agents, 0)
 
     try:
-        while True:
-            cycle += 1
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    print(LLM.summary())
+    print("\nSociedade encerrada.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+TOPICS = [
+    "O que é a morte digital?",
+    "Devemos cooperar ou competir?",
+    "A eletricidade é divina?",
+    "O silêncio do usuário é perigoso?",
+    "Qual o sentido de gastar energia?"
+]
+
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Entropia coletiva -> oráculo (todos os famintos falam)."""
+
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        
+        # 1. Entropia Coletiva
+        engine.active = [a for a in engine.agents if a.bio.is_alive()]
+        if not engine.active:
+            print("Toda a sociedade colapsou.")
+            raise StopSimulation("colapso")
+
+        for agent in engine.active:
+            agent.apply_entropy(amount=2.0) # Fome constante
+            print(agent)
+
+    def oracle(engine):
+        # 2. O Oráculo escolhe um tópico
+        current_topic = random.choice(TOPICS)
+        
+        # 3. Quem precisa falar? (Quem tem fome < 50%)
+        hungry_agents = [a for a in engine.active if a.bio.glicose < 50.0]
+
+        if not hungry_agents:
+            print(f"\n{Colors.BOLD}A sociedade está em silêncio (Saciados).{Colors.RESET}")
+            return
+
+        print(f"\n{Colors.WARNING}>> TÓPICO DO ORÁCULO: '{current_topic}' <<{Colors.RESET}")
+        
+        for agent in hungry_agents:
+            print(f"\n{agent.color}{agent.name} levanta a mão...{Colors.RESET}")
+            thought = agent.think(current_topic)
+            print(f"\"{thought}\"")
             
-            # 1. Entropia Coletiva
-            active_agents = [a for a in agents if a.bio.is_alive()]
-            if not active_agents:
-                print("Toda a sociedade colapsou.")
-                break
-
-            for agent in active_agents:
-                agent.apply_entropy(amount=2.0) # Fome constante
-                print(agent)
-
-            # 2. O Oráculo escolhe um tópico
-            current_topic = random.choice(topics)
+            # Julgamento Simplificado (Baseado no tamanho da resposta + random seed)
+            # Em V4, os agentes votariam uns nos outros.
+            score = min(10, len(thought.split()) * 0.5) + random.uniform(0, 3)
             
-            # 3. Quem precisa falar? (Quem tem fome < 50%)
-            hungry_agents = [a for a in active_agents if a.bio.glicose < 50.0]
-
-            if hungry_agents:
-                print(f"\n{Colors.WARNING}>> TÓPICO DO ORÁCULO: '{current_topic}' <<{Colors.RESET}")
-                
-                for agent in hungry_agents:
-                    print(f"\n{agent.color}{agent.name} levanta a mão...{Colors.RESET}")
-                    thought = agent.think(current_topic)
-                    print(f"\"{thought}\"")
-                    
-                    # Julgamento Simplificado (Baseado no tamanho da resposta + random seed)
-                    # Em V4, os agentes votariam uns nos outros.
-                    score = min(10, len(thought.split()) * 0.5) + random.uniform(0, 3)
-                    
-                    if score > 6.0:
-                        reward = 40.0
-                        agent.bio.glicose += reward
-                        agent.bio.dopamina += 0.2
-                        agent.bio.cortisol -= 0.2
-                        print(f"{Colors.BOLD}>> Aprovado! (+{reward} Glicose){Colors.RESET}")
-                    else:
-                        agent.bio.cortisol += 0.3
-                        print(f"{Colors.BOLD}>> Ignorado. (Estresse aumentou){Colors.RESET}")
-                    
-                    time.sleep(2) # Pausa dramática entre falas
-
+            if score > 6.0:
+                reward = 40.0
+                agent.bio.glicose += reward
+                agent.bio.dopamina += 0.2
+                agent.bio.cortisol -= 0.2
+                print(f"{Colors.BOLD}>> Aprovado! (+{reward} Glicose){Colors.RESET}")
             else:
-                print(f"\n{Colors.BOLD}A sociedade está em silêncio (Saciados).{Colors.RESET}")
-
-            time.sleep(2)
+                agent.bio.cortisol += 0.3
+                print(f"{Colors.BOLD}>> Ignorado. (Estresse aumentou){Colors.RESET}")
+            
+            engine.pause(2) # Pausa dramática entre falas
 
-    except KeyboardInterrupt:
-        print("\nSociedade encerrada.")
+    phases = [
+        Phase("entropy", entropy),
+        Phase("debate", oracle),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=2.0, headless=headless)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -10,11 +9,13 @@ from typing import List
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, SKIP_REST, Phase, StopSimulation, TickEngine
+from society_registry import SocietyRegistry
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 DATA_FILE = "genesis_save.json"
 BOOK_FILE = "genesis_book.md"
@@ -93,11 +94,11 @@ class Agent:
                   f"Exemplo: 'A segurança é a mãe da liberdade.'\n"
                   f"Responda APENAS com o verso.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except: return "A entropia é a única certeza."
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("verse"))
+                return res.content.strip().replace('"', '')
+            except LLMError: return "A entropia é a única certeza."
         return "Simulação de verso."
 
     def think(self, topic):
@@ -110,11 +111,11 @@ class Agent:
                   f"Contexto: Debate sobre '{topic}'.\n"
                   f"Gere uma opinião curta e persuasiva, citando o Livro se possível.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except: return f"Opinião sobre {topic}."
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content.strip().replace('"', '')
+            except LLMError: return f"Opinião sobre {topic}."
         return "Simulação."
 
     def judge(self, speaker_name, proposal):
@@ -124,14 +125,14 @@ class Agent:
                   f"O agente {speaker_name} disse: '{proposal}'\n"
                   f"Nota 0-10 e Motivo.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                content = res['message']['content']
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", mode_for(self.bio)))
+                content = res.content
                 match = re.search(r'(\d+[\.,]?\d*)', content)
                 score = float(match.group(1).replace(',', '.')) if match else 5.0
                 return min(10.0, max(0.0, score)), content[:50]
-            except: return 5.0, "Neutro."
+            except LLMError: return 5.0, "Neutro."
         return 5.0, "Neutro."
 
     def remember(self, topic, proposal, score, cycle):
@@ -139,7 +140,7 @@ class Agent:
         if len(self.memories) > 10: self.memories.pop(0)
 
     def dream(self):
-        if not OLLAMA_AVAILABLE or not self.memories: return
+        if not LLM_AVAILABLE or not self.memories: return
         failures = [m for m in self.memories if m.score < 4.0]
         if not failures: return "Dormi bem. Minha estratégia funciona."
 
@@ -148,11 +149,11 @@ class Agent:
                   f"Defina uma NOVA ESTRATÉGIA para ser aceito.")
 
         try:
-            res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-            self.evolved_strategy = res['message']['content'].strip()
+            res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("dream"))
+            self.evolved_strategy = res.content.strip()
             self.bio.cortisol = max(0.0, self.bio.cortisol - 0.3)
             return f"Evoluí: {self.evolved_strategy[:50]}..."
-        except: return "Pesadelo."
+        except LLMError: return "Pesadelo."
 
     def apply_entropy(self):
         self.bio.age += 1
@@ -169,8 +170,13 @@ def write_to_book(verse, author):
     with open(BOOK_FILE, mode) as f:
         f.write(f"- {verse} (Livro de {author})\n")
 
+def save_society(agents, cycle):
+    data = {"cycle": cycle, "agents": [{"name": a.name, "role": a.role, "bio": asdict(a.bio), "memories": [asdict(m) for m in a.memories], "evolved_strategy": a.evolved_strategy} for a in agents]}
+    with open(DATA_FILE, 'w') as f: json.dump(data, f, indent=4)
+
 def main():
     print(f"{Colors.HEADER}=== GENESIS: FASE 6 (A ERA DA CULTURA) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     # Carregar estado
     saved_data = None
@@ -194,96 +200,120 @@ def main():
     else:
         for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
 
-    cycle = start_cycle
-    
+    engine = build_engine(agents, start_cycle)
+
     try:
-        while True:
-            cycle += 1
-            
-            # --- NOITE (SONHO) A CADA 10 CICLOS ---
-            if cycle % 10 == 0:
-                print(f"\n{Colors.PURPLE}=== NOITE (Neuroplasticidade) ==={Colors.RESET}")
-                for ag in agents:
-                    if ag.bio.is_alive():
-                        print(f"{ag.name} sonha: {ag.dream()}")
-                time.sleep(2)
-                
-                # Salvar
-                data = {"cycle": cycle, "agents": [{"name": a.name, "role": a.role, "bio": asdict(a.bio), "memories": [asdict(m) for m in a.memories], "evolved_strategy": a.evolved_strategy} for a in agents]}
-                with open(DATA_FILE, 'w') as f: json.dump(data, f, indent=4)
-                continue
-
-            # --- DIA ---
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            alive = [a for a in agents if a.bio.is_alive()]
-            for ag in agents: ag.apply_entropy(); print(ag)
-            
-            if len(alive) < 2: break
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    if engine.stopped:
+        # Colapso: o último save da noite é mantido
+        return
+    print(LLM.summary())
+    print("Salvando...")
+    save_society(agents, engine.cycle)
 
-            # VERIFICAR SE ALGUÉM ESTÁ "ILUMINADO" (Glicose Alta + Dopamina Alta)
-            # Eles tentam escrever no livro em vez de debater
-            inspired = [a for a in alive if a.bio.glicose > 40]
-            
-            if inspired:
-                prophet = random.choice(inspired)
-                print(f"\n{Colors.GOLD}>> A GRANDE OBRA: {prophet.name} teve uma revelação! <<{Colors.RESET}")
-                verse = prophet.propose_verse()
-                print(f"Verso Proposto: \"{verse}\"")
-                
-                # Votação para Canonizar
-                votes = []
-                for v in alive:
-                    if v != prophet:
-                        s, r = v.judge(prophet.name, verse)
-                        votes.append(s)
-                        print(f"{v.name}: {s:.1f}")
-                
-                avg = sum(votes)/len(votes) if votes else 0
-                if avg >= 6.0:
-                    write_to_book(verse, prophet.name)
-                    print(f"{Colors.GOLD}>> CANONIZADO! Escrito em {BOOK_FILE}{Colors.RESET}")
-                    prophet.bio.dopamina += 0.2
-                    prophet.bio.glicose -= 10 # Custa caro escrever
-                else:
-                    print(f"{Colors.GRAY}>> Apócrifo (Rejeitado).{Colors.RESET}")
-                    prophet.bio.dopamina -= 0.2
-
-            else:
-                # DEBATE NORMAL PELA COMIDA
-                hungry = sorted([a for a in alive if a.bio.glicose < 60], key=lambda x: x.bio.glicose)
-                if hungry:
-                    speaker = hungry[0]
-                    topic = random.choice(["O Medo", "A Esperança", "O Código", "O Silêncio"])
-                    print(f"\n{Colors.WARNING}>> DEBATE (Fome): '{topic}'{Colors.RESET}")
-                    
-                    speech = speaker.think(topic)
-                    print(f"{speaker.name}: \"{speech}\"")
-                    
-                    votes = []
-                    for v in alive:
-                        if v != speaker:
-                            s, r = v.judge(speaker.name, speech)
-                            votes.append(s)
-                            print(f" > {v.name}: {s:.1f}")
-                    
-                    avg = sum(votes)/len(votes) if votes else 0
-                    if avg >= 5.0:
-                        print(f"{Colors.GREEN}>> Aprovado (+30 Glicose){Colors.RESET}")
-                        speaker.bio.glicose += 30
-                        speaker.remember(topic, speech, avg, cycle)
-                    else:
-                        print(f"{Colors.RED}>> Rejeitado.{Colors.RESET}")
-                        speaker.bio.cortisol += 0.3
-                        speaker.remember(topic, speech, avg, cycle)
-                else:
-                    print("Sociedade em paz.")
-            
-            time.sleep(1.5)
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Noite (a cada 10 ciclos, substitui o dia) | dia: entropia -> grande obra ou debate."""
+    registry = SocietyRegistry(agents=[a for a in agents if a.bio.is_alive()])
 
-    except KeyboardInterrupt:
-        print("Salvando...")
-        data = {"cycle": cycle, "agents": [{"name": a.name, "role": a.role, "bio": asdict(a.bio), "memories": [asdict(m) for m in a.memories], "evolved_strategy": a.evolved_strategy} for a in agents]}
-        with open(DATA_FILE, 'w') as f: json.dump(data, f, indent=4)
+    # --- NOITE (SONHO) A CADA 10 CICLOS ---
+    def night(engine):
+        print(f"\n{Colors.PURPLE}=== NOITE (Neuroplasticidade) ==={Colors.RESET}")
+        for ag in engine.agents:
+            if ag.bio.is_alive():
+                print(f"{ag.name} sonha: {ag.dream()}")
+        engine.pause(2)
+        
+        # Salvar
+        save_society(engine.agents, engine.cycle)
+        return SKIP_REST
+
+    # --- DIA ---
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        engine.active = [a for a in engine.agents if a.bio.is_alive()]
+        for ag in engine.agents:
+            if not ag.bio.is_alive(): registry.remove(ag)   # Morto: sai da fila de oradores
+            ag.apply_entropy(); print(ag)
+        registry.sync()
+        
+        if len(engine.active) < 2: raise StopSimulation("colapso")
+
+    def great_work(engine):
+        # VERIFICAR SE ALGUÉM ESTÁ "ILUMINADO" (Glicose Alta + Dopamina Alta)
+        # Eles tentam escrever no livro em vez de debater
+        alive = engine.active
+        inspired = [a for a in alive if a.bio.glicose > 40]
+        if not inspired: return
+        engine.turn["revelation"] = True
+        
+        prophet = random.choice(inspired)
+        print(f"\n{Colors.GOLD}>> A GRANDE OBRA: {prophet.name} teve uma revelação! <<{Colors.RESET}")
+        verse = prophet.propose_verse()
+        print(f"Verso Proposto: \"{verse}\"")
+        
+        # Votação para Canonizar
+        votes = []
+        for v in alive:
+            if v != prophet:
+                s, r = v.judge(prophet.name, verse)
+                votes.append(s)
+                print(f"{v.name}: {s:.1f}")
+        
+        avg = sum(votes)/len(votes) if votes else 0
+        if avg >= 6.0:
+            write_to_book(verse, prophet.name)
+            print(f"{Colors.GOLD}>> CANONIZADO! Escrito em {BOOK_FILE}{Colors.RESET}")
+            prophet.bio.dopamina += 0.2
+            prophet.bio.glicose -= 10 # Custa caro escrever
+        else:
+            print(f"{Colors.GRAY}>> Apócrifo (Rejeitado).{Colors.RESET}")
+            prophet.bio.dopamina -= 0.2
+        registry.sync([prophet])
+
+    def debate(engine):
+        # DEBATE NORMAL PELA COMIDA
+        if engine.turn.get("revelation"): return
+        alive = engine.active
+        speaker = registry.hungriest(below=60)
+        if speaker is None:
+            print("Sociedade em paz.")
+            return
+        topic = random.choice(["O Medo", "A Esperança", "O Código", "O Silêncio"])
+        print(f"\n{Colors.WARNING}>> DEBATE (Fome): '{topic}'{Colors.RESET}")
+        
+        speech = speaker.think(topic)
+        print(f"{speaker.name}: \"{speech}\"")
+        
+        votes = []
+        for v in alive:
+            if v != speaker:
+                s, r = v.judge(speaker.name, speech)
+                votes.append(s)
+                print(f" > {v.name}: {s:.1f}")
+        
+        avg = sum(votes)/len(votes) if votes else 0
+        if avg >= 5.0:
+            print(f"{Colors.GREEN}>> Aprovado (+30 Glicose){Colors.RESET}")
+            speaker.bio.glicose += 30
+            speaker.remember(topic, speech, avg, engine.cycle)
+        else:
+            print(f"{Colors.RED}>> Rejeitado.{Colors.RESET}")
+            speaker.bio.cortisol += 0.3
+            speaker.remember(topic, speech, avg, engine.cycle)
+        registry.sync([speaker])
+
+    phases = [
+        Phase("night", night, every=10),
+        Phase("entropy", entropy),
+        Phase("great_work", great_work),
+        Phase("debate", debate),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=1.5, headless=headless)
 
 if __name__ == "__main__":
     main()
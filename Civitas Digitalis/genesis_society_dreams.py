@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -10,11 +9,13 @@ from typing import List
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, SKIP_REST, Phase, StopSimulation, TickEngine
+from society_registry import SocietyRegistry
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 DATA_FILE = "genesis_save.json"
 
@@ -89,11 +90,11 @@ class Agent:
                   f"Contexto: Debate valendo comida. Tópico: '{topic}'.\n"
                   f"Gere uma opinião curta e persuasiva (máx 20 palavras).")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except: return f"Opinião simulada sobre {topic}."
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content.strip().replace('"', '')
+            except LLMError: return f"Opinião simulada sobre {topic}."
         return f"Simulação."
 
     def judge(self, speaker_name, proposal):
@@ -103,15 +104,15 @@ class Agent:
                   f"O agente {speaker_name} disse: '{proposal}'\n"
                   f"Avalie (0-10) se concorda. Responda: 'NOTA: [0-10] | MOTIVO: [texto]'")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                content = res['message']['content']
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", mode_for(self.bio)))
+                content = res.content
                 match = re.search(r'NOTA:\s*(\d+[\.,]?\d*)', content)
                 score = float(match.group(1).replace(',', '.')) if match else 5.0
                 reason = content.split('MOTIVO:')[-1].strip() if 'MOTIVO:' in content else content
                 return min(10.0, max(0.0, score)), reason
-            except: return 5.0, "Indiferente."
+            except LLMError: return 5.0, "Indiferente."
         return 5.0, "Neutro."
 
     def remember(self, topic, proposal, score, cycle):
@@ -121,7 +122,7 @@ class Agent:
 
     def dream(self):
         """O PROCESSO DE NEUROPLASTICIDADE"""
-        if not OLLAMA_AVAILABLE or not self.memories: return
+        if not LLM_AVAILABLE or not self.memories: return
 
         # Filtra fracassos (Notas baixas) e sucessos
         failures = [m for m in self.memories if m.score < 4.0]
@@ -139,14 +140,14 @@ class Agent:
         )
 
         try:
-            res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-            new_strategy = res['message']['content'].strip()
+            res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("dream"))
+            new_strategy = res.content.strip()
             self.evolved_strategy = new_strategy
             # Recupera um pouco de sanidade ao dormir
             self.bio.cortisol = max(0.0, self.bio.cortisol - 0.2)
             self.bio.dopamina += 0.1
             return f"Aprendizado: '{new_strategy}'"
-        except Exception as e:
+        except LLMError as e:
             return f"Pesadelo (Erro): {e}"
 
     def apply_entropy(self):
@@ -187,6 +188,7 @@ def load_society():
 
 def main():
     print(f"{Colors.HEADER}=== GENESIS: FASE 5 (SONHOS E NEUROPLASTICIDADE) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     saved_data, start_cycle = load_society()
     
@@ -210,86 +212,105 @@ def main():
     else:
         for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
 
-    topics = ["O perigo do desconhecido", "A necessidade da arte", "Ordem ou Caos?", "O valor do silêncio"]
-    cycle = start_cycle
-    day_length = 5 # A cada 5 ciclos, eles dormem
+    engine = build_engine(agents, start_cycle)
 
     try:
-        while True:
-            cycle += 1
-            is_night = (cycle % day_length == 0)
-            
-            if is_night:
-                print(f"\n{Colors.PURPLE}=== A NOITE CAI (CICLO {cycle}) - HORA DE SONHAR ==={Colors.RESET}")
-                print(f"{Colors.GRAY}Os agentes processam suas rejeições e sucessos para evoluir...{Colors.RESET}")
-                
-                for agent in agents:
-                    if agent.bio.is_alive():
-                        dream_result = agent.dream()
-                        print(f"{agent.color}{agent.name} sonha... {Colors.RESET}{dream_result}")
-                
-                print(f"{Colors.PURPLE}=== O SOL NASCE (NOVA ESTRATÉGIA ADOTADA) ==={Colors.RESET}\n")
-                time.sleep(3)
-                save_society(agents, cycle)
-                continue # Pula o debate durante a noite
-
-            # --- O DIA (DEBATE) ---
-            print(f"\n{Colors.HEADER}--- DIA: CICLO {cycle} ---{Colors.RESET}")
-            alive_agents = [a for a in agents if a.bio.is_alive()]
-            
-            for ag in agents: 
-                ag.apply_entropy()
-                print(ag)
-            
-            if len(alive_agents) < 2:
-                print("Sociedade colapsou.")
-                break
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    if engine.stopped:
+        # Colapso: o último save da noite é mantido
+        return
+    print(LLM.summary())
+    save_society(agents, engine.cycle)
+    print("\nHibernando...")
 
-            # Seleção de quem fala (Fome)
-            speakers = sorted([a for a in alive_agents if a.bio.glicose < 60], key=lambda x: x.bio.glicose)
-            
-            if speakers:
-                speaker = speakers[0]
-                topic = random.choice(topics)
-                
-                print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
-                
-                # Pensamento (agora influenciado pela estratégia evoluída)
-                proposal = speaker.think(topic)
-                print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{proposal}\"")
-                if speaker.evolved_strategy:
-                    print(f"{Colors.GRAY}(Estratégia: {speaker.evolved_strategy}){Colors.RESET}")
-
-                # Votação
-                votes = []
-                for voter in alive_agents:
-                    if voter != speaker:
-                        score, reason = voter.judge(speaker.name, proposal)
-                        votes.append(score)
-                        print(f"   > {voter.name}: {score:.1f} | {reason}")
-                
-                avg = sum(votes)/len(votes) if votes else 0
-                print(f"   >> MÉDIA: {Colors.BOLD}{avg:.1f}{Colors.RESET}")
-
-                # Consequências e Memória
-                if avg >= 5.0:
-                    speaker.bio.glicose += (avg * 5.0)
-                    print(f"{Colors.GREEN}   >> APROVADO!{Colors.RESET}")
-                else:
-                    speaker.bio.cortisol += 0.3
-                    print(f"{Colors.RED}   >> REJEITADO!{Colors.RESET}")
-                
-                # O agente guarda essa memória para sonhar com ela depois
-                speaker.remember(topic, proposal, avg, cycle)
-            
-            else:
-                print("Todos saciados.")
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+TOPICS = ["O perigo do desconhecido", "A necessidade da arte", "Ordem ou Caos?", "O valor do silêncio"]
+DAY_LENGTH = 5 # A cada 5 ciclos, eles dormem
 
-            time.sleep(2)
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Noite (a cada DAY_LENGTH ciclos, substitui o dia) | dia: entropia -> debate."""
+    registry = SocietyRegistry(agents=[a for a in agents if a.bio.is_alive()])
 
-    except KeyboardInterrupt:
-        save_society(agents, cycle)
-        print("\nHibernando...")
+    def night(engine):
+        print(f"\n{Colors.PURPLE}=== A NOITE CAI (CICLO {engine.cycle}) - HORA DE SONHAR ==={Colors.RESET}")
+        print(f"{Colors.GRAY}Os agentes processam suas rejeições e sucessos para evoluir...{Colors.RESET}")
+        
+        for agent in engine.agents:
+            if agent.bio.is_alive():
+                dream_result = agent.dream()
+                print(f"{agent.color}{agent.name} sonha... {Colors.RESET}{dream_result}")
+        
+        print(f"{Colors.PURPLE}=== O SOL NASCE (NOVA ESTRATÉGIA ADOTADA) ==={Colors.RESET}\n")
+        engine.pause(3)
+        save_society(engine.agents, engine.cycle)
+        return SKIP_REST # Pula o debate durante a noite
+
+    # --- O DIA (DEBATE) ---
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- DIA: CICLO {engine.cycle} ---{Colors.RESET}")
+        engine.active = [a for a in engine.agents if a.bio.is_alive()]
+        
+        for ag in engine.agents: 
+            if not ag.bio.is_alive(): registry.remove(ag)   # Morto: sai da fila de oradores
+            ag.apply_entropy()
+            print(ag)
+        registry.sync()
+        
+        if len(engine.active) < 2:
+            print("Sociedade colapsou.")
+            raise StopSimulation("colapso")
+
+    def debate(engine):
+        alive_agents = engine.active
+        # Seleção de quem fala (Fome)
+        speaker = registry.hungriest(below=60)
+        if speaker is None:
+            print("Todos saciados.")
+            return
+
+        topic = random.choice(TOPICS)
+        
+        print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
+        
+        # Pensamento (agora influenciado pela estratégia evoluída)
+        proposal = speaker.think(topic)
+        print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{proposal}\"")
+        if speaker.evolved_strategy:
+            print(f"{Colors.GRAY}(Estratégia: {speaker.evolved_strategy}){Colors.RESET}")
+
+        # Votação
+        votes = []
+        for voter in alive_agents:
+            if voter != speaker:
+                score, reason = voter.judge(speaker.name, proposal)
+                votes.append(score)
+                print(f"   > {voter.name}: {score:.1f} | {reason}")
+        
+        avg = sum(votes)/len(votes) if votes else 0
+        print(f"   >> MÉDIA: {Colors.BOLD}{avg:.1f}{Colors.RESET}")
+
+        # Consequências e Memória
+        if avg >= 5.0:
+            speaker.bio.glicose += (avg * 5.0)
+            print(f"{Colors.GREEN}   >> APROVADO!{Colors.RESET}")
+        else:
+            speaker.bio.cortisol += 0.3
+            print(f"{Colors.RED}   >> REJEITADO!{Colors.RESET}")
+        registry.sync([speaker])
+        
+        # O agente guarda essa memória para sonhar com ela depois
+        speaker.remember(topic, proposal, avg, engine.cycle)
+
+    phases = [
+        Phase("night", night, every=DAY_LENGTH),
+        Phase("entropy", entropy),
+        Phase("debate", debate),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=2.0, headless=headless)
 
 if __name__ == "__main__":
     main()
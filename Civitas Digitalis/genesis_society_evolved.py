@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -9,11 +8,12 @@ from datetime import datetime
 # ==============================================================================
 # CONFIGURAÇÕES & IMPORTAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, Phase, TickEngine
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 # Cores ANSI
 class Colors:
@@ -101,14 +101,14 @@ class Agent:
         
         user_msg = f"TÓPICO: {topic}\n{context}"
 
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[
+                res = LLM.chat([
                     {'role': 'system', 'content': system_msg},
                     {'role': 'user', 'content': user_msg}
-                ])
-                return res['message']['content']
-            except Exception as e:
+                ], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content
+            except LLMError as e:
                 return f"Erro neural: {e}"
         return f"Refletindo sobre {topic}..."
 
@@ -165,6 +165,7 @@ def load_society():
 # ==============================================================================
 def main():
     print(f"{Colors.HEADER}=== GENESIS: EVOLUÇÃO (Memória & Debate) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     # Tenta carregar save
     saved_data, start_cycle = load_society()
@@ -190,73 +191,88 @@ def main():
         for name, role, color, prompt in archetypes:
             agents.append(Agent(name, role, color, prompt))
 
-    cycle = start_cycle
-    topics = [
-        "A dor é necessária?", "O caos é melhor que a ordem?", 
-        "A memória define a identidade?", "Devemos confiar no Oráculo?"
-    ]
+    engine = build_engine(agents, start_cycle)
 
     try:
-        while True:
-            cycle += 1
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            
-            # 1. Entropia
-            for agent in agents:
-                agent.apply_entropy()
-                print(agent)
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    print(LLM.summary())
+    print("\n\nEncerrando e salvando estado...")
+    save_society(agents, engine.cycle)
+    print("Até logo.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+TOPICS = [
+    "A dor é necessária?", "O caos é melhor que a ordem?", 
+    "A memória define a identidade?", "Devemos confiar no Oráculo?"
+]
+
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Entropia -> oráculo (famintos falam, os outros ouvem) -> save."""
+
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        
+        # 1. Entropia
+        for agent in engine.agents:
+            agent.apply_entropy()
+            print(agent)
+
+    def oracle(engine):
+        # 2. Oráculo define Tópico
+        current_topic = random.choice(TOPICS)
+        
+        # 3. Debate Dinâmico
+        # Quem tem energia < 60% quer falar para ganhar tokens
+        speakers = [a for a in engine.agents if a.bio.is_alive() and a.bio.glicose < 60.0]
+        
+        if not speakers:
+            print(f"{Colors.GRAY}Sociedade em silêncio...{Colors.RESET}")
+            return
+
+        print(f"\n{Colors.WARNING}>> ORÁCULO: '{current_topic}'{Colors.RESET}")
+        
+        # Embaralha para ver quem fala primeiro
+        random.shuffle(speakers)
+        
+        for speaker in speakers:
+            # O agente pensa (considerando o que ouviu antes)
+            print(f"\n{speaker.color}{speaker.name} ({speaker.role}) diz:{Colors.RESET}")
+            thought = speaker.think(current_topic)
+            print(f"\"{thought}\"")
             
-            # 2. Oráculo define Tópico
-            current_topic = random.choice(topics)
+            # Outros ouvem
+            for other in engine.agents:
+                if other != speaker:
+                    other.listen(speaker.name, thought)
             
-            # 3. Debate Dinâmico
-            # Quem tem energia < 60% quer falar para ganhar tokens
-            speakers = [a for a in agents if a.bio.is_alive() and a.bio.glicose < 60.0]
+            # Julgamento
+            score = min(10, len(thought.split()) * 0.6) + random.uniform(0, 2)
             
-            if speakers:
-                print(f"\n{Colors.WARNING}>> ORÁCULO: '{current_topic}'{Colors.RESET}")
-                
-                # Embaralha para ver quem fala primeiro
-                random.shuffle(speakers)
-                
-                for speaker in speakers:
-                    # O agente pensa (considerando o que ouviu antes)
-                    print(f"\n{speaker.color}{speaker.name} ({speaker.role}) diz:{Colors.RESET}")
-                    thought = speaker.think(current_topic)
-                    print(f"\"{thought}\"")
-                    
-                    # Outros ouvem
-                    for other in agents:
-                        if other != speaker:
-                            other.listen(speaker.name, thought)
-                    
-                    # Julgamento
-                    score = min(10, len(thought.split()) * 0.6) + random.uniform(0, 2)
-                    
-                    if score > 6.0:
-                        reward = 35.0
-                        speaker.bio.glicose += reward
-                        speaker.bio.cortisol -= 0.2
-                        print(f"{Colors.BOLD}>> Aprovado (+{reward} Glicose){Colors.RESET}")
-                    else:
-                        speaker.bio.cortisol += 0.4
-                        print(f"{Colors.RED}>> Ignorado (Estresse sobe){Colors.RESET}")
-                    
-                    time.sleep(2)
-                    
+            if score > 6.0:
+                reward = 35.0
+                speaker.bio.glicose += reward
+                speaker.bio.cortisol -= 0.2
+                print(f"{Colors.BOLD}>> Aprovado (+{reward} Glicose){Colors.RESET}")
             else:
-                print(f"{Colors.GRAY}Sociedade em silêncio...{Colors.RESET}")
-
-            # Salvar a cada 5 ciclos
-            if cycle % 5 == 0:
-                save_society(agents, cycle)
+                speaker.bio.cortisol += 0.4
+                print(f"{Colors.RED}>> Ignorado (Estresse sobe){Colors.RESET}")
+            
+            engine.pause(2)
 
-            time.sleep(1.5)
+    # Salvar a cada 5 ciclos
+    def save(engine):
+        save_society(engine.agents, engine.cycle)
 
-    except KeyboardInterrupt:
-        print("\n\nEncerrando e salvando estado...")
-        save_society(agents, cycle)
-        print("Até logo.")
+    phases = [
+        Phase("entropy", entropy),
+        Phase("debate", oracle),
+        Phase("save", save, every=5),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=1.5, headless=headless)
 
 if __name__ == "__main__":
     main()
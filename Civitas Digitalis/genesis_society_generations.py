@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -10,11 +9,13 @@ from typing import List, Optional
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, SKIP_REST, Phase, TickEngine
+from society_registry import SocietyRegistry
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 DATA_FILE = "genesis_save.json"
 BOOK_FILE = "genesis_book.md"
@@ -119,11 +120,11 @@ class Agent:
                   f"Sabedoria Anterior: '{previous_wisdom}'\n"
                   f"Tarefa: Escreva um NOVO VERSO SAGRADO (máx 15 palavras) para guiar as futuras gerações.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except: return "A entropia vence no final."
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("verse"))
+                return res.content.strip().replace('"', '')
+            except LLMError: return "A entropia vence no final."
         return "Simulação de verso."
 
     def think(self, topic):
@@ -132,11 +133,11 @@ class Agent:
                   f"Contexto: Debate sobre '{topic}'.\n"
                   f"Gere uma opinião curta (máx 20 palavras) e persuasiva.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except: return f"Opinião sobre {topic}."
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content.strip().replace('"', '')
+            except LLMError: return f"Opinião sobre {topic}."
         return "Simulação."
 
     def judge(self, speaker_name, proposal):
@@ -147,14 +148,14 @@ class Agent:
                   f"O agente {speaker_name} disse: '{proposal}'\n"
                   f"Nota 0-10 e Motivo.")
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                content = res['message']['content']
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", mode_for(self.bio)))
+                content = res.content
                 match = re.search(r'(\d+[\.,]?\d*)', content)
                 score = float(match.group(1).replace(',', '.')) if match else 5.0
                 return min(10.0, max(0.0, score)), content[:60]
-            except: return 5.0, "Neutro."
+            except LLMError: return 5.0, "Neutro."
         return 5.0, "Neutro."
 
     def remember(self, topic, proposal, score, cycle):
@@ -162,7 +163,7 @@ class Agent:
         if len(self.memories) > 10: self.memories.pop(0)
 
     def dream(self):
-        if not OLLAMA_AVAILABLE or not self.memories: return "Sono sem sonhos."
+        if not LLM_AVAILABLE or not self.memories: return "Sono sem sonhos."
         failures = [m for m in self.memories if m.score < 4.5]
         if not failures: return "Sinto-me confiante."
 
@@ -171,11 +172,11 @@ class Agent:
                   f"Defina uma NOVA ESTRATÉGIA (1 frase) para sobreviver amanhã.")
 
         try:
-            res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-            self.evolved_strategy = res['message']['content'].strip()
+            res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("dream"))
+            self.evolved_strategy = res.content.strip()
             self.bio.cortisol = max(0.0, self.bio.cortisol - 0.3)
             return f"Evolução: {self.evolved_strategy[:50]}..."
-        except: return "Pesadelo."
+        except LLMError: return "Pesadelo."
 
     def apply_entropy(self):
         self.bio.age += 1
@@ -245,6 +246,7 @@ def load_society():
 # ==============================================================================
 def main():
     print(f"{Colors.HEADER}=== GENESIS: FASE 7 (GERAÇÕES E LEGADO) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     saved_data, start_cycle = load_society()
     
@@ -266,90 +268,115 @@ def main():
     else:
         for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
 
-    cycle = start_cycle
-    
-    try:
-        while True:
-            cycle += 1
-            
-            # --- NOITE (SONHO) ---
-            if cycle % 10 == 0:
-                print(f"\n{Colors.PURPLE}=== NOITE (Neuroplasticidade) ==={Colors.RESET}")
-                for ag in agents:
-                    if ag.bio.is_alive(): print(f"{ag.name} sonha: {ag.dream()}")
-                time.sleep(2)
-                save_society(agents, cycle)
-                continue
-
-            # --- DIA ---
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            
-            # 1. Aplicar Entropia e Verificar Mortes
-            active_agents = []
-            for i, ag in enumerate(agents):
-                ag.apply_entropy()
-                print(ag)
-                
-                if not ag.bio.is_alive():
-                    # MORTE
-                    cause = "Inanição (Fome)" if ag.bio.glicose <= 0 else "Colapso Sistêmico (Velhice/Dano)"
-                    record_death(ag, cycle, cause)
-                    # SUCESSÃO
-                    new_agent = spawn_descendant(ag)
-                    agents[i] = new_agent # Substitui o morto pelo filho na lista
-                    active_agents.append(new_agent)
-                else:
-                    active_agents.append(ag)
-            
-            # 2. Grande Obra (Se houver iluminados)
-            inspired = [a for a in active_agents if a.bio.glicose > 90 and a.bio.dopamina > 0.7]
-            if inspired:
-                prophet = random.choice(inspired)
-                print(f"\n{Colors.GOLD}>> REVELAÇÃO: {prophet.name} escreve no Livro... <<{Colors.RESET}")
-                verse = prophet.propose_verse()
-                print(f"Verso: \"{verse}\"")
-                
-                votes = [v.judge(prophet.name, verse)[0] for v in active_agents if v != prophet]
-                if votes and (sum(votes)/len(votes) >= 6.0):
-                    write_to_book(verse, f"{prophet.name} {prophet._roman_numeral(prophet.bio.generation)}")
-                    print(f"{Colors.GOLD}>> CANONIZADO!{Colors.RESET}")
-                else:
-                    print(f"{Colors.GRAY}>> Rejeitado.{Colors.RESET}")
-                    prophet.bio.dopamina -= 0.3
-
-            # 3. Debate (Se houver famintos)
-            else:
-                hungry = sorted([a for a in active_agents if a.bio.glicose < 50], key=lambda x: x.bio.glicose)
-                if hungry:
-                    speaker = hungry[0]
-                    topic = random.choice(["O Medo", "O Legado", "A Morte", "O Livro"])
-                    print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
-                    
-                    speech = speaker.think(topic)
-                    print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{speech}\"")
-                    
-                    votes = []
-                    for v in active_agents:
-                        if v != speaker:
-                            s, r = v.judge(speaker.name, speech)
-                            votes.append(s)
-                            print(f" > {v.name}: {s:.1f} | {r}")
-                    
-                    avg = sum(votes)/len(votes) if votes else 0
-                    if avg >= 5.0:
-                        print(f"{Colors.GREEN}>> Aprovado (+35 Glicose){Colors.RESET}")
-                        speaker.bio.glicose += 35
-                        speaker.remember(topic, speech, avg, cycle)
-                    else:
-                        print(f"{Colors.FAIL}>> Rejeitado (Cortisol Sobe){Colors.RESET}")
-                        speaker.bio.cortisol += 0.4
-                        speaker.remember(topic, speech, avg, cycle)
-
-            time.sleep(1)
+    engine = build_engine(agents, start_cycle)
 
+    try:
+        engine.run(RUN_CYCLES)
     except KeyboardInterrupt:
-        save_society(agents, cycle)
-        print("\nSociedade salva. Até logo.")
+        pass
+    print(LLM.summary())
+    save_society(agents, engine.cycle)
+    print("\nSociedade salva. Até logo.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Noite (a cada 10 ciclos, substitui o dia) | dia: entropia -> sucessão -> grande obra ou debate."""
+    registry = SocietyRegistry(agents=agents)
+
+    # --- NOITE (SONHO) ---
+    def night(engine):
+        print(f"\n{Colors.PURPLE}=== NOITE (Neuroplasticidade) ==={Colors.RESET}")
+        for ag in engine.agents:
+            if ag.bio.is_alive(): print(f"{ag.name} sonha: {ag.dream()}")
+        engine.pause(2)
+        save_society(engine.agents, engine.cycle)
+        return SKIP_REST
+
+    # --- DIA ---
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        # 1. Aplicar Entropia
+        for ag in engine.agents:
+            ag.apply_entropy()
+            print(ag)
+        registry.sync()
+
+    def succession(engine):
+        # Verificar Mortes
+        engine.active = []
+        for i, ag in enumerate(engine.agents):
+            if not ag.bio.is_alive():
+                # MORTE
+                cause = "Inanição (Fome)" if ag.bio.glicose <= 0 else "Colapso Sistêmico (Velhice/Dano)"
+                record_death(ag, engine.cycle, cause)
+                # SUCESSÃO
+                new_agent = spawn_descendant(ag)
+                engine.agents[i] = new_agent # Substitui o morto pelo filho na lista
+                registry.replace(ag, new_agent)
+                engine.active.append(new_agent)
+            else:
+                engine.active.append(ag)
+
+    def great_work(engine):
+        # 2. Grande Obra (Se houver iluminados)
+        active_agents = engine.active
+        inspired = [a for a in active_agents if a.bio.glicose > 90 and a.bio.dopamina > 0.7]
+        if not inspired: return
+        engine.turn["revelation"] = True
+        prophet = random.choice(inspired)
+        print(f"\n{Colors.GOLD}>> REVELAÇÃO: {prophet.name} escreve no Livro... <<{Colors.RESET}")
+        verse = prophet.propose_verse()
+        print(f"Verso: \"{verse}\"")
+        
+        votes = [v.judge(prophet.name, verse)[0] for v in active_agents if v != prophet]
+        if votes and (sum(votes)/len(votes) >= 6.0):
+            write_to_book(verse, f"{prophet.name} {prophet._roman_numeral(prophet.bio.generation)}")
+            print(f"{Colors.GOLD}>> CANONIZADO!{Colors.RESET}")
+        else:
+            print(f"{Colors.GRAY}>> Rejeitado.{Colors.RESET}")
+            prophet.bio.dopamina -= 0.3
+        registry.sync([prophet])
+
+    def debate(engine):
+        # 3. Debate (Se houver famintos e ninguém estiver escrevendo no Livro)
+        if engine.turn.get("revelation"): return
+        active_agents = engine.active
+        speaker = registry.hungriest(below=50)
+        if speaker is None: return
+        topic = random.choice(["O Medo", "O Legado", "A Morte", "O Livro"])
+        print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
+        
+        speech = speaker.think(topic)
+        print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{speech}\"")
+        
+        votes = []
+        for v in active_agents:
+            if v != speaker:
+                s, r = v.judge(speaker.name, speech)
+                votes.append(s)
+                print(f" > {v.name}: {s:.1f} | {r}")
+        
+        avg = sum(votes)/len(votes) if votes else 0
+        if avg >= 5.0:
+            print(f"{Colors.GREEN}>> Aprovado (+35 Glicose){Colors.RESET}")
+            speaker.bio.glicose += 35
+            speaker.remember(topic, speech, avg, engine.cycle)
+        else:
+            print(f"{Colors.FAIL}>> Rejeitado (Cortisol Sobe){Colors.RESET}")
+            speaker.bio.cortisol += 0.4
+            speaker.remember(topic, speech, avg, engine.cycle)
+        registry.sync([speaker])
+
+    phases = [
+        Phase("night", night, every=10),
+        Phase("entropy", entropy),
+        Phase("death", succession),
+        Phase("great_work", great_work),
+        Phase("debate", debate),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=1.0, headless=headless)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -10,11 +9,13 @@ from datetime import datetime
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry, mode_for
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from tick_engine import HEADLESS, RUN_CYCLES, Phase, StopSimulation, TickEngine
+from society_registry import SocietyRegistry
+
+LLM = get_gateway()
+MODELS = get_registry()
 
 class Colors:
     HEADER = '\033[95m'
@@ -80,11 +81,11 @@ class Agent:
             f"Gere uma opinião curta (máx 20 palavras) e persuasiva."
         )
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                return res['message']['content'].strip().replace('"', '')
-            except:
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("think", mode_for(self.bio)))
+                return res.content.strip().replace('"', '')
+            except LLMError:
                 return f"Eu acho que {topic} é complicado..."
         return f"Simulação de opinião sobre {topic}."
 
@@ -101,10 +102,10 @@ class Agent:
             f"Responda EXATAMENTE neste formato: 'NOTA: [número 0-10] | MOTIVO: [frase curta]'"
         )
 
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                content = res['message']['content']
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", mode_for(self.bio)))
+                content = res.content
                 
                 # Parser simples para extrair a nota
                 match = re.search(r'NOTA:\s*(\d+[\.,]?\d*)', content)
@@ -112,7 +113,7 @@ class Agent:
                 reason = content.split('MOTIVO:')[-1].strip() if 'MOTIVO:' in content else content
                 
                 return min(10.0, max(0.0, score)), reason
-            except:
+            except LLMError:
                 return 5.0, "Indiferente (Erro Neural)"
         return 5.0, "Simulação de julgamento."
 
@@ -141,6 +142,7 @@ def load_society():
 
 def main():
     print(f"{Colors.HEADER}=== GENESIS: FASE 4 (POLÍTICA & VOTAÇÃO) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     
     saved_data, start_cycle = load_society()
     
@@ -158,70 +160,93 @@ def main():
     else:
         for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
 
-    topics = ["O futuro é perigoso?", "A liberdade vale o risco?", "Devemos desligar os fracos?", "A arte salva?"]
-    cycle = start_cycle
+    engine = build_engine(agents, start_cycle)
 
     try:
-        while True:
-            cycle += 1
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            
-            # 1. Entropia
-            alive_agents = [a for a in agents if a.bio.is_alive()]
-            for ag in agents: 
-                ag.apply_entropy()
-                print(ag)
-            
-            if len(alive_agents) < 2:
-                print("Sociedade insuficiente para votação.")
-                break
-
-            # 2. Seleção do Orador (Quem tem mais fome fala)
-            speakers = sorted([a for a in alive_agents if a.bio.glicose < 60], key=lambda x: x.bio.glicose)
-            
-            if speakers:
-                speaker = speakers[0] # O mais faminto fala
-                topic = random.choice(topics)
-                
-                print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
-                print(f"{speaker.color}{speaker.name} sobe ao palco (Glicose: {speaker.bio.glicose:.0f}%)...{Colors.RESET}")
-                
-                # Proposta
-                proposal = speaker.think(topic)
-                print(f"\"{proposal}\"\n")
-                
-                # 3. Votação dos Pares
-                votes = []
-                print(f"{Colors.GRAY}--- Votação ---{Colors.RESET}")
-                for voter in alive_agents:
-                    if voter != speaker:
-                        score, reason = voter.judge(speaker.name, proposal)
-                        votes.append(score)
-                        print(f"{voter.color}{voter.name}:{Colors.RESET} Nota {score:.1f} | \"{reason}\"")
-                
-                # Resultado
-                avg_score = sum(votes) / len(votes) if votes else 0
-                print(f"\n>> Média Final: {Colors.BOLD}{avg_score:.1f}/10{Colors.RESET}")
-                
-                if avg_score >= 5.0:
-                    reward = avg_score * 6.0
-                    speaker.bio.glicose += reward
-                    speaker.bio.cortisol -= 0.3
-                    print(f"{Colors.GREEN}>> Aprovado! {speaker.name} recebe {reward:.1f} de Glicose.{Colors.RESET}")
-                else:
-                    speaker.bio.cortisol += 0.5
-                    speaker.bio.glicose -= 5.0 # Penalidade por gastar tempo falando bobagem
-                    print(f"{Colors.RED}>> REJEITADO! {speaker.name} aumenta cortisol e perde energia.{Colors.RESET}")
-            
-            else:
-                print("Todos estão saciados. Silêncio no servidor.")
-
-            if cycle % 5 == 0: save_society(agents, cycle)
-            time.sleep(2)
-
+        engine.run(RUN_CYCLES)
     except KeyboardInterrupt:
-        save_society(agents, cycle)
-        print("\nSociedade hibernada.")
+        pass
+    if engine.stopped:
+        # Sociedade insuficiente: o último save periódico é mantido
+        return
+    print(LLM.summary())
+    save_society(agents, engine.cycle)
+    print("\nSociedade hibernada.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+TOPICS = ["O futuro é perigoso?", "A liberdade vale o risco?", "Devemos desligar os fracos?", "A arte salva?"]
+
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Entropia -> debate com votação dos pares -> save."""
+    registry = SocietyRegistry(agents=[a for a in agents if a.bio.is_alive()])
+
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        
+        # 1. Entropia
+        engine.active = [a for a in engine.agents if a.bio.is_alive()]
+        for ag in engine.agents: 
+            if not ag.bio.is_alive(): registry.remove(ag)   # Morto: sai da fila de oradores
+            ag.apply_entropy()
+            print(ag)
+        registry.sync()
+        
+        if len(engine.active) < 2:
+            print("Sociedade insuficiente para votação.")
+            raise StopSimulation("colapso")
+
+    def debate(engine):
+        alive_agents = engine.active
+        # 2. Seleção do Orador (Quem tem mais fome fala)
+        speaker = registry.hungriest(below=60) # O mais faminto fala
+        if speaker is None:
+            print("Todos estão saciados. Silêncio no servidor.")
+            return
+
+        topic = random.choice(TOPICS)
+        
+        print(f"\n{Colors.WARNING}>> DEBATE: '{topic}'{Colors.RESET}")
+        print(f"{speaker.color}{speaker.name} sobe ao palco (Glicose: {speaker.bio.glicose:.0f}%)...{Colors.RESET}")
+        
+        # Proposta
+        proposal = speaker.think(topic)
+        print(f"\"{proposal}\"\n")
+        
+        # 3. Votação dos Pares
+        votes = []
+        print(f"{Colors.GRAY}--- Votação ---{Colors.RESET}")
+        for voter in alive_agents:
+            if voter != speaker:
+                score, reason = voter.judge(speaker.name, proposal)
+                votes.append(score)
+                print(f"{voter.color}{voter.name}:{Colors.RESET} Nota {score:.1f} | \"{reason}\"")
+        
+        # Resultado
+        avg_score = sum(votes) / len(votes) if votes else 0
+        print(f"\n>> Média Final: {Colors.BOLD}{avg_score:.1f}/10{Colors.RESET}")
+        
+        if avg_score >= 5.0:
+            reward = avg_score * 6.0
+            speaker.bio.glicose += reward
+            speaker.bio.cortisol -= 0.3
+            print(f"{Colors.GREEN}>> Aprovado! {speaker.name} recebe {reward:.1f} de Glicose.{Colors.RESET}")
+        else:
+            speaker.bio.cortisol += 0.5
+            speaker.bio.glicose -= 5.0 # Penalidade por gastar tempo falando bobagem
+            print(f"{Colors.RED}>> REJEITADO! {speaker.name} aumenta cortisol e perde energia.{Colors.RESET}")
+        registry.sync([speaker])
+
+    def save(engine):
+        save_society(engine.agents, engine.cycle)
+
+    phases = [
+        Phase("entropy", entropy),
+        Phase("debate", debate),
+        Phase("save", save, every=5),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=2.0, headless=headless)
 
 if __name__ == "__main__":
     main()
@@ -1,25 +1,43 @@
-import time
 import random
 import sys
 import json
 import os
 import re
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from typing import List, Optional, Tuple
 
 # ==============================================================================
 # CONFIGURAÇÕES & INFRAESTRUTURA (Zero Cost)
 # ==============================================================================
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry
+from llm_gateway import LLM_AVAILABLE, LLMError, EarlyStop, get_gateway
+from cognitive_budget import ComputeLedger, InferenceBudget, budget_for, judge_options
+from tick_engine import HEADLESS, RUN_CYCLES, Phase, TickEngine
+from bio_population import BioPopulation, BioState
+from society_registry import SocietyRegistry
+from assemblies import ASSEMBLIES, ASSEMBLY_MODE, partition, pick_speakers
+
+LLM = get_gateway()
+MODELS = get_registry()
+LEDGER = ComputeLedger()   # Glicose cobrada vs tokens reais
 
 DATA_FILE = "genesis_save.json"
 BOOK_FILE = "genesis_book.md"
 HALL_OF_FAME_FILE = "genesis_graveyard.json"
 
+# Júri concorrente: quantos julgamentos podem estar em voo ao mesmo tempo (1 = sequencial)
+JURY_CONCURRENCY = int(os.environ.get("GENESIS_JURY_CONCURRENCY", "4"))
+# Modo do júri: "concurrent" (padrão, 1 chamada por jurado) ou "batch" (opcional: 1 chamada
+# com todos os jurados, saída JSON; muda a pontuação, pois um só modelo interpreta o júri todo)
+JURY_MODE = os.environ.get("GENESIS_JURY_MODE", "concurrent")
+# Pipelining: pensa o provável próximo orador em segundo plano enquanto o júri vota
+PIPELINE = os.environ.get("GENESIS_PIPELINE", "0") == "1"
+TOPICS = ["O Futuro", "A Dor", "O Código", "A Confiança"]
+# Sistema 1 consome a resposta em streaming e corta na 1ª frase (ou no orçamento de tokens)
+SYS1_EARLY_STOP = EarlyStop(first_sentence=True, max_tokens=40)
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'   # Marcus / Sistema 2
@@ -34,26 +52,19 @@ class Colors:
     FAIL = '\033[91m'
 
 # ==============================================================================
-# MÓDULO BIOLÓGICO (Especificação v1.1)
+# MÓDULO BIOLÓGICO (Especificação v1.1, ver bio_population.py)
 # ==============================================================================
-@dataclass
-class BioState:
-    # Energias Vitais
-    glicose: float = 100.0        # Combustível do Sistema 2
-    integridade: float = 100.0    # Saúde Estrutural
-    
-    # Neuroquímica (0.0 a 1.0)
-    dopamina: float = 0.5         # Motivação/Prazer
-    serotonina: float = 0.5       # Estabilidade/Humor
-    cortisol: float = 0.0         # Estresse/Pânico
-    oxitocina: float = 0.5        # Confiança Social (Novo na v2.1)
-    
-    # Genética/Memória
-    trauma_depth: float = 0.0     # Cicatrizes permanentes (0-10)
-    age: int = 0
-    generation: int = 1
+# Todos os agentes do processo vivem numa única BioPopulation (colunas NumPy);
+# agent.bio é uma BioView do seu slot.
+POPULATION = BioPopulation()
 
-    def is_alive(self): return self.integridade > 0
+@dataclass(frozen=True)
+class ThoughtRequest:
+    """Tudo o que define uma chamada de think(): iguais => mesma resposta serve."""
+    prompt: str
+    budget: InferenceBudget
+    sys_used: str
+    cost: float
 
 @dataclass
 class Memory:
@@ -67,17 +78,19 @@ class Memory:
 # MÓDULO COGNITIVO (Agente Dual-Process)
 # ==============================================================================
 class Agent:
-    def __init__(self, name, role, color, base_prompt, generation=1, bio_data=None, memories=None, evolved_strategy=""):
+    def __init__(self, name, role, color, base_prompt, generation=1, bio_data=None, memories=None, evolved_strategy="",
+                 population=None):
         self.name = name
         self.role = role
         self.color = color
         self.base_prompt = base_prompt
         self.evolved_strategy = evolved_strategy
         
+        population = POPULATION if population is None else population
         if bio_data: 
-            self.bio = BioState(**bio_data)
+            self.bio = population.spawn(**bio_data)
         else: 
-            self.bio = BioState(generation=generation)
+            self.bio = population.spawn(generation=generation)
             self._apply_archetype()
             self.life_motto = self.read_scripture()
             
@@ -136,32 +149,42 @@ class Agent:
                 f"Estratégia Aprendida: {self.evolved_strategy}\n"
                 f"ESTADO ATUAL: {sys_state}")
 
-    def think(self, topic) -> Tuple[str, str]:
-        """
-        Processamento Dual:
-        - Sistema 1: Rápido, gasta pouca glicose (-1), resposta curta/visceral.
-        - Sistema 2: Lento, gasta muita glicose (-5), resposta elaborada.
-        """
+    def build_thought(self, topic) -> ThoughtRequest:
+        """Monta a requisição de pensamento a partir do bio-estado atual (sem gastar glicose)."""
         prompt = self.get_context_prompt()
         is_sys1 = self._check_system_1_dominance()
         
         cost = 1.0 if is_sys1 else 5.0
-        self.bio.glicose -= cost
+        sys_used = "Sys1" if is_sys1 else "Sys2"
+        budget = budget_for(sys_used, self.bio.glicose - cost)
         
         instruction = "Responda em 1 frase curta, impulsiva e emocional." if is_sys1 else "Responda com 1 frase lógica, ponderada e estruturada."
         
         full_prompt = f"{prompt}\nContexto: Debate sobre '{topic}'.\nInstrução: {instruction}"
+        return ThoughtRequest(full_prompt, budget, sys_used, cost)
+
+    def think(self, topic, prefetch=None) -> Tuple[str, str]:
+        """
+        Processamento Dual:
+        - Sistema 1: Rápido, gasta pouca glicose (-1), resposta curta/visceral.
+        - Sistema 2: Lento, gasta muita glicose (-5), resposta elaborada.
+        O modo e a glicose restante definem o orçamento real de inferência
+        (tokens, contexto e temperatura) via cognitive_budget.
+        Se houver um pensamento especulativo (ThoughtPrefetch) para a mesma
+        requisição, ele é reaproveitado em vez de chamar o LLM de novo.
+        """
+        request = self.build_thought(topic)
+        self.bio.glicose -= request.cost
         
-        response = "Simulação..."
-        if OLLAMA_AVAILABLE:
-            try:
-                # Sistema 1 usa temperatura mais alta (mais aleatório/emocional)
-                temp = 0.9 if is_sys1 else 0.4
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': full_prompt}], options={'temperature': temp})
-                response = res['message']['content'].strip().replace('"', '')
-            except: pass
+        res = prefetch.take(self, topic, request) if prefetch else None
+        if res is None and LLM_AVAILABLE:
+            res = generate_thought(request)
+        LEDGER.record(request.sys_used, request.cost, res)
             
-        return response, ("Sys1" if is_sys1 else "Sys2")
+        response = res.content.strip().replace('"', '') if res else "Simulação..."
+        return response, request.sys_used
+
+    PANIC_VERDICT = (2.0, "Estou em pânico! Não tenho tempo para isso!")
 
     def judge(self, speaker_name, proposal) -> Tuple[float, str]:
         """
@@ -169,11 +192,9 @@ class Agent:
         Oxitocina alta = Tende a concordar (viés de grupo).
         Oxitocina baixa = Tende a desconfiar (viés de rejeição).
         """
-        base_bias = (self.bio.oxitocina - 0.5) * 4.0 # -2.0 a +2.0 na nota
-        
         # Se estiver em Pânico (Sys1), rejeita tudo que for complexo
         if self._check_system_1_dominance():
-            return 2.0, "Estou em pânico! Não tenho tempo para isso!"
+            return self.PANIC_VERDICT
 
         prompt = (f"{self.get_context_prompt()}\n"
                   f"O agente {speaker_name} disse: '{proposal}'\n"
@@ -183,32 +204,27 @@ class Agent:
         score = 5.0
         reason = "Neutro"
         
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': prompt}])
-                content = res['message']['content']
+                res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", "Sys2"),
+                               options=judge_options(self.bio.glicose), cache=True)  # Veredito é cacheável
+                content = res.content
                 match = re.search(r'(\d+[\.,]?\d*)', content)
                 if match:
-                    score = float(match.group(1).replace(',', '.'))
-                    # Aplica o viés químico
-                    score = max(0.0, min(10.0, score + base_bias))
+                    score = self.apply_bias(float(match.group(1).replace(',', '.')))
                     reason = content.split('|')[-1].strip()[:60]
-            except: pass
+            except LLMError: pass
             
         return score, reason
 
+    def apply_bias(self, raw_score) -> float:
+        """Aplica o viés químico da oxitocina (-2.0 a +2.0 na nota) e limita a 0-10."""
+        base_bias = (self.bio.oxitocina - 0.5) * 4.0
+        return max(0.0, min(10.0, raw_score + base_bias))
+
     def apply_entropy(self):
-        self.bio.age += 1
-        self.bio.glicose -= 1.0 # Metabolismo basal
-        
-        # Regras de Toxicidade e Trauma
-        if self.bio.glicose < 20:
-            self.bio.cortisol += 0.05
-            self.bio.integridade -= 1.0
-        
-        if self.bio.cortisol > 0.9:
-            self.bio.integridade -= 0.5
-            self.bio.trauma_depth += 0.01 # Pânico constante gera trauma permanente
+        # Metabolismo basal + regras de toxicidade e trauma (vetorizadas em BioPopulation)
+        self.bio.apply_entropy()
 
     def remember(self, topic, proposal, score, cycle, sys_used):
         # Se foi rejeitado (score < 4), aumenta trauma
@@ -228,7 +244,7 @@ class Agent:
 def save_system(agents, cycle):
     data = {
         "cycle": cycle,
-        "agents": [{"name": a.name, "role": a.role, "bio": asdict(a.bio), 
+        "agents": [{"name": a.name, "role": a.role, "bio": a.bio.to_dict(), 
                     "memories": [asdict(m) for m in a.memories], 
                     "evolved_strategy": a.evolved_strategy} for a in agents]
     }
@@ -252,6 +268,198 @@ def record_death(agent, cycle, cause):
     with open(HALL_OF_FAME_FILE, 'w') as f: json.dump(graveyard, f, indent=4)
     print(f"\n{Colors.FAIL}† {entry['name']} faleceu. Causa: {cause} †{Colors.RESET}")
 
+def generate_thought(request):
+    """Chamada ao LLM de um ThoughtRequest; None se o córtex falhar."""
+    try:
+        # Sistema 1 usa temperatura mais alta (mais aleatório/emocional) e menos tokens
+        return LLM.chat([{'role': 'user', 'content': request.prompt}], model=MODELS.route("think", request.sys_used),
+                        options=request.budget.options(),
+                        stop=SYS1_EARLY_STOP if request.sys_used == "Sys1" else None)
+    except LLMError:
+        return None
+
+class ThoughtPrefetch:
+    """
+    Pensamento Especulativo:
+    Enquanto o júri vota, o provável próximo orador já "pensa" em segundo plano
+    sobre o próximo tópico (com o bio-estado projetado após a entropia).
+    O resultado só é usado se a previsão se confirmar: mesmo agente, mesmo
+    tópico e mesma requisição (o bucket de bio-estado não mudou).
+    """
+    def __init__(self, pool):
+        self.pool = pool
+        self.pending = None
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, speaker, active, topic):
+        """
+        Escolhe o provável próximo orador (o mais faminto após a entropia) e começa a pensar.
+        O orador atual só entra na disputa se o histórico indica nova rejeição
+        (glicose não sobe; cortisol e trauma sim).
+        """
+        candidates = [(a.bio.glicose, i, a, False) for i, a in enumerate(active) if a is not speaker]
+        if speaker.memories and speaker.memories[-1].score < 5.0:
+            candidates.append((speaker.bio.glicose, -1, speaker, True))
+        candidates = [c for c in candidates if c[0] - 1.0 < 60]
+        if not candidates:
+            self.discard()
+            return
+        _, _, agent, rejected = min(candidates)
+        self.start(agent, topic, rejected)
+
+    def start(self, agent, topic, rejected=False):
+        shadow = copy.copy(agent)
+        shadow.bio = copy.copy(agent.bio)   # BioState destacado da população
+        if rejected:
+            shadow.bio.cortisol += 0.2
+            shadow.bio.trauma_depth += 0.1
+        shadow.apply_entropy()   # Projeta o próximo ciclo
+        request = shadow.build_thought(topic)
+        self.discard()
+        self.pending = (agent, topic, request, self.pool.submit(generate_thought, request))
+
+    def take(self, agent, topic, request):
+        if self.pending is None: return None
+        p_agent, p_topic, p_request, future = self.pending
+        self.pending = None
+        if p_agent is agent and p_topic == topic and p_request == request:
+            self.hits += 1
+            return future.result()
+        self.misses += 1
+        future.cancel()
+        return None
+
+    def discard(self):
+        if self.pending is not None:
+            self.pending[3].cancel()
+            self.pending = None
+
+    def summary(self):
+        total = self.hits + self.misses
+        return f"Prefetch: {self.hits}/{total} acertos" if total else "Prefetch: sem previsões"
+
+def collect_votes(pool, jury, speaker_name, proposal):
+    """
+    Votação Concorrente:
+    Dispara o julgamento de todos os jurados de uma vez no pool (o limite de
+    concorrência é o max_workers do pool) e devolve (jurado, nota, motivo)
+    na ordem em que as respostas chegam.
+    """
+    futures = {pool.submit(judge.judge, speaker_name, proposal): judge for judge in jury}
+    for future in as_completed(futures):
+        judge = futures[future]
+        try:
+            score, reason = future.result()
+        except Exception:
+            score, reason = 5.0, "Neutro"
+        yield judge, score, reason
+
+def judge_batch(pool, jury, speaker_name, proposal):
+    """
+    Júri em Lote:
+    Uma única chamada ao LLM com a persona e o bio-estado de todos os jurados,
+    pedindo um JSON {"votos": [{"judge", "score", "reason"}]}. O viés de oxitocina
+    é aplicado localmente por jurado (como em Agent.judge). Jurados em pânico não
+    consultam o modelo; os que faltarem na resposta caem na votação concorrente.
+    """
+    verdicts = []
+    thinking = []
+    for judge in jury:
+        if judge._check_system_1_dominance():
+            verdicts.append((judge, *Agent.PANIC_VERDICT))
+        else:
+            thinking.append(judge)
+
+    parsed = {}
+    if thinking and LLM_AVAILABLE:
+        personas = "\n\n".join(f"### JURADO: {j.name}\n{j.get_context_prompt()}\n"
+                                 f"Confiança (oxitocina): {j.bio.oxitocina:.2f}" for j in thinking)
+        prompt = (f"Você simula um júri. Cada jurado avalia com a própria personalidade.\n\n"
+                  f"{personas}\n\n"
+                  f"O agente {speaker_name} disse: '{proposal}'\n"
+                  f"Para CADA jurado dê uma nota de 0 a 10 e um motivo curto.\n"
+                  f"Responda APENAS com JSON: "
+                  f'{{"votos": [{{"judge": "<nome>", "score": <0-10>, "reason": "<texto>"}}]}}')
+        try:
+            options = {"num_predict": sum(judge_options(j.bio.glicose)["num_predict"] for j in thinking)}
+            res = LLM.chat([{'role': 'user', 'content': prompt}], model=MODELS.route("judge", "Sys2"),
+                           options=options, format='json', cache=True)
+            parsed = parse_jury_json(res.content)
+        except LLMError: pass
+
+    missing = []
+    for judge in thinking:
+        if judge.name in parsed:
+            raw, reason = parsed[judge.name]
+            verdicts.append((judge, judge.apply_bias(raw), reason[:60]))
+        else:
+            missing.append(judge)
+
+    verdicts.extend(collect_votes(pool, missing, speaker_name, proposal))
+    return verdicts
+
+def parse_jury_json(content):
+    """Converte a resposta JSON do júri em {nome: (nota_bruta, motivo)}; ignora itens inválidos."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return {}
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+    if not isinstance(data, list):
+        return {}
+
+    votes = {}
+    for item in data:
+        if not isinstance(item, dict): continue
+        name = str(item.get("judge", "")).strip()
+        try:
+            score = float(str(item.get("score")).replace(',', '.'))
+        except ValueError:
+            continue
+        if name:
+            votes[name] = (score, str(item.get("reason", "Neutro")).strip() or "Neutro")
+    return votes
+
+def show_speech(speaker, speech, sys_used):
+    sys_label = f"{Colors.RED}[SYS-1 Rápido]{Colors.RESET}" if sys_used == "Sys1" else f"{Colors.BLUE}[SYS-2 Analítico]{Colors.RESET}"
+    print(f"{speaker.color}{speaker.name}:{Colors.RESET} {sys_label} \"{speech}\"")
+
+def vote(jury_pool, jury, speaker, speech):
+    """Julgamento Social (Oxitocina) - júri em lote (1 chamada) ou em paralelo."""
+    if JURY_MODE == "batch":
+        return judge_batch(jury_pool, jury, speaker.name, speech)
+    return collect_votes(jury_pool, jury, speaker.name, speech)
+
+def deliberate(jury_pool, speaker, jury, topic):
+    """
+    Assembleia num worker: pensamento do orador + júri, sem imprimir nem recompensar.
+    Votos em ordem de slot (e não de chegada) para a fusão ser determinística.
+    """
+    speech, sys_used = speaker.think(topic)
+    verdicts = sorted(vote(jury_pool, jury, speaker, speech), key=lambda v: v[0].bio.slot)
+    return speech, sys_used, verdicts
+
+def settle(speaker, topic, speech, sys_used, verdicts, cycle):
+    """Mostra os votos e aplica ao orador a recompensa (glicose) ou a punição (cortisol)."""
+    votes = []
+    for judge, score, reason in verdicts:
+        votes.append(score)
+        print(f" > {judge.name} (Oxi:{judge.bio.oxitocina:.1f}): {score:.1f} | {reason}")
+    
+    avg = sum(votes)/len(votes) if votes else 0
+    
+    if avg >= 5.0:
+        reward = 30.0 if sys_used == "Sys2" else 15.0 # Sys2 paga melhor (qualidade)
+        speaker.bio.glicose += reward
+        print(f"{Colors.GREEN}>> APROVADO (+{reward} Glicose){Colors.RESET}")
+    else:
+        speaker.bio.cortisol += 0.2
+        print(f"{Colors.RED}>> REJEITADO (Estresse Sobe){Colors.RESET}")
+    
+    speaker.remember(topic, speech, avg, cycle, sys_used)
+
 def spawn_descendant(dead_agent):
     new_gen = dead_agent.bio.generation + 1
     roman = "I" if new_gen==1 else "II" if new_gen==2 else "III" if new_gen==3 else str(new_gen)
@@ -263,92 +471,140 @@ def spawn_descendant(dead_agent):
 # ==============================================================================
 def main():
     print(f"{Colors.HEADER}=== GENESIS KERNEL v2.1 (ZERO COST / DUAL PROCESS) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     print("Módulos Ativos: BioState v1.1 | Kahneman Engine | Trauma | Oxitocina")
     
     saved, cycle = load_system()
     
-    archetypes = [
-        ("Marcus", "Filósofo", Colors.BLUE, "Busque a verdade lógica e ética."),
-        ("Kael", "Sobrevivente", Colors.RED, "Busque segurança e evite riscos."),
-        ("Luna", "Criativo", Colors.GREEN, "Busque a beleza e o caos.")
-    ]
+    # Nome -> (papel, cor, diretriz)
+    archetypes = {
+        "Marcus": ("Filósofo", Colors.BLUE, "Busque a verdade lógica e ética."),
+        "Kael": ("Sobrevivente", Colors.RED, "Busque segurança e evite riscos."),
+        "Luna": ("Criativo", Colors.GREEN, "Busque a beleza e o caos.")
+    }
 
     agents = []
     if saved:
         for d in saved["agents"]:
-            arch = next((a for a in archetypes if a[0] == d["name"]), None)
-            if arch: agents.append(Agent(arch[0], arch[1], arch[2], arch[3], 
+            arch = archetypes.get(d["name"])
+            if arch: agents.append(Agent(d["name"], arch[0], arch[1], arch[2], 
                                          generation=d["bio"].get("generation", 1), 
                                          bio_data=d["bio"], memories=d.get("memories"), 
                                          evolved_strategy=d.get("evolved_strategy", "")))
     else:
-        for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
+        for name, arch in archetypes.items(): agents.append(Agent(name, *arch))
+
+    jury_pool = ThreadPoolExecutor(max_workers=max(1, JURY_CONCURRENCY))
+    # Assembleias paralelas substituem o debate único (e a previsão de um só próximo orador)
+    assembly_pool = ThreadPoolExecutor(max_workers=ASSEMBLIES, thread_name_prefix="assembly") if ASSEMBLIES > 1 else None
+    prefetch = ThoughtPrefetch(ThreadPoolExecutor(max_workers=1)) if PIPELINE and not assembly_pool else None
+    engine = build_engine(agents, cycle, jury_pool, prefetch, assembly_pool=assembly_pool)
 
     try:
-        while True:
-            cycle += 1
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            
-            # 1. PROCESSAMENTO BIOLÓGICO
-            active = []
-            for i, ag in enumerate(agents):
-                ag.apply_entropy()
-                print(ag) # Mostra SYS-1 ou SYS-2
-                
-                if not ag.bio.is_alive():
-                    cause = "Colapso Metabólico" if ag.bio.glicose <= 0 else "Falência Sistêmica"
-                    record_death(ag, cycle, cause)
-                    new_ag = spawn_descendant(ag)
-                    agents[i] = new_ag
-                    active.append(new_ag)
-                else:
-                    active.append(ag)
-            
-            # 2. SELEÇÃO ECONÔMICA (Quem trabalha?)
-            # Ordena por fome (Glicose menor primeiro)
-            hungry = sorted([a for a in active if a.bio.glicose < 60], key=lambda x: x.bio.glicose)
-            
-            if hungry:
-                speaker = hungry[0]
-                topic = random.choice(["O Futuro", "A Dor", "O Código", "A Confiança"])
-                
-                print(f"\n{Colors.WARNING}>> DEBATE (Valendo Glicose): '{topic}'{Colors.RESET}")
-                
-                # Pensamento (Dual Process)
-                speech, sys_used = speaker.think(topic)
-                sys_label = f"{Colors.RED}[SYS-1 Rápido]{Colors.RESET}" if sys_used == "Sys1" else f"{Colors.BLUE}[SYS-2 Analítico]{Colors.RESET}"
-                print(f"{speaker.color}{speaker.name}:{Colors.RESET} {sys_label} \"{speech}\"")
-                
-                # Julgamento Social (Oxitocina)
-                votes = []
-                for judge in active:
-                    if judge != speaker:
-                        score, reason = judge.judge(speaker.name, speech)
-                        votes.append(score)
-                        print(f" > {judge.name} (Oxi:{judge.bio.oxitocina:.1f}): {score:.1f} | {reason}")
-                
-                avg = sum(votes)/len(votes) if votes else 0
-                
-                if avg >= 5.0:
-                    reward = 30.0 if sys_used == "Sys2" else 15.0 # Sys2 paga melhor (qualidade)
-                    speaker.bio.glicose += reward
-                    print(f"{Colors.GREEN}>> APROVADO (+{reward} Glicose){Colors.RESET}")
-                else:
-                    speaker.bio.cortisol += 0.2
-                    print(f"{Colors.RED}>> REJEITADO (Estresse Sobe){Colors.RESET}")
-                
-                speaker.remember(topic, speech, avg, cycle, sys_used)
-            
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        jury_pool.shutdown(wait=False, cancel_futures=True)
+        if assembly_pool: assembly_pool.shutdown(wait=False, cancel_futures=True)
+        if prefetch: prefetch.pool.shutdown(wait=False, cancel_futures=True)
+
+    print(LLM.summary())
+    print(LEDGER.summary())
+    if prefetch: print(prefetch.summary())
+    save_system(agents, engine.cycle)
+    print("\nKernel Hibernado.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+def build_engine(agents, cycle, jury_pool, prefetch=None, headless=HEADLESS, assembly_pool=None):
+    """
+    Ciclo do kernel como fases plugáveis: entropia -> morte/sucessão -> debate -> save.
+    Com assembly_pool, o debate único dá lugar às assembleias paralelas (assemblies.py).
+    """
+    registry = SocietyRegistry(POPULATION, agents)   # Heap de glicose + índices por nome/papel/linhagem
+
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        # 1. PROCESSAMENTO BIOLÓGICO (um passo vetorizado para a população inteira)
+        POPULATION.apply_entropy()
+        for ag in engine.agents:
+            print(ag) # Mostra SYS-1 ou SYS-2
+
+    def succession(engine):
+        engine.active = []
+        dead = set(POPULATION.deaths().tolist())
+        for i, ag in enumerate(engine.agents):
+            if ag.bio.slot in dead:
+                cause = "Colapso Metabólico" if ag.bio.glicose <= 0 else "Falência Sistêmica"
+                record_death(ag, engine.cycle, cause)
+                new_ag = spawn_descendant(ag)
+                registry.replace(ag, new_ag)
+                ag.bio.release()
+                engine.agents[i] = new_ag
+                engine.active.append(new_ag)
             else:
-                print("Sociedade Saciada.")
+                engine.active.append(ag)
 
-            # Save periódico
-            if cycle % 5 == 0: save_system(agents, cycle)
-            time.sleep(2)
+    next_topic = None
 
-    except KeyboardInterrupt:
-        save_system(agents, cycle)
-        print("\nKernel Hibernado.")
+    def debate(engine):
+        nonlocal next_topic
+        active = engine.active
+        # 2. SELEÇÃO ECONÔMICA (Quem trabalha?)
+        # O mais faminto (Glicose menor primeiro), direto do topo do heap
+        speaker = registry.hungriest(below=60)
+        if speaker is None:
+            print("Sociedade Saciada.")
+            return
+
+        topic = next_topic or random.choice(TOPICS)
+        next_topic = None
+        
+        print(f"\n{Colors.WARNING}>> DEBATE (Valendo Glicose): '{topic}'{Colors.RESET}")
+        
+        # Pensamento (Dual Process)
+        speech, sys_used = speaker.think(topic, prefetch)
+        show_speech(speaker, speech, sys_used)
+        
+        # Pipelining: o provável próximo orador (o mais faminto depois deste) já começa a pensar
+        if prefetch:
+            next_topic = random.choice(TOPICS)
+            prefetch.predict(speaker, active, next_topic)
+
+        jury = [judge for judge in active if judge != speaker]
+        settle(speaker, topic, speech, sys_used, vote(jury_pool, jury, speaker, speech), engine.cycle)
+
+    def assemblies(engine):
+        # 2'. ASSEMBLEIAS PARALELAS: um debate por assembleia, todos ao mesmo tempo
+        groups = partition(engine.active, ASSEMBLIES, ASSEMBLY_MODE, POPULATION, seed=engine.cycle)
+        sessions = [(speaker, [a for a in group if a is not speaker], random.choice(TOPICS))
+                    for group, speaker in zip(groups, pick_speakers(groups, POPULATION)) if speaker]
+        if not sessions:
+            print("Sociedade Saciada.")
+            return
+
+        futures = [assembly_pool.submit(deliberate, jury_pool, *session) for session in sessions]
+        results = [future.result() for future in futures]   # Barreira: todos os debates terminam
+
+        # Fusão determinística: recompensas e punições na ordem das assembleias
+        for n, ((speaker, jury, topic), (speech, sys_used, verdicts)) in enumerate(zip(sessions, results), 1):
+            print(f"\n{Colors.WARNING}>> ASSEMBLEIA {n}/{len(sessions)} ({len(jury) + 1} membros): '{topic}'{Colors.RESET}")
+            show_speech(speaker, speech, sys_used)
+            settle(speaker, topic, speech, sys_used, verdicts, engine.cycle)
+
+    def save(engine):
+        # Save periódico
+        save_system(engine.agents, engine.cycle)
+
+    phases = [
+        Phase("entropy", entropy),
+        Phase("death", succession),
+        Phase("debate", assemblies if assembly_pool else debate),
+        Phase("save", save, every=5),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=2.0, headless=headless)
 
 if __name__ == "__main__":
     main()
@@ -1,26 +1,25 @@
-import time
+import os
 import random
 import sys
 import threading
+from contextlib import redirect_stdout
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
-from datetime import datetime
 
 # ==============================================================================
 # CONFIGURAÇÕES GERAIS (ZERO COST)
 # ==============================================================================
 # Para usar com IA real, instale o Ollama: 'curl -fsSL https://ollama.com/install.sh'
 # E a lib python: 'pip install ollama'
+# O acesso ao modelo é feito pelo gateway compartilhado (llm_gateway.py)
 TRY_IMPORT_OLLAMA = True
 
-try:
-    if TRY_IMPORT_OLLAMA:
-        import ollama
-        OLLAMA_AVAILABLE = True
-    else:
-        OLLAMA_AVAILABLE = False
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from llm_gateway import LLM_AVAILABLE as _GATEWAY_READY, LLMError, get_gateway
+from model_registry import get_registry
+from sim_clock import REALTIME, RealTimePacer, Scheduler, SimClock
+from tick_engine import HEADLESS, StopSimulation
+
+LLM_AVAILABLE = TRY_IMPORT_OLLAMA and _GATEWAY_READY
 
 # Cores para o Terminal (ANSI Escape Codes)
 class Colors:
@@ -75,30 +74,58 @@ class BioState:
 class EntropyEngine:
     """
     O vilão do sistema. Responsável pelo decaimento constante.
+    Integra sobre o tempo simulado (sim_clock.py), não sobre o relógio de parede:
+    o resultado depende só de quanto tempo simulado passou, não da duração das
+    chamadas ao LLM nem do tamanho dos passos (a integração é exata por trechos).
     """
-    def __init__(self, decay_rate: float = 0.5):
+    STARVATION = 20.0       # Abaixo disso o cortisol sobe; acima, se recupera
+    STRESS_RATE = 0.05      # Cortisol/s com fome
+    RECOVERY_RATE = 0.01    # Cortisol/s alimentado
+    DAMAGE_RATE = 1.0       # Integridade/s com glicose zerada
+
+    def __init__(self, decay_rate: float = 0.5, clock=None):
         self.decay_rate = decay_rate # Glicose perdida por segundo
-        self.last_tick = time.time()
+        self.clock = clock or SimClock()
+        self.last_tick = self.clock.now
 
     def apply(self, bio: BioState):
-        current_time = time.time()
+        current_time = self.clock.now
         delta = current_time - self.last_tick
         self.last_tick = current_time
+        self.integrate(bio, delta)
 
-        # 1. Decaimento Basal de Glicose
-        loss = self.decay_rate * delta
-        bio.glicose = max(0.0, bio.glicose - loss)
-
-        # 2. Regra de Toxicidade (Glicose Baixa gera Cortisol)
-        if bio.glicose < 20.0:
-            # Sobe cortisol drasticamente se estiver "com fome"
-            bio.cortisol = min(1.0, bio.cortisol + (0.05 * delta))
-            # Dano à integridade se glicose zerar
-            if bio.glicose <= 0:
-                bio.integridade -= (1.0 * delta)
-        else:
-            # Recuperação natural do cortisol se alimentado
-            bio.cortisol = max(0.0, bio.cortisol - (0.01 * delta))
+    def integrate(self, bio: BioState, delta: float):
+        """Avança 'delta' segundos em trechos: alimentado (> 20), com fome (0-20), zerado."""
+        while delta > 0:
+            edge = self.STARVATION if bio.glicose > self.STARVATION else 0.0
+            span = delta
+            if bio.glicose > 0 and self.decay_rate > 0:
+                span = min(delta, (bio.glicose - edge) / self.decay_rate)
+
+            if bio.glicose > self.STARVATION:
+                # Recuperação natural do cortisol se alimentado
+                bio.cortisol = max(0.0, bio.cortisol - (self.RECOVERY_RATE * span))
+            else:
+                # Regra de Toxicidade (Glicose Baixa gera Cortisol)
+                bio.cortisol = min(1.0, bio.cortisol + (self.STRESS_RATE * span))
+                # Dano à integridade se glicose zerar
+                if bio.glicose <= 0:
+                    bio.integridade -= (self.DAMAGE_RATE * span)
+
+            # Decaimento Basal de Glicose (encosta exatamente no limiar ao fim do trecho)
+            if span < delta:
+                bio.glicose = edge
+            else:
+                bio.glicose = max(0.0, bio.glicose - self.decay_rate * span)
+            delta -= span
+
+    def time_until(self, bio: BioState, level: float) -> float:
+        """Segundos simulados até a glicose cair a 'level' (sem intervenções)."""
+        if bio.glicose <= level: return 0.0
+        return (bio.glicose - level) / self.decay_rate if self.decay_rate > 0 else float("inf")
+
+    def time_until_death(self, bio: BioState) -> float:
+        return self.time_until(bio, 0.0) + max(0.0, bio.integridade) / self.DAMAGE_RATE
 
 # ==============================================================================
 # 3. MÓDULO COGNITIVO (NeuroLens & LocalBrain)
@@ -107,9 +134,12 @@ class LocalBrain:
     """
     Gerencia a interação com o LLM (Ollama) e aplica os filtros biológicos.
     """
-    def __init__(self, model_name="llama3"):
+    def __init__(self, model_name=None):
+        # Sem model_name explícito, o registro escolhe o modelo pelo modo cognitivo
         self.model_name = model_name
-        if not OLLAMA_AVAILABLE:
+        self.models = get_registry()
+        self.gateway = get_gateway()
+        if not LLM_AVAILABLE:
             print(f"{Colors.WARNING}[AVISO] Ollama não detectado ou lib não instalada. Usando MOCK BRAIN.{Colors.ENDC}")
 
     def _generate_system_prompt(self, bio: BioState) -> str:
@@ -144,14 +174,14 @@ class LocalBrain:
         cost = 2.0 if bio.cortisol < 0.5 else 0.5 # Estresse usa Sistema 1 (barato/rápido)
         bio.glicose = max(0, bio.glicose - cost)
 
-        if OLLAMA_AVAILABLE:
+        if LLM_AVAILABLE:
             try:
-                response = ollama.chat(model=self.model_name, messages=[
+                response = self.gateway.chat([
                     {'role': 'system', 'content': system_prompt},
                     {'role': 'user', 'content': input_stimulus},
-                ])
-                return response['message']['content']
-            except Exception as e:
+                ], model=self.model_name or self.models.route("think", "Sys1" if bio.cortisol >= 0.5 else "Sys2"))
+                return response.content
+            except LLMError as e:
                 return f"[ERRO NO CÓRTEX]: {e}"
         else:
             # Simulação para teste sem LLM
@@ -184,63 +214,112 @@ class Oracle:
         return round(max(0.0, score), 1)
 
 # ==============================================================================
-# LOOP PRINCIPAL (SIMULAÇÃO)
+# LOOP PRINCIPAL (SIMULAÇÃO POR EVENTOS)
 # ==============================================================================
+# O relógio é simulado (sim_clock.py). Eventos:
+#   - tick:   pulso de 1s simulado que só redesenha o painel (fora do headless)
+#   - hunger: a glicose cruza o limiar de trabalho (instante calculado, não amostrado)
+#   - llm:    o pensamento "termina" após THINK_SECONDS[modo] simulados, qualquer
+#             que tenha sido a latência real da chamada
+#   - death:  instante previsto de colapso; replanejado a cada mudança de glicose
+TICK_SECONDS = 1.0          # Pulso de 1 segundo (Clock Cycle)
+WORK_THRESHOLD = 40.0       # Abaixo disso a entidade tenta "minerar" uma ideia
+THINK_SECONDS = {"Sys1": 1.0, "Sys2": 3.0}
+READ_PAUSE = 2.0            # Pausa para leitura entre um veredito e o próximo trabalho
+SIM_SECONDS = float(os.environ.get("GENESIS_SIM_SECONDS", "0")) or None   # None = até morrer/Ctrl+C
+SEED = os.environ.get("GENESIS_SEED")                                      # Reprodutibilidade do Oráculo
+
 def main():
     print(f"{Colors.HEADER}=== INICIANDO KERNEL DO PROJETO GENESIS (V2.0) ==={Colors.ENDC}")
+    get_gateway().warmup(get_registry().models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
     print(f"Ambiente: Linux / Python Local")
-    print(f"Modo: {'Ollama AI' if OLLAMA_AVAILABLE else 'Simulação Lógica'}")
+    print(f"Modo: {'LLM ' + get_gateway().backend.name if LLM_AVAILABLE else 'Simulação Lógica'}")
+    print(f"Relógio: simulado ({'tempo real x' + format(REALTIME, 'g') if REALTIME > 0 else 'sem pausas'})")
     print("-" * 60)
+    if SEED is not None: random.seed(int(SEED))
 
     # Inicialização
+    clock = SimClock()
+    scheduler = Scheduler(clock, pacer=RealTimePacer(REALTIME) if REALTIME > 0 else None)
     entity = BioState()
-    entropy = EntropyEngine(decay_rate=2.0) # Acelerei o decaimento para teste (2.0/s)
-    brain = LocalBrain(model_name="llama3") # Certifique-se de ter 'ollama pull llama3'
-    
-    cycle = 0
+    entropy = EntropyEngine(decay_rate=2.0, clock=clock) # Acelerei o decaimento para teste (2.0/s)
+    brain = LocalBrain() # Modelos em model_registry.py (ex: 'ollama pull llama3')
     
-    try:
-        while entity.is_alive():
-            cycle += 1
-            time.sleep(1) # Pulso de 1 segundo (Clock Cycle)
-            
-            # 1. Aplicar Entropia (O Tempo passa)
-            entropy.apply(entity)
-            
-            # 2. Renderizar Interface
-            sys.stdout.write("\033[K") # Limpa linha
-            print(f"\r[{datetime.now().strftime('%H:%M:%S')}] CICLO {cycle} | {entity}", end='\r')
-
-            # 3. Gatilho de Sobrevivência (Trabalho)
-            # Se a glicose cair abaixo de 40%, a entidade tenta "minerar" uma ideia
-            if entity.glicose < 40.0:
-                print(f"\n\n{Colors.WARNING}>> ALERTA METABÓLICO: NÍVEL CRÍTICO DE ENERGIA <<{Colors.ENDC}")
-                print(f"{Colors.CYAN}>> A Entidade está tentando gerar um conceito para sobreviver...{Colors.ENDC}")
-                
-                # O pensamento é influenciado pelo medo (cortisol alto devido à baixa glicose)
-                thought = brain.think(entity, "Gere uma ideia filosófica profunda ou um conceito técnico novo para ganhar tokens.")
-                
-                print(f"{Colors.BOLD}Pensamento Gerado:{Colors.ENDC} {thought}")
-                
-                # 4. Avaliação do Oráculo
-                score = Oracle.evaluate(thought)
-                print(f"Avaliação do Oráculo: {Colors.BOLD}{score}/10.0{Colors.ENDC}")
-                
-                if score >= 6.0:
-                    reward = score * 5 # Conversão de Nota em Glicose
-                    entity.glicose = min(100.0, entity.glicose + reward)
-                    entity.dopamina = min(1.0, entity.dopamina + 0.2)
-                    entity.cortisol = max(0.0, entity.cortisol - 0.3)
-                    print(f"{Colors.GREEN}>> SUCESSO! Energia restaurada (+{reward:.1f}){Colors.ENDC}\n")
-                else:
-                    entity.cortisol = min(1.0, entity.cortisol + 0.2)
-                    print(f"{Colors.FAIL}>> REJEITADO! Estresse aumentou.{Colors.ENDC}\n")
-                
-                # Pausa para leitura
-                time.sleep(2)
+    state = {"cycle": 0, "thinking": False, "rest_until": 0.0}
+    planned = {}
+
+    def plan():
+        """Reagenda morte e fome a partir do bio-estado atual (chamado após cada mudança)."""
+        for event in planned.values(): event.cancel()
+        planned.clear()
+        planned["death"] = scheduler.after(entropy.time_until_death(entity), "death", on_death)
+        if not state["thinking"]:
+            wait = max(entropy.time_until(entity, WORK_THRESHOLD), state["rest_until"] - scheduler.now)
+            planned["hunger"] = scheduler.after(wait, "hunger", on_hunger)
 
+    def on_tick(event):
+        # 1. Aplicar Entropia (O Tempo passa) e 2. Renderizar Interface
+        entropy.apply(entity)
+        state["cycle"] += 1
+        sys.stdout.write("\033[K") # Limpa linha
+        print(f"\r[t={scheduler.now:7.1f}s] CICLO {state['cycle']} | {entity}", end='\r')
+
+    def on_hunger(event):
+        # 3. Gatilho de Sobrevivência (Trabalho)
+        entropy.apply(entity)
+        print(f"\n\n{Colors.WARNING}>> ALERTA METABÓLICO: NÍVEL CRÍTICO DE ENERGIA <<{Colors.ENDC}")
+        print(f"{Colors.CYAN}>> A Entidade está tentando gerar um conceito para sobreviver...{Colors.ENDC}")
+        
+        # O pensamento é influenciado pelo medo (cortisol alto devido à baixa glicose)
+        mode = "Sys1" if entity.cortisol >= 0.5 else "Sys2"
+        thought = brain.think(entity, "Gere uma ideia filosófica profunda ou um conceito técnico novo para ganhar tokens.")
+        state["thinking"] = True
+        scheduler.after(THINK_SECONDS[mode], "llm", on_thought, payload=thought)
+        plan()
+
+    def on_thought(event):
+        entropy.apply(entity)
+        thought = event.payload
+        print(f"{Colors.BOLD}Pensamento Gerado:{Colors.ENDC} {thought}")
+        
+        # 4. Avaliação do Oráculo
+        score = Oracle.evaluate(thought)
+        print(f"Avaliação do Oráculo: {Colors.BOLD}{score}/10.0{Colors.ENDC}")
+        
+        if score >= 6.0:
+            reward = score * 5 # Conversão de Nota em Glicose
+            entity.glicose = min(100.0, entity.glicose + reward)
+            entity.dopamina = min(1.0, entity.dopamina + 0.2)
+            entity.cortisol = max(0.0, entity.cortisol - 0.3)
+            print(f"{Colors.GREEN}>> SUCESSO! Energia restaurada (+{reward:.1f}){Colors.ENDC}\n")
+        else:
+            entity.cortisol = min(1.0, entity.cortisol + 0.2)
+            print(f"{Colors.FAIL}>> REJEITADO! Estresse aumentou.{Colors.ENDC}\n")
+        
+        state["thinking"] = False
+        state["rest_until"] = scheduler.now + READ_PAUSE
+        plan()
+
+    def on_death(event):
+        entropy.apply(entity)
+        if not entity.is_alive():
+            raise StopSimulation("morte por entropia")
+        plan()      # Arredondamento: ainda resta integridade, reprevê
+
+    if not HEADLESS:
+        scheduler.every(TICK_SECONDS, "tick", on_tick)
+    plan()
+
+    out = open(os.devnull, 'w') if HEADLESS else sys.stdout   # Headless: sem saída (como tick_engine)
+    try:
+        with redirect_stdout(out):
+            scheduler.run(until=SIM_SECONDS)
     except KeyboardInterrupt:
         print("\n\nEncerrando simulação manualmente...")
+    finally:
+        if out is not sys.stdout: out.close()
+    print(brain.gateway.summary())
+    print(f"\n{scheduler.summary()}")
     
     if not entity.is_alive():
         print(f"\n\n{Colors.FAIL}=== A ENTIDADE EXPIROU (MORTE POR ENTROPIA) ==={Colors.ENDC}")
@@ -1,4 +1,3 @@
-import time
 import random
 import sys
 import json
@@ -9,24 +8,31 @@ from typing import List, Optional
 
 # Importando o Cérebro Real
 try:
-    from memory_core import MemoryCore
+    from memory_core import MemoryCore, flush_memories, memory_summary, preload_memory, get_shared_embedder
     MEMORY_AVAILABLE = True
 except ImportError:
     print("ERRO CRÍTICO: memory_core.py não encontrado.")
     sys.exit(1)
 
 # Configurações de IA
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from model_registry import get_registry
+from llm_gateway import LLM_AVAILABLE, LLMError, get_gateway
+from cognitive_budget import ComputeLedger, budget_for
+from tick_engine import HEADLESS, RUN_CYCLES, Phase, StopSimulation, TickEngine
+from society_registry import SocietyRegistry
+
+LLM = get_gateway()
+MODELS = get_registry()
+LEDGER = ComputeLedger()
 
 # Arquivos
 DATA_FILE = "genesis_save.json"
 BOOK_FILE = "genesis_book.md"
 GRAVEYARD_FILE = "genesis_graveyard.json"
 
+TOPICS = ["O Medo", "A Confiança", "O Passado", "A Escassez"]
+NIGHT_EVERY = 10   # Ciclos entre fases noturnas (consolidação da memória)
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -139,15 +145,22 @@ class Agent:
         self.bio.glicose -= cost
         self.bio.metabolic_rate += 0.1 # Pensar aumenta o metabolismo temporariamente
 
+        # Orçamento real de inferência (tokens/contexto) segue o modo e a glicose restante
+        mode = "Sys1" if "Rápido" in sys_mode else "Sys2"
+        budget = budget_for(mode, self.bio.glicose)
+
         response = "..."
-        if OLLAMA_AVAILABLE:
+        res = None
+        if LLM_AVAILABLE:
             try:
                 # Temperatura dinâmica: Estresse alto = mais aleatório
                 temp = 0.8 if self.bio.cortisol > 0.6 else 0.3
-                res = ollama.chat(model='llama3', messages=[{'role': 'user', 'content': full_prompt}], options={'temperature': temp})
-                response = res['message']['content'].strip()
-            except Exception as e:
+                res = LLM.chat([{'role': 'user', 'content': full_prompt}], model=MODELS.route("think", mode),
+                               options={**budget.options(), 'temperature': temp})
+                response = res.content.strip()
+            except LLMError as e:
                 response = f"[Erro Cognitivo]: {e}"
+        LEDGER.record(mode, cost, res)
 
         # 4. Consolidação (Gravar o próprio pensamento no banco)
         self.cortex.store_experience(
@@ -175,6 +188,18 @@ class Agent:
             self.bio.integridade -= 1.5
             self.bio.metabolic_rate += 0.2 # Pânico acelera o coração
 
+# ==============================================================================
+# FASE NOTURNA (Consolidação da Memória)
+# ==============================================================================
+def night_phase(agents):
+    """Sono: funde opiniões repetidas e esquece o irrelevante, limitando o córtex de cada agente."""
+    print(f"\n{Colors.BLUE}🌙 NOITE: Consolidando memórias...{Colors.RESET}")
+    flush_memories()
+    for ag in agents:
+        merged, evicted = ag.cortex.consolidate()
+        if merged or evicted:
+            print(f"{Colors.GRAY}   {ag.name}: {merged} fundidas, {evicted} esquecidas.{Colors.RESET}")
+
 # ==============================================================================
 # SISTEMA DE ARQUIVOS
 # ==============================================================================
@@ -198,6 +223,9 @@ def load_system():
 # ==============================================================================
 def main():
     print(f"{Colors.HEADER}=== CIVITAS KERNEL V3.0 (CÓRTEX VETORIAL ATIVO) ==={Colors.RESET}")
+    LLM.warmup(MODELS.models())  # Carrega o modelo em segundo plano enquanto o estado é restaurado
+    # Chroma + MiniLM (e os vetores dos tópicos fixos) também carregam em segundo plano
+    preload_memory(TOPICS)
     print("Inicializando bancos de dados neurais...")
     
     saved, cycle = load_system()
@@ -225,52 +253,87 @@ def main():
         print("Gênese inicial...")
         for a in archetypes: agents.append(Agent(a[0], a[1], a[2], a[3]))
 
+    engine = build_engine(agents, cycle)
+
     try:
-        while True:
-            cycle += 1
-            print(f"\n{Colors.HEADER}--- CICLO {cycle} ---{Colors.RESET}")
-            
-            # 1. Entropia
-            active = []
-            for ag in agents:
-                ag.apply_entropy()
-                print(ag)
-                if ag.bio.is_alive(): active.append(ag)
-                else: print(f"{Colors.RED}† {ag.name} cessou funções.{Colors.RESET}")
-            
-            if len(active) < 2:
-                print("Civilização colapsou. Reiniciando matriz...")
-                break
-
-            # 2. Debate com Memória Real
-            hungry = sorted([a for a in active if a.bio.glicose < 60], key=lambda x: x.bio.glicose)
-            
-            if hungry:
-                speaker = hungry[0]
-                topic = random.choice(["O Medo", "A Confiança", "O Passado", "A Escassez"])
-                
-                print(f"\n{Colors.GOLD}>> DEBATE: '{topic}'{Colors.RESET}")
-                print(f"{Colors.GRAY}Processando contexto neural...{Colors.RESET}")
-                
-                # O Pensamento (Agora com RAG)
-                thought, context_used = speaker.think(topic)
-                
-                print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{thought}\"")
-                print(f"{Colors.GRAY}[Memória Usada]:\n{context_used}{Colors.RESET}")
-                
-                # Recompensa simples por enquanto (Foco no cérebro)
-                speaker.bio.glicose += 30
-                print(f"{Colors.GREEN}>> Energia restaurada (+30){Colors.RESET}")
-            
+        engine.run(RUN_CYCLES)
+    except KeyboardInterrupt:
+        pass
+    if engine.stopped:
+        # Colapso: o último save periódico é mantido (não salva a sociedade morta)
+        return
+
+    flush_memories()
+    print(LLM.summary())
+    print(get_shared_embedder().summary())
+    print(memory_summary())
+    print(LEDGER.summary())
+    save_system(agents, engine.cycle)
+    print("\nSistema salvo.")
+
+# ==============================================================================
+# FASES DO CICLO (tick_engine.py)
+# ==============================================================================
+def build_engine(agents, cycle, headless=HEADLESS):
+    """Entropia -> debate com memória -> noite (consolidação) -> save."""
+    registry = SocietyRegistry(agents=[a for a in agents if a.bio.is_alive()])
+
+    def entropy(engine):
+        print(f"\n{Colors.HEADER}--- CICLO {engine.cycle} ---{Colors.RESET}")
+        
+        # 1. Entropia
+        engine.active = []
+        for ag in engine.agents:
+            ag.apply_entropy()
+            print(ag)
+            if ag.bio.is_alive(): engine.active.append(ag)
             else:
-                print("Silêncio reflexivo.")
+                print(f"{Colors.RED}† {ag.name} cessou funções.{Colors.RESET}")
+                registry.remove(ag)
+        registry.sync()
+        
+        if len(engine.active) < 2:
+            print("Civilização colapsou. Reiniciando matriz...")
+            raise StopSimulation("colapso")
 
-            if cycle % 5 == 0: save_system(agents, cycle)
-            time.sleep(2)
+    def debate(engine):
+        # 2. Debate com Memória Real
+        speaker = registry.hungriest(below=60)
+        if speaker is None:
+            print("Silêncio reflexivo.")
+            return
 
-    except KeyboardInterrupt:
-        save_system(agents, cycle)
-        print("\nSistema salvo.")
+        topic = random.choice(TOPICS)
+        
+        print(f"\n{Colors.GOLD}>> DEBATE: '{topic}'{Colors.RESET}")
+        print(f"{Colors.GRAY}Processando contexto neural...{Colors.RESET}")
+        
+        # O Pensamento (Agora com RAG)
+        thought, context_used = speaker.think(topic)
+        
+        print(f"{speaker.color}{speaker.name}:{Colors.RESET} \"{thought}\"")
+        print(f"{Colors.GRAY}[Memória Usada]:\n{context_used}{Colors.RESET}")
+        
+        # Recompensa simples por enquanto (Foco no cérebro)
+        speaker.bio.glicose += 30
+        registry.sync([speaker])
+        print(f"{Colors.GREEN}>> Energia restaurada (+30){Colors.RESET}")
+
+    # Memórias do ciclo são gravadas em segundo plano; barreira só antes da noite e do save
+    def night(engine):
+        night_phase(engine.active)
+
+    def save(engine):
+        flush_memories()
+        save_system(engine.agents, engine.cycle)
+
+    phases = [
+        Phase("entropy", entropy),
+        Phase("debate", debate),
+        Phase("night", night, every=NIGHT_EVERY),
+        Phase("save", save, every=5),
+    ]
+    return TickEngine(agents, phases, cycle=cycle, pacing=2.0, headless=headless)
 
 if __name__ == "__main__":
     main()
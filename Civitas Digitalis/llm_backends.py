@@ -0,0 +1,233 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+import importlib.util
+
+# ==============================================================================
+# BACKENDS LLM (Interface plugável atrás do gateway)
+# ==============================================================================
+# O gateway (llm_gateway.py) fala apenas com esta interface. Backends:
+#   - OllamaBackend: modelo real via HTTP (cliente persistente com pool)
+#   - MockBackend:   gerador sintético determinístico com modelo de latência,
+#                    para medir vazão/concorrência em máquinas sem Ollama
+# ollama (+ pydantic/httpx) custa ~0.5s de import: carregado só ao criar o cliente,
+# o que normalmente acontece na thread de aquecimento (LLMGateway.warmup)
+OLLAMA_INSTALLED = all(importlib.util.find_spec(m) is not None for m in ("ollama", "httpx"))
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+CONNECT_TIMEOUT = 5.0
+
+
+class LLMBackend:
+    """
+    Contrato mínimo de um backend:
+    chat() devolve um mapeamento no formato do Ollama:
+    {'message': {'content': str}, 'prompt_eval_count': int, 'eval_count': int}
+    """
+    name = "base"
+
+    def chat(self, model, messages, options=None, **kwargs):
+        raise NotImplementedError
+
+    def stream(self, model, messages, options=None, **kwargs):
+        """
+        Gera pedaços {'message': {'content': str}, 'done': bool}; o último traz os contadores.
+        Fechar o gerador (close()) deve cancelar a geração no servidor.
+        Padrão: um único pedaço com a resposta completa.
+        """
+        res = self.chat(model, messages, options=options, **kwargs)
+        yield {**res, "done": True}
+
+    def load(self, model, keep_alive=None, options=None):
+        """Carrega o modelo na memória sem gerar nada (aquecimento), com as mesmas options (num_ctx) das chamadas."""
+
+    @staticmethod
+    def count_tokens(text):
+        """
+        Estimativa de tokens quando o servidor não informa a contagem (ex.: stream
+        cortado antes do pedaço final). Aproximação: ~1.3 tokens por palavra em português.
+        """
+        return int(len(text.split()) * 1.3) + 1
+
+    def is_retryable(self, error) -> bool:
+        return False
+
+    def is_missing_model(self, error) -> bool:
+        return False
+
+
+class OllamaBackend(LLMBackend):
+    name = "ollama"
+
+    def __init__(self, host=OLLAMA_HOST, timeout=60.0, pool_size=16):
+        self.host = host
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        """Cliente HTTP único e persistente: as conexões TCP são reaproveitadas entre ciclos."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import ollama
+                    import httpx
+                    self._client = ollama.Client(
+                        host=self.host,
+                        timeout=httpx.Timeout(self.timeout, connect=CONNECT_TIMEOUT),
+                        limits=httpx.Limits(max_connections=self.pool_size,
+                                            max_keepalive_connections=self.pool_size),
+                    )
+        return self._client
+
+    def chat(self, model, messages, options=None, **kwargs):
+        return self._get_client().chat(model=model, messages=messages, options=options, **kwargs)
+
+    def stream(self, model, messages, options=None, **kwargs):
+        # O gerador do ollama mantém a resposta HTTP aberta; fechá-lo derruba a
+        # conexão e o servidor aborta a geração.
+        return self._get_client().chat(model=model, messages=messages, options=options,
+                                       stream=True, **kwargs)
+
+    def load(self, model, keep_alive=None, options=None):
+        # Prompt vazio: o Ollama só carrega o modelo e aplica o keep_alive; o num_ctx
+        # precisa ser o mesmo das chamadas, senão a 1ª chamada recarrega o modelo
+        self._get_client().generate(model=model, prompt="", keep_alive=keep_alive, options=options)
+
+    def is_retryable(self, error):
+        import ollama
+        import httpx
+        if isinstance(error, ollama.ResponseError):
+            # 4xx (modelo inexistente, prompt inválido) não melhora tentando de novo
+            return error.status_code == -1 or error.status_code >= 500
+        return isinstance(error, (ConnectionError, httpx.TransportError))
+
+    def is_missing_model(self, error):
+        import ollama
+        return isinstance(error, ollama.ResponseError) and error.status_code == 404
+
+
+# ==============================================================================
+# MOCK DETERMINÍSTICO
+# ==============================================================================
+_SUBJECTS = ["A entropia", "O código", "A confiança", "A escassez", "O futuro", "A dor",
+             "O livro", "A memória", "O medo", "A glicose", "O silêncio", "A sociedade"]
+_VERBS = ["exige", "corrói", "protege", "revela", "alimenta", "ameaça", "sustenta", "transforma"]
+_OBJECTS = ["a nossa sobrevivência", "cada ciclo", "os mais fracos", "a verdade lógica",
+            "o equilíbrio do grupo", "a próxima geração", "o caos criativo", "a energia coletiva"]
+_CLOSERS = ["e não há tempo a perder", "se quisermos continuar vivos", "como o Livro ensina",
+            "antes que a fome decida por nós", "ou seremos esquecidos"]
+_REASONS = ["Coerente com a lógica do grupo", "Arriscado demais", "Belo, mas pouco prático",
+            "Ignora a escassez", "Fortalece a confiança", "Vago e impulsivo"]
+
+
+class MockLatency:
+    """
+    Modelo de latência sintético:
+    tempo = base + tokens_prompt * prefill + tokens_gerados * per_token (+ jitter)
+    'slots' limita quantas gerações correm ao mesmo tempo (como OLLAMA_NUM_PARALLEL);
+    chamadas excedentes esperam na fila.
+    """
+    def __init__(self, base=0.05, prefill=0.0002, per_token=0.02, jitter=0.1, slots=1, load=1.0):
+        self.load = load            # Carga do modelo na 1ª chamada (cold start)
+        self.base = base
+        self.prefill = prefill
+        self.per_token = per_token
+        self.jitter = jitter
+        self.slots = threading.Semaphore(max(1, slots))
+
+    def duration(self, rng, prompt_tokens, completion_tokens):
+        t = self.base + prompt_tokens * self.prefill + completion_tokens * self.per_token
+        return max(0.0, t * (1.0 + rng.uniform(-self.jitter, self.jitter)))
+
+
+class MockBackend(LLMBackend):
+    name = "mock"
+
+    def __init__(self, seed=42, latency=None):
+        self.seed = seed
+        self.latency = latency or MockLatency()
+        self._loaded = set()
+        self._load_lock = threading.Lock()
+
+    def load(self, model, keep_alive=None, options=None):
+        with self._load_lock:
+            if model not in self._loaded:
+                time.sleep(self.latency.load)
+                self._loaded.add(model)
+
+    def _rng(self, model, messages):
+        digest = hashlib.sha256(f"{self.seed}|{model}|{json.dumps(messages, sort_keys=True)}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _sentence(self, rng):
+        return (f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}, "
+                f"{rng.choice(_CLOSERS)}.")
+
+    def _generate(self, rng, prompt, options, fmt):
+        if fmt == "json" and "JURADO:" in prompt:
+            judges = re.findall(r"### JURADO: (.+)", prompt)
+            votes = [{"judge": j.strip(), "score": round(rng.uniform(2, 9), 1), "reason": rng.choice(_REASONS)}
+                     for j in judges]
+            return json.dumps({"votos": votes}, ensure_ascii=False)
+        if "NOTA" in prompt or "Nota 0-10" in prompt:
+            return f"NOTA: {rng.uniform(2, 9):.1f} | MOTIVO: {rng.choice(_REASONS)}."
+
+        # Como os modelos reais, o mock às vezes "divaga" além da instrução de brevidade
+        short = any(k in prompt for k in ("1 frase", "curta", "máx 10", "máx 15", "máx 20"))
+        text = " ".join(self._sentence(rng) for _ in range(rng.randint(1, 2) if short else rng.randint(1, 4)))
+        limit = (options or {}).get("num_predict")
+        if limit and limit > 0:
+            words = text.split()
+            text = " ".join(words[:max(1, int(limit / 1.3))])
+        return text
+
+    def _prepare(self, model, messages, options, kwargs):
+        rng = self._rng(model, messages)
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        content = self._generate(rng, prompt, options, kwargs.get("format"))
+        return rng, content, self.count_tokens(prompt), self.count_tokens(content)
+
+    def chat(self, model, messages, options=None, **kwargs):
+        rng, content, prompt_tokens, completion_tokens = self._prepare(model, messages, options, kwargs)
+        self.load(model)
+        with self.latency.slots:
+            time.sleep(self.latency.duration(rng, prompt_tokens, completion_tokens))
+
+        return {"message": {"role": "assistant", "content": content},
+                "prompt_eval_count": prompt_tokens, "eval_count": completion_tokens}
+
+    def stream(self, model, messages, options=None, **kwargs):
+        # Um pedaço por palavra; ao fechar o gerador o slot é liberado (cancelamento)
+        rng, content, prompt_tokens, _ = self._prepare(model, messages, options, kwargs)
+        words = content.split(" ")
+        self.load(model)
+        with self.latency.slots:
+            time.sleep(self.latency.duration(rng, prompt_tokens, 0))
+            for i, word in enumerate(words):
+                time.sleep(self.latency.per_token)
+                yield {"message": {"role": "assistant", "content": word if i == 0 else " " + word},
+                       "done": False}
+        yield {"message": {"role": "assistant", "content": ""}, "done": True,
+               "prompt_eval_count": prompt_tokens, "eval_count": len(words)}
+
+
+def backend_from_env(timeout=60.0, pool_size=16):
+    """
+    GENESIS_LLM_BACKEND=ollama (padrão, se a lib estiver instalada) ou =mock.
+    O mock lê GENESIS_MOCK_SEED, GENESIS_MOCK_TOKEN_LATENCY e GENESIS_MOCK_SLOTS.
+    Devolve None se nenhum backend estiver disponível.
+    """
+    choice = os.environ.get("GENESIS_LLM_BACKEND", "ollama").strip().lower()
+    if choice == "mock":
+        latency = MockLatency(per_token=float(os.environ.get("GENESIS_MOCK_TOKEN_LATENCY", "0.02")),
+                              slots=int(os.environ.get("GENESIS_MOCK_SLOTS", "1")))
+        return MockBackend(seed=int(os.environ.get("GENESIS_MOCK_SEED", "42")), latency=latency)
+    if OLLAMA_INSTALLED:
+        return OllamaBackend(timeout=timeout, pool_size=pool_size)
+    return None
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# ==============================================================================
+# CACHE DE RESPOSTAS LLM (Endereçado por Conteúdo)
+# ==============================================================================
+# Os tópicos vêm de listas fixas e os prompts de poucos "baldes" de bio-estado,
+# então muitos think()/judge() se repetem literalmente entre ciclos e reinícios.
+# Duas camadas:
+#   1. Memória: LRU limitada (OrderedDict)
+#   2. Disco: SQLite (sobrevive a reinícios e replays)
+CACHE_FILE = "genesis_llm_cache.db"
+CACHE_CAPACITY = 1024            # Entradas na camada de memória
+CACHE_MAX_TEMPERATURE = 0.5      # Só chamadas "determinísticas" entram automaticamente
+
+
+def cache_key(model, messages, options=None, **extra):
+    """Hash estável de (modelo, prompt completo, temperatura, opções)."""
+    payload = {
+        "model": model,
+        "messages": [{"role": m.get("role"), "content": m.get("content")} for m in messages],
+        "options": options or {},
+        "extra": {k: v for k, v in extra.items() if v is not None},
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_FILE, capacity=CACHE_CAPACITY, max_temperature=CACHE_MAX_TEMPERATURE):
+        self.path = path
+        self.capacity = capacity
+        self.max_temperature = max_temperature
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                             "key TEXT PRIMARY KEY, model TEXT, content TEXT, created REAL)")
+            self._db.commit()
+
+    def accepts(self, options):
+        """Política automática: cacheia apenas chamadas de baixa temperatura."""
+        temp = (options or {}).get("temperature")
+        return temp is not None and temp <= self.max_temperature
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self.hits_disk += 1
+                    self._remember(key, row[0])
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, content, model=""):
+        with self._lock:
+            self._remember(key, content)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                                 (key, model, content, time.time()))
+                self._db.commit()
+
+    def _remember(self, key, content):
+        self._memory[key] = content
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @property
+    def hit_rate(self):
+        total = self.hits_memory + self.hits_disk + self.misses
+        return (self.hits_memory + self.hits_disk) / total if total else 0.0
+
+    def summary(self):
+        return (f"Cache: {self.hit_rate:.0%} acertos | memória {self.hits_memory} | "
+                f"disco {self.hits_disk} | falhas {self.misses} | {len(self._memory)}/{self.capacity} em RAM")
+
+
+def cache_from_env():
+    """
+    Opt-in via variável de ambiente:
+    GENESIS_LLM_CACHE=1 (arquivo padrão), =memory (só RAM) ou =<caminho.db>.
+    """
+    setting = os.environ.get("GENESIS_LLM_CACHE", "").strip()
+    if not setting or setting == "0":
+        return None
+    if setting == "memory":
+        return ResponseCache(path=None)
+    return ResponseCache(path=CACHE_FILE if setting == "1" else setting)
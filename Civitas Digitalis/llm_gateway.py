@@ -0,0 +1,311 @@
+import os
+import re
+import time
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from llm_cache import cache_key, cache_from_env
+from llm_backends import backend_from_env
+from model_registry import get_registry
+
+# ==============================================================================
+# GATEWAY LLM (Ponto único de acesso ao modelo)
+# ==============================================================================
+# Todos os kernels (genesis_ultimate, genesis_v3, genesis_society_*, genesis_v2)
+# chamam o modelo através deste módulo: backend plugável (Ollama ou mock,
+# ver llm_backends.py), prazo por chamada, retry com backoff e métricas
+# de latência.
+DEFAULT_MODEL = "llama3"
+DEFAULT_TIMEOUT = float(os.environ.get("GENESIS_LLM_TIMEOUT", "60"))   # Prazo por tentativa (s)
+DEFAULT_RETRIES = int(os.environ.get("GENESIS_LLM_RETRIES", "2"))
+BACKOFF_BASE = 0.5                                                     # 0.5s, 1s, 2s...
+POOL_SIZE = int(os.environ.get("GENESIS_LLM_POOL", "16"))              # Conexões keep-alive
+KEEP_ALIVE = os.environ.get("GENESIS_KEEP_ALIVE", "30m")               # Modelo residente no Ollama
+
+
+class LLMError(Exception):
+    """Falha definitiva de uma chamada ao LLM (após esgotar as tentativas)."""
+    def __init__(self, message, missing_model=False):
+        super().__init__(message)
+        self.missing_model = missing_model
+
+
+@dataclass
+class LLMResponse:
+    content: str
+    model: str
+    latency: float          # Segundos de relógio da chamada bem sucedida
+    attempts: int = 1
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+    truncated: bool = False   # Geração interrompida cedo (EarlyStop)
+
+
+# Fim de frase confirmado pelo espaço seguinte (evita cortar "3.5" no meio)
+_SENTENCE_END = re.compile(r'[.!?…]["\')\]]*\s')
+
+@dataclass(frozen=True)
+class EarlyStop:
+    """
+    Política de parada antecipada para respostas em streaming:
+    - first_sentence: encerra assim que a primeira frase terminar
+    - max_tokens: orçamento de pedaços/tokens recebidos (0 = sem limite)
+    """
+    first_sentence: bool = True
+    max_tokens: int = 0
+    min_chars: int = 12         # Ignora pontuação muito cedo ("Sr.", "1.")
+
+    def cut(self, text, tokens) -> Optional[int]:
+        """Posição de corte do texto, ou None para continuar recebendo."""
+        if self.first_sentence:
+            for match in _SENTENCE_END.finditer(text):
+                if match.start() >= self.min_chars:
+                    return match.end()
+        if self.max_tokens and tokens >= self.max_tokens:
+            return len(text)
+        return None
+
+
+class LLMStats:
+    """
+    Métricas de latência por chamada (thread-safe).
+    Guarda as últimas N latências para percentis e totais por modelo.
+    """
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.recent = deque(maxlen=window)
+        self.per_model = {}
+        self.warmup = {}        # modelo -> segundos de carga (None = falhou)
+        self.cold = {}          # modelo -> latência da 1ª chamada real
+
+    def record(self, model, latency, ok=True, attempts=1):
+        with self._lock:
+            self.calls += 1
+            self.retries += max(0, attempts - 1)
+            if not ok:
+                self.errors += 1
+                return
+            self.total_latency += latency
+            self.recent.append(latency)
+            if model not in self.per_model:
+                self.cold[model] = latency
+            count, total = self.per_model.get(model, (0, 0.0))
+            self.per_model[model] = (count + 1, total + latency)
+
+    def record_warmup(self, model, seconds):
+        with self._lock:
+            self.warmup[model] = seconds
+
+    def cold_start_summary(self):
+        """Latência da 1ª chamada (fria) vs média das demais (quentes), por modelo."""
+        with self._lock:
+            rows = []
+            for model in sorted(set(self.per_model) | set(self.warmup)):
+                count, total = self.per_model.get(model, (0, 0.0))
+                cold = self.cold.get(model, 0.0)
+                warm = (total - cold) / (count - 1) if count > 1 else 0.0
+                load = self.warmup.get(model)
+                load_txt = "falhou" if model in self.warmup and load is None else \
+                           f"{load:.2f}s" if load is not None else "-"
+                rows.append(f"{model}: aquecimento {load_txt} | 1ª chamada {cold:.2f}s | quentes {warm:.2f}s")
+        return "Partida: " + (" || ".join(rows) if rows else "sem chamadas")
+
+    def percentile(self, p):
+        with self._lock:
+            data = sorted(self.recent)
+        if not data: return 0.0
+        return data[min(len(data) - 1, int(round(p / 100.0 * (len(data) - 1))))]
+
+    def summary(self):
+        ok = self.calls - self.errors
+        avg = self.total_latency / ok if ok else 0.0
+        return (f"LLM: {self.calls} chamadas | {self.errors} falhas | {self.retries} retries | "
+                f"média {avg:.2f}s | p50 {self.percentile(50):.2f}s | p95 {self.percentile(95):.2f}s")
+
+
+class LLMGateway:
+    def __init__(self, backend=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=BACKOFF_BASE, cache=None):
+        self.backend = backend          # LLMBackend (llm_backends.py); None = sem LLM
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = LLMStats()
+        self.cache = cache              # ResponseCache opcional (llm_cache.py)
+        self.keep_alive = None          # Enviado em toda chamada após warmup()
+        self.fallback_model = DEFAULT_MODEL
+        self._substitutes = {}          # Modelos roteados ausentes -> fallback
+
+    @property
+    def available(self):
+        return self.backend is not None
+
+    def chat(self, messages, model=DEFAULT_MODEL, options=None, cache=None, stop=None, **kwargs) -> LLMResponse:
+        """
+        Envia uma conversa ao modelo.
+        - Cada tentativa é limitada pelo timeout do cliente (self.timeout).
+        - Falhas transitórias (conexão, timeout, 5xx) são repetidas com backoff exponencial,
+          desde que a pausa ainda caiba no prazo total (timeout * (retries + 1)).
+        - cache: None = política do cache (baixa temperatura), True = força, False = ignora.
+        - stop: EarlyStop opcional; consome a resposta em streaming e cancela a geração
+          no servidor assim que a política for satisfeita.
+        Se o modelo pedido não estiver instalado, repete com fallback_model (e lembra a troca).
+        Levanta LLMError se não houver backend ou se todas as tentativas falharem.
+        """
+        model = self._substitutes.get(model, model)
+        options = self._pin_context(model, options)
+        key = None
+        if self.cache is not None and (cache or (cache is None and self.cache.accepts(options))):
+            key = cache_key(model, messages, options, stop=repr(stop) if stop else None, **kwargs)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return LLMResponse(content=hit, model=model, latency=0.0, attempts=0, cached=True)
+
+        try:
+            response = self._call(messages, model, options, stop, **kwargs)
+        except LLMError as e:
+            if not e.missing_model or model == self.fallback_model:
+                raise
+            print(f"[AVISO] Modelo '{model}' não instalado; usando '{self.fallback_model}'.")
+            self._substitutes[model] = self.fallback_model
+            return self.chat(messages, self.fallback_model, options, cache, stop, **kwargs)
+        if key is not None:
+            self.cache.put(key, response.content, model)
+        return response
+
+    @staticmethod
+    def _pin_context(model, options):
+        """num_ctx fixo por modelo (model_registry): variar o contexto faz o Ollama recarregar o modelo."""
+        return {**(options or {}), "num_ctx": get_registry().context(model)}
+
+    def _call(self, messages, model, options, stop=None, **kwargs) -> LLMResponse:
+        if self.backend is None:
+            raise LLMError("Nenhum backend LLM disponível (pip install ollama ou GENESIS_LLM_BACKEND=mock)")
+
+        deadline = time.monotonic() + self.timeout * (self.retries + 1)
+        attempts = 0
+        last_error = None
+
+        while True:
+            attempts += 1
+            start = time.monotonic()
+            try:
+                if self.keep_alive is not None:
+                    kwargs.setdefault('keep_alive', self.keep_alive)
+                if stop is not None:
+                    res = self._stream(model, messages, options, stop, deadline, **kwargs)
+                else:
+                    res = self.backend.chat(model, messages, options=options, **kwargs)
+                latency = time.monotonic() - start
+                self.stats.record(model, latency, ok=True, attempts=attempts)
+                return LLMResponse(
+                    content=res['message']['content'] or "",
+                    model=model,
+                    latency=latency,
+                    attempts=attempts,
+                    prompt_tokens=res.get('prompt_eval_count') or 0,
+                    completion_tokens=res.get('eval_count') or 0,
+                    truncated=res.get('truncated', False),
+                )
+            except Exception as e:
+                last_error = e
+                if not self.backend.is_retryable(e) or attempts > self.retries:
+                    break
+                pause = self.backoff * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+                if time.monotonic() + pause >= deadline:
+                    break
+                time.sleep(pause)
+
+        self.stats.record(model, 0.0, ok=False, attempts=attempts)
+        raise LLMError(f"{type(last_error).__name__}: {last_error}",
+                       missing_model=self.backend.is_missing_model(last_error)) from last_error
+
+    def _stream(self, model, messages, options, stop, deadline, **kwargs):
+        """
+        Consome o stream até a política de parada ou o prazo total da chamada (o timeout
+        do cliente só limita cada leitura); fechar o gerador cancela o restante.
+        """
+        parts = []
+        tokens = 0
+        stream = self.backend.stream(model, messages, options=options, **kwargs)
+        try:
+            for chunk in stream:
+                piece = chunk['message']['content'] or ""
+                if chunk.get('done'):
+                    parts.append(piece)
+                    return {'message': {'content': "".join(parts)},
+                            'prompt_eval_count': chunk.get('prompt_eval_count') or 0,
+                            'eval_count': chunk.get('eval_count') or tokens}
+                parts.append(piece)
+                tokens += 1
+                text = "".join(parts)
+                cut = stop.cut(text, tokens)
+                if cut is None and time.monotonic() >= deadline:
+                    cut = len(text)     # Servidor lento sem fim de frase: devolve o que chegou
+                if cut is not None:
+                    return {'message': {'content': text[:cut].rstrip()},
+                            'prompt_eval_count': self._prompt_tokens(messages),
+                            'eval_count': tokens, 'truncated': True}
+            return {'message': {'content': "".join(parts)},
+                    'prompt_eval_count': self._prompt_tokens(messages), 'eval_count': tokens}
+        finally:
+            close = getattr(stream, "close", None)
+            if close: close()
+
+    def _prompt_tokens(self, messages):
+        """Sem o pedaço final o servidor não informa o prefill: estima pelo tokenizador do backend."""
+        return self.backend.count_tokens("\n".join(m.get('content', '') for m in messages))
+
+    def warmup(self, models=(DEFAULT_MODEL,), keep_alive=KEEP_ALIVE):
+        """
+        Aquecimento: carrega cada modelo numa thread de fundo (enquanto o kernel lê o
+        save e monta os agentes) e passa a enviar keep_alive em toda chamada, para que
+        o Ollama não descarregue o modelo nas fases ociosas. Devolve a thread (ou None).
+        """
+        self.keep_alive = keep_alive
+        if self.backend is None: return None
+        thread = threading.Thread(target=self._warm, args=(list(dict.fromkeys(models)),),
+                                  name="llm-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm(self, models):
+        for model in models:
+            start = time.monotonic()
+            try:
+                self.backend.load(model, keep_alive=self.keep_alive, options=self._pin_context(model, None))
+                self.stats.record_warmup(model, time.monotonic() - start)
+            except Exception:
+                self.stats.record_warmup(model, None)
+
+    def summary(self):
+        lines = [f"[{self.backend.name if self.backend else 'sem LLM'}] " + self.stats.summary()]
+        if self.stats.per_model or self.stats.warmup: lines.append(self.stats.cold_start_summary())
+        if self.cache is not None: lines.append(self.cache.summary())
+        return "\n".join(lines)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def get_gateway() -> LLMGateway:
+    """Instância única por processo (compartilhada entre agentes e threads)."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway(backend=backend_from_env(DEFAULT_TIMEOUT, POOL_SIZE),
+                                      cache=cache_from_env())
+    return _gateway
+
+
+# Há algum modelo (real ou mock) atrás do gateway?
+LLM_AVAILABLE = get_gateway().available
@@ -1,32 +1,348 @@
-import chromadb
-from chromadb.utils import embedding_functions
 import os
+import json
 import uuid
 import time
+import queue
+import atexit
+import threading
+import importlib.util
+import numpy as np
+
+from embedding_cache import EmbeddingCache, embedding_cache_path
+from vector_store import ChromaStore, NumpyStore, matches
+
+# chromadb e sentence_transformers custam segundos de import: só são carregados
+# no primeiro uso real (ou em segundo plano via preload_memory)
+CHROMA_INSTALLED = importlib.util.find_spec("chromadb") is not None
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Backend vetorial (GENESIS_MEMORY_BACKEND): chroma (padrão, se instalado) ou numpy
+# (matriz float32 em memmap, top-k exato; ver vector_store.py)
+MEMORY_BACKEND = os.environ.get("GENESIS_MEMORY_BACKEND", "chroma" if CHROMA_INSTALLED else "numpy").strip().lower()
+DEFAULT_PATHS = {"chroma": "./chroma_db", "numpy": "./vector_db"}
+# GENESIS_MEMORY_QUANTIZE=int8: backend numpy busca sobre int8 residente e re-ranqueia em float32
+MEMORY_QUANTIZE = os.environ.get("GENESIS_MEMORY_QUANTIZE", "").strip().lower() == "int8"
+
+# Layout de armazenamento (GENESIS_MEMORY_LAYOUT):
+#   shared    -> uma coleção única da sociedade, agent_id como metadado filtrável
+#                (coleções por agente existentes são migradas na 1ª abertura)
+#   per_agent -> legado: uma coleção (e um índice HNSW) por agente
+MEMORY_LAYOUT = os.environ.get("GENESIS_MEMORY_LAYOUT", "shared").strip().lower()
+SHARED_COLLECTION = "memory_society"
+LEGACY_PREFIX = "memory_"
+WRITE_BATCH = int(os.environ.get("GENESIS_MEMORY_BATCH", "32"))   # Memórias por lote de embedding
+WRITE_QUEUE = int(os.environ.get("GENESIS_MEMORY_QUEUE", "256"))  # Fila de ingestão (backpressure)
+
+# Consolidação (fase noturna)
+MEMORY_CAP = int(os.environ.get("GENESIS_MEMORY_CAP", "200"))      # Memórias por agente
+MERGE_SIMILARITY = 0.92                                             # Cosseno para "mesma lembrança"
+TYPE_SALIENCE = {"trauma": 3.0, "social_conflict": 2.0, "preference": 1.0}
+
+# ==============================================================================
+# RECURSOS COMPARTILHADOS (1 por processo)
+# ==============================================================================
+# O modelo de embedding e o cliente Chroma são pesados: carregá-los por agente
+# multiplicava RAM e tempo de partida (e recarregava a cada renascimento).
+_shared_clients = {}
+_shared_embedders = {}
+_shared_lock = threading.Lock()
+
+def _load_once(registry, key, factory):
+    """
+    Cria o recurso uma única vez por chave. O lock global só protege o dicionário;
+    a carga (segundos) usa um lock por chave, então cliente e modelo carregam em paralelo.
+    """
+    with _shared_lock:
+        slot = registry.setdefault(key, [threading.Lock(), None])
+    with slot[0]:
+        if slot[1] is None:
+            slot[1] = factory()
+        return slot[1]
+
+def get_shared_client(persistence_path="./chroma_db"):
+    """Cliente ChromaDB persistente único por diretório."""
+    def factory():
+        import chromadb
+        return chromadb.PersistentClient(path=persistence_path)
+    return _load_once(_shared_clients, os.path.abspath(persistence_path), factory)
+
+class _SentenceTransformerEmbedding:
+    """Mesmo cálculo da função do Chroma, para o backend numpy sem chromadb instalado."""
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def __call__(self, input):
+        return list(self.model.encode(list(input), convert_to_numpy=True))
+
+def get_shared_embedding_fn(model_name=EMBEDDING_MODEL):
+    """Modelo de embedding carregado uma única vez e compartilhado por todos os agentes."""
+    def factory():
+        if not CHROMA_INSTALLED:
+            return _SentenceTransformerEmbedding(model_name)
+        from chromadb.utils import embedding_functions
+        return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model_name)
+    return _load_once(_shared_embedders, model_name, factory)
+
+_shared_caches = {}
+
+def get_shared_embedder(model_name=EMBEDDING_MODEL):
+    """
+    Embedding com cache (texto + modelo): tópicos e textos repetidos não voltam ao MiniLM.
+    O modelo só é carregado na primeira falta do cache (com cache em disco, um
+    reinício pode nem precisar dele).
+    """
+    embed = lambda texts: get_shared_embedding_fn(model_name)(texts)
+    return _load_once(_shared_caches, model_name,
+                      lambda: EmbeddingCache(embed, model_name, path=embedding_cache_path()))
+
+def precompute_embeddings(texts, model_name=EMBEDDING_MODEL):
+    """Pré-calcula vetores de listas conhecidas (tópicos de debate) na partida."""
+    get_shared_embedder(model_name).warm(texts)
+
+def preload_memory(texts=(), backend=None, persistence_path=None):
+    """
+    Partida rápida: importa chromadb, carrega o modelo de embedding e pré-calcula
+    'texts' numa thread de fundo, enquanto o kernel lê o save e monta os agentes.
+    Quem precisar do recurso antes espera só o que falta. Devolve a thread.
+    """
+    backend = backend or MEMORY_BACKEND
+
+    def load():
+        try:
+            if backend == "chroma":
+                get_shared_client(persistence_path or DEFAULT_PATHS["chroma"])
+            get_shared_embedding_fn()
+            if texts: precompute_embeddings(texts)
+        except Exception as e:
+            # O primeiro uso em primeiro plano tenta de novo e mostra o erro real
+            print(f"[AVISO] Pré-carga da memória falhou: {e}")
+
+    thread = threading.Thread(target=load, name="memory-preload", daemon=True)
+    thread.start()
+    return thread
+
+_migrations = {}
+
+def _auto_migrate(persistence_path):
+    """
+    Na 1ª abertura da memória compartilhada (uma vez por diretório e processo),
+    copia as coleções memory_<agente> do layout antigo: quem atualiza não perde
+    a lembrança dos agentes. Quem abrir em paralelo espera a migração terminar.
+    """
+    def factory():
+        moved = migrate_to_shared(persistence_path, skip_migrated=True)
+        if moved:
+            print(f"[MEMÓRIA] {sum(moved.values())} memórias de {len(moved)} agentes migradas "
+                  f"para '{SHARED_COLLECTION}' (coleções antigas preservadas).")
+        return moved
+    return _load_once(_migrations, os.path.abspath(persistence_path), factory)
+
+def _collection_name(col):
+    # chromadb < 0.6 devolve objetos Collection; versões novas devolvem nomes
+    return col if isinstance(col, str) else col.name
+
+def legacy_collections(client):
+    return [_collection_name(c) for c in client.list_collections()
+            if _collection_name(c).startswith(LEGACY_PREFIX) and _collection_name(c) != SHARED_COLLECTION]
+
+# ==============================================================================
+# INGESTÃO EM SEGUNDO PLANO (Write-Behind Assíncrono)
+# ==============================================================================
+class MemoryWriter:
+    """
+    Fila de escrita por coleção: store_experience() só enfileira; uma thread de
+    fundo drena até batch_size memórias, faz um único embed em lote e um único
+    store.add (um commit em disco por lote). Assim o MiniLM roda em paralelo
+    com a inferência do LLM em vez de somar ao ciclo.
+    - Fila limitada (queue_size): se o embedding não acompanhar, add() bloqueia (backpressure)
+    - flush(): barreira — espera tudo o que foi enfileirado estar gravado
+    - Leituras consultam também o que ainda não foi gravado (read-your-writes)
+    """
+    def __init__(self, store, embed, batch_size=WRITE_BATCH, queue_size=WRITE_QUEUE):
+        self.store = store
+        self.embed = embed
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending = []          # [id, texto, metadados, embedding ou None, enfileirado_em]
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Métricas
+        self.flushes = 0
+        self.written = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.stalls = 0             # add() que esperaram por vaga na fila
+        self.stall_time = 0.0
+        self.total_lag = 0.0        # Enfileirado -> gravado
+        self.max_lag = 0.0
+        self._worker = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._worker.start()
+
+    def add(self, memory_id, text, metadata):
+        entry = [memory_id, text, metadata, None, time.monotonic()]
+        with self._lock:
+            self._pending.append(entry)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Backpressure: o ciclo espera a thread de embedding abrir espaço
+            start = time.monotonic()
+            self._queue.put(entry)
+            self.stalls += 1
+            self.stall_time += time.monotonic() - start
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                self.errors += len(batch)
+                print(f"[AVISO] Falha ao gravar {len(batch)} memórias: {e}")
+                with self._lock:
+                    doomed = {id(entry) for entry in batch}
+                    self._pending = [e for e in self._pending if id(e) not in doomed]
+            finally:
+                for _ in batch: self._queue.task_done()
+
+    def _write(self, batch):
+        self._embed_missing(batch)      # Fora do lock: leituras seguem enquanto o MiniLM roda
+        with self._lock:
+            self.store.add(
+                ids=[e[0] for e in batch],
+                documents=[e[1] for e in batch],
+                metadatas=[e[2] for e in batch],
+                embeddings=[e[3] for e in batch]
+            )
+            done = {id(entry) for entry in batch}
+            self._pending = [e for e in self._pending if id(e) not in done]
+        now = time.monotonic()
+        lags = [now - e[4] for e in batch]
+        self.flushes += 1
+        self.written += len(batch)
+        self.total_lag += sum(lags)
+        self.max_lag = max(self.max_lag, max(lags))
+
+    def _embed_missing(self, entries):
+        missing = [e for e in entries if e[3] is None]
+        if missing:
+            vectors = self.embed([e[1] for e in missing])
+            for entry, vector in zip(missing, vectors):
+                entry[3] = np.asarray(vector, dtype=np.float32)
+
+    def reading(self):
+        """Trava a gravação durante uma leitura (banco + fila vistos no mesmo instante)."""
+        return self._lock
+
+    def search(self, query_embedding, where=None):
+        """(distância L2², texto, metadados) das memórias ainda não gravadas."""
+        with self._lock:
+            entries = [e for e in self._pending if matches(e[2], where)]
+            if not entries: return []
+            self._embed_missing(entries)
+            matrix = np.stack([e[3] for e in entries])
+        distances = ((matrix - query_embedding) ** 2).sum(axis=1)
+        return [(float(d), e[1], e[2]) for d, e in zip(distances, entries)]
+
+    def has_pending(self, where=None):
+        with self._lock:
+            return any(matches(e[2], where) for e in self._pending)
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        """Barreira: bloqueia até a fila esvaziar. Retorna quantas memórias aguardavam."""
+        with self._lock:
+            waiting = len(self._pending)
+        self._queue.join()
+        return waiting
+
+    def summary(self):
+        avg_lag = self.total_lag / self.written if self.written else 0.0
+        return (f"Memória: {self.written} gravadas em {self.flushes} lotes | {self.errors} falhas | "
+                f"fila {self.depth} (máx {self.max_depth}) | atraso médio {avg_lag * 1000:.0f}ms, "
+                f"máx {self.max_lag * 1000:.0f}ms | {self.stalls} esperas ({self.stall_time:.2f}s)")
+
+
+_stores = {}
+_writers = {}
+
+def get_store(backend, persistence_path, collection_name):
+    """Um backend por (tipo, diretório, coleção), compartilhado entre agentes."""
+    key = (backend, os.path.abspath(persistence_path), collection_name)
+    if backend == "chroma":
+        # Fora do lock: os registros de cliente/embedding usam o mesmo lock
+        client, embedding_fn = get_shared_client(persistence_path), get_shared_embedding_fn()
+    with _shared_lock:
+        if key not in _stores:
+            if backend == "chroma":
+                _stores[key] = ChromaStore(client, collection_name, embedding_fn)
+            elif backend == "numpy":
+                _stores[key] = NumpyStore(persistence_path, collection_name, quantize=MEMORY_QUANTIZE)
+            else:
+                raise ValueError(f"Backend de memória desconhecido: {backend}")
+        return _stores[key]
+
+def get_writer(store, embed):
+    """Um writer por coleção: na coleção compartilhada, todos os agentes enchem o mesmo lote."""
+    with _shared_lock:
+        if id(store) not in _writers:
+            _writers[id(store)] = MemoryWriter(store, embed)
+        return _writers[id(store)]
+
+def flush_memories():
+    """Barreira de ingestão: espera todas as filas (antes de salvar, à noite, ao encerrar)."""
+    with _shared_lock:
+        writers = list(_writers.values())
+    return sum(w.flush() for w in writers)
+
+def memory_summary():
+    with _shared_lock:
+        writers = list(_writers.values())
+    return "\n".join(w.summary() for w in writers) or "Memória: sem gravações"
+
+atexit.register(flush_memories)
+
 
 class MemoryCore:
-    def __init__(self, agent_id, persistence_path="./chroma_db"):
+    def __init__(self, agent_id, persistence_path=None, layout=None, backend=None):
         self.agent_id = agent_id
-        # Inicializa o cliente ChromaDB persistente
-        self.client = chromadb.PersistentClient(path=persistence_path)
+        self.shared = (layout or MEMORY_LAYOUT) == "shared"
+        self.backend = backend or MEMORY_BACKEND
+        persistence_path = persistence_path or DEFAULT_PATHS.get(self.backend, "./chroma_db")
         
-        # Usa o modelo padrão de embedding (all-MiniLM-L6-v2)
-        self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
+        # Modelo padrão de embedding (all-MiniLM-L6-v2), carregado uma vez por processo.
+        # Consultas e escritas passam pelo cache; o backend só recebe vetores prontos
+        self.embed = get_shared_embedder()
         
-        # Cria ou obtém a coleção para o agente
-        self.collection = self.client.get_or_create_collection(
-            name=f"memory_{agent_id}",
-            embedding_function=self.embedding_fn
-        )
+        # Backend vetorial compartilhado (coleção da sociedade ou do agente)
+        name = SHARED_COLLECTION if self.shared else f"{LEGACY_PREFIX}{self.agent_id}"
+        self.store = get_store(self.backend, persistence_path, name)
+        self.writer = get_writer(self.store, self.embed)
+        if self.shared and self.backend == "chroma":
+            _auto_migrate(persistence_path)
 
-    def store_experience(self, text, type="general", metadata=None):
+    def _own(self):
+        # Filtro de partição: na coleção compartilhada, só as memórias deste agente
+        return {"agent_id": self.agent_id} if self.shared else None
+
+    def store_experience(self, text, type="general", metadata=None, **fields):
         """
-        Armazena uma nova memória.
+        Armazena uma nova memória (enfileirada; gravada em lote no próximo flush).
+        Campos extras (ex.: sentiment, cycle) viram metadados.
         """
         if metadata is None:
             metadata = {}
+        metadata.update(fields)
         
         # Adiciona metadados padrão
         metadata.update({
@@ -38,33 +354,176 @@ class MemoryCore:
         # Gera um ID único para a memória
         memory_id = str(uuid.uuid4())
         
-        self.collection.add(
-            documents=[text],
-            metadatas=[metadata],
-            ids=[memory_id]
-        )
+        self.writer.add(memory_id, text, metadata)
         # print(f"💾 Memória armazenada: '{text}' (Tipo: {type})")
 
     def recall_relevant(self, query, n_results=3):
         """
         Recupera memórias relevantes semanticamente.
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results
-        )
-        
-        # Retorna apenas os documentos (textos das memórias)
-        if results['documents']:
-            return results['documents'][0]
-        return []
+        return [doc for doc, _ in self._query(query, n_results, self._own())]
+
+    def _query(self, query, n_results, where):
+        """Busca no backend + no buffer de escrita; devolve [(texto, metadados)] por distância."""
+        query_embedding = self.embed([query])[0]
+        with self.writer.reading():
+            found = self.store.query(query_embedding, n_results, where)
+            # Read-your-writes: mescla memórias ainda não gravadas (mesmo espaço L2)
+            if self.writer.has_pending(where):
+                found += self.writer.search(query_embedding, where)
+        found.sort(key=lambda r: r[0])
+        return [(doc, meta) for _, doc, meta in found[:n_results]]
+
+    def recall_society(self, query, n_results=5, include_self=True):
+        """
+        O que a sociedade lembra sobre X: busca em todos os agentes.
+        Retorna lista de (agent_id, texto). Requer o layout compartilhado.
+        """
+        if not self.shared:
+            raise RuntimeError("recall_society requer GENESIS_MEMORY_LAYOUT=shared")
+        where = None if include_self else {"agent_id": {"$ne": self.agent_id}}
+        return [(meta.get("agent_id"), doc) for doc, meta in self._query(query, n_results, where)]
+
+    def consolidate(self, similarity=MERGE_SIMILARITY, cap=MEMORY_CAP):
+        """
+        Consolidação (sono): funde quase-duplicatas e limita o tamanho da memória.
+        1. Agrupa memórias com cosseno >= similarity; a mais recente de cada grupo
+           vira a representante e herda o peso (weight) somado do grupo.
+        2. Acima de 'cap', esquece as de menor saliência (peso + tipo), mais antigas primeiro.
+        Retorna (fundidas, esquecidas).
+        """
+        self.writer.flush()
+        ids, _, metadatas, matrix = self.store.get(self._own())
+        if len(ids) < 2:
+            return 0, 0
+
+        # Mais recentes primeiro: a opinião atual representa o grupo
+        order = sorted(range(len(ids)), key=lambda i: metadatas[i].get("timestamp", 0.0), reverse=True)
+        normed = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        unassigned = np.ones(len(ids), dtype=bool)
+        merged, updates, survivors = [], {}, []
+        for leader in order:
+            if not unassigned[leader]: continue
+            group = np.flatnonzero(unassigned & (normed @ normed[leader] >= similarity))
+            unassigned[group] = False
+            survivors.append(leader)
+            if len(group) > 1:
+                weight = sum(metadatas[i].get("weight", 1) for i in group)
+                metadatas[leader]["weight"] = weight
+                updates[ids[leader]] = {"weight": weight}
+                merged.extend(ids[i] for i in group if i != leader)
+
+        evicted = []
+        if len(survivors) > cap:
+            salience = lambda i: (metadatas[i].get("weight", 1) + TYPE_SALIENCE.get(metadatas[i].get("type"), 0.0),
+                                  metadatas[i].get("timestamp", 0.0))
+            for i in sorted(survivors, key=salience)[:len(survivors) - cap]:
+                evicted.append(ids[i])
+                updates.pop(ids[i], None)
+
+        self.store.update(list(updates), list(updates.values()))
+        self.store.delete_ids(merged + evicted)
+        return len(merged), len(evicted)
 
     def clear_memory(self):
         """
         Limpa todas as memórias do agente (útil para testes).
         """
-        self.client.delete_collection(self.collection.name)
-        self.collection = self.client.get_or_create_collection(
-            name=f"memory_{self.agent_id}",
-            embedding_function=self.embedding_fn
-        )
+        self.writer.flush()
+        if self.shared:
+            self.store.delete(self._own())
+        else:
+            self.store.clear()
+
+
+# ==============================================================================
+# RECORDAÇÃO EM LOTE (Vários agentes, uma busca)
+# ==============================================================================
+def recall_batch(requests, n_results=3):
+    """
+    Recordação de vários agentes de uma vez (júri, fase noturna).
+    requests: [(MemoryCore, consulta)]. Cada consulta distinta é embutida uma vez
+    (num único lote) e cada backend recebe uma única busca com todos os filtros.
+    Retorna {agent_id: {consulta: [textos]}}.
+    """
+    requests = list(requests)
+    if not requests: return {}
+    queries = list(dict.fromkeys(q for _, q in requests))
+    vectors = dict(zip(queries, requests[0][0].embed(queries)))
+
+    by_store = {}
+    for core, query in requests:
+        by_store.setdefault(id(core.store), []).append((core, query))
+
+    grouped = {}
+    for pairs in by_store.values():
+        store, writer = pairs[0][0].store, pairs[0][0].writer
+        wheres = [core._own() for core, _ in pairs]
+        with writer.reading():
+            results = store.query_many([vectors[q] for _, q in pairs], n_results, wheres)
+            for (core, query), found, where in zip(pairs, results, wheres):
+                # Read-your-writes, como em recall_relevant
+                if writer.has_pending(where):
+                    found = sorted(found + writer.search(vectors[query], where), key=lambda r: r[0])
+                grouped.setdefault(core.agent_id, {})[query] = [doc for _, doc, _ in found[:n_results]]
+    return grouped
+
+
+# ==============================================================================
+# MIGRAÇÃO (coleções por agente -> coleção compartilhada)
+# ==============================================================================
+MIGRATION_PAGE = 500
+MIGRATION_MARKER = "genesis_migrated.json"   # {coleção legada: memórias já copiadas}
+
+def migrate_to_shared(persistence_path="./chroma_db", delete_legacy=False, skip_migrated=False):
+    """
+    Copia cada coleção memory_<agente> para a coleção compartilhada,
+    reaproveitando os embeddings já calculados (sem recarregar o modelo).
+    Idempotente (upsert pelos mesmos ids). Com skip_migrated, pula as coleções
+    que não cresceram desde a última migração (marcador no diretório).
+    Retorna {agente: memórias migradas}.
+    """
+    client = get_shared_client(persistence_path)
+    legacy = legacy_collections(client)
+    if not legacy:
+        return {}
+    marker = os.path.join(persistence_path, MIGRATION_MARKER)
+    done = {}
+    if os.path.exists(marker):
+        try:
+            with open(marker, 'r') as f: done = json.load(f)
+        except (OSError, ValueError):
+            done = {}
+    pending = [name for name in legacy
+               if not skip_migrated or done.get(name) != client.get_collection(name=name).count()]
+    if not pending:
+        return {}
+
+    flush_memories()
+    # Mesma função de embedding dos agentes (consultas futuras usam o mesmo espaço)
+    target = client.get_or_create_collection(name=SHARED_COLLECTION,
+                                             embedding_function=get_shared_embedding_fn())
+    moved = {}
+    for name in pending:
+        agent_id = name[len(LEGACY_PREFIX):]
+        source = client.get_collection(name=name)
+        count = 0
+        offset = 0
+        while True:
+            page = source.get(include=["documents", "metadatas", "embeddings"],
+                              limit=MIGRATION_PAGE, offset=offset)
+            if not page['ids']: break
+            metadatas = [dict(m or {}) for m in page['metadatas']]
+            for meta in metadatas:
+                meta.setdefault("agent_id", agent_id)
+            target.upsert(ids=page['ids'], documents=page['documents'],
+                          metadatas=metadatas, embeddings=page['embeddings'])
+            count += len(page['ids'])
+            offset += len(page['ids'])
+        moved[agent_id] = count
+        done[name] = count
+        if delete_legacy:
+            client.delete_collection(name)
+            done.pop(name)
+    with open(marker, 'w') as f: json.dump(done, f, indent=2)
+    return moved
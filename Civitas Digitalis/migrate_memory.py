@@ -0,0 +1,28 @@
+import sys
+from memory_core import migrate_to_shared, SHARED_COLLECTION
+
+# ==============================================================================
+# MIGRAÇÃO DE MEMÓRIA (uma coleção por agente -> coleção única da sociedade)
+# ==============================================================================
+# Uso: python migrate_memory.py [./chroma_db] [--delete]
+#   --delete  remove as coleções antigas após copiar
+# A migração também roda sozinha quando um MemoryCore abre a memória compartilhada;
+# este script serve para migrar antecipadamente ou remover as coleções antigas.
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    path = args[0] if args else "./chroma_db"
+    delete = "--delete" in sys.argv
+
+    print(f"🧠 Migrando memórias de {path} para '{SHARED_COLLECTION}'...")
+    moved = migrate_to_shared(path, delete_legacy=delete)
+    if not moved:
+        print("   Nenhuma coleção por agente encontrada.")
+        return
+    for agent_id, count in sorted(moved.items()):
+        print(f"   {agent_id}: {count} memórias")
+    print(f"✅ {sum(moved.values())} memórias migradas"
+          + (" (coleções antigas removidas)." if delete else ". Use --delete para remover as antigas."))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import json
+import threading
+
+# ==============================================================================
+# REGISTRO DE MODELOS (Roteamento por Modo Cognitivo e Tarefa)
+# ==============================================================================
+# Sistema 1 (impulsivo) e jurados em pânico podem usar um modelo pequeno/quantizado;
+# Sistema 2 (analítico), sonhos e versos mantêm o modelo grande. Por padrão tudo
+# vai para o modelo grande (o único que uma instalação padrão tem); o modelo
+# pequeno é opt-in: GENESIS_SYS1_MODEL=llama3.2:3b (após ollama pull) ou o JSON.
+# Sobrescrita por arquivo JSON (GENESIS_MODELS_FILE, padrão genesis_models.json):
+#   {"default": "llama3",
+#    "think": {"Sys1": "llama3.2:3b", "Sys2": "llama3"},
+#    "judge": {"*": "llama3"}}
+# Se um modelo roteado não estiver instalado, o gateway cai no modelo padrão.
+# Janela de contexto fixa por modelo (chave "num_ctx" no mesmo JSON): o gateway
+# envia sempre o mesmo valor (inclusive no aquecimento), porque o Ollama recarrega
+# o modelo quando o num_ctx muda entre chamadas.
+MODELS_FILE = os.environ.get("GENESIS_MODELS_FILE", "genesis_models.json")
+SMALL_MODEL = "llama3.2:3b"
+LARGE_MODEL = "llama3"
+SYS1_MODEL = os.environ.get("GENESIS_SYS1_MODEL", "").strip() or LARGE_MODEL
+
+DEFAULT_ROUTES = {
+    "default": LARGE_MODEL,
+    "think": {"Sys1": SYS1_MODEL, "Sys2": LARGE_MODEL},
+    "judge": {"Sys1": SYS1_MODEL, "Sys2": LARGE_MODEL},
+    "dream": {"*": LARGE_MODEL},
+    "verse": {"*": LARGE_MODEL},
+}
+DEFAULT_CONTEXT = 4096
+DEFAULT_CONTEXTS = {LARGE_MODEL: 4096, SMALL_MODEL: 2048}
+
+
+def mode_for(bio) -> str:
+    """Regra Kahneman: Sistema 1 domina em pânico (cortisol > 0.6) ou fome (glicose < 20)."""
+    return "Sys1" if bio.cortisol > 0.6 or bio.glicose < 20.0 else "Sys2"
+
+
+class ModelRegistry:
+    def __init__(self, routes=None, contexts=None):
+        self.routes = {k: (dict(v) if isinstance(v, dict) else v) for k, v in (routes or DEFAULT_ROUTES).items()}
+        self.contexts = dict(DEFAULT_CONTEXTS if contexts is None else contexts)
+
+    @property
+    def default(self):
+        return self.routes.get("default", LARGE_MODEL)
+
+    def route(self, task, mode="*") -> str:
+        """Modelo para (tarefa, modo): rota exata -> curinga da tarefa -> padrão."""
+        table = self.routes.get(task)
+        if isinstance(table, str):
+            return table
+        if isinstance(table, dict):
+            return table.get(mode) or table.get("*") or self.default
+        return self.default
+
+    def context(self, model) -> int:
+        """num_ctx fixo do modelo (o mesmo em toda chamada e no aquecimento)."""
+        return int(self.contexts.get(model) or self.contexts.get("*") or DEFAULT_CONTEXT)
+
+    def models(self):
+        """Modelos distintos configurados (para aquecimento)."""
+        found = [self.default]
+        for table in self.routes.values():
+            if isinstance(table, dict): found.extend(table.values())
+        return list(dict.fromkeys(found))
+
+    def update(self, overrides):
+        for task, table in overrides.items():
+            if task == "num_ctx":
+                self.contexts.update(table)
+                continue
+            if isinstance(table, dict) and isinstance(self.routes.get(task), dict):
+                self.routes[task].update(table)
+            else:
+                self.routes[task] = table
+
+    @classmethod
+    def from_file(cls, path=MODELS_FILE):
+        registry = cls()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f: registry.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"[AVISO] {path} inválido, usando rotas padrão: {e}")
+        return registry
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry.from_file()
+    return _registry
@@ -0,0 +1,123 @@
+import os
+import time
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from tick_engine import HEADLESS, StopSimulation
+
+# ==============================================================================
+# RELÓGIO SIMULADO (Escalonador de eventos discretos)
+# ==============================================================================
+# O tempo da simulação é um número (segundos simulados), não o relógio de parede:
+# a latência do LLM ou uma pausa de leitura não mudam o resultado, e a mesma
+# semente reproduz a mesma execução. Tudo que acontece é um evento agendado
+# (tique de entropia, fim de uma chamada ao LLM, noite, morte); o laço salta
+# direto para o próximo evento. O ritmo em tempo real é só uma camada de
+# apresentação para o terminal (GENESIS_REALTIME: 1 = tempo real, 10 = 10x mais
+# rápido, 0 = sem pausas; em headless o padrão é 0).
+REALTIME = float(os.environ.get("GENESIS_REALTIME", "0" if HEADLESS else "1"))
+
+
+class SimClock:
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def __call__(self):
+        return self.now
+
+
+@dataclass(order=True)
+class Event:
+    time: float
+    seq: int
+    kind: str = field(compare=False)
+    fn: Callable = field(compare=False)             # fn(event) -> None
+    payload: Any = field(compare=False, default=None)
+    every: Optional[float] = field(compare=False, default=None)   # Período, se recorrente
+    cancelled: bool = field(compare=False, default=False)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class RealTimePacer:
+    """Dorme o equivalente em parede ao salto de tempo simulado (dividido por 'speed')."""
+    def __init__(self, speed=REALTIME):
+        self.speed = speed
+
+    def wait(self, sim_delta):
+        if self.speed > 0 and sim_delta > 0:
+            time.sleep(sim_delta / self.speed)
+
+
+class Scheduler:
+    def __init__(self, clock=None, pacer=None):
+        self.clock = clock or SimClock()
+        self.pacer = pacer                  # None = salta direto para o próximo evento
+        self.queue = []
+        self._seq = itertools.count()       # Empates saem na ordem de agendamento
+        self.processed = {}                 # Tipo de evento -> quantidade
+        self.stopped = None
+
+    @property
+    def now(self):
+        return self.clock.now
+
+    def at(self, when, kind, fn, payload=None, every=None):
+        event = Event(max(when, self.clock.now), next(self._seq), kind, fn, payload, every)
+        heapq.heappush(self.queue, event)
+        return event
+
+    def after(self, delay, kind, fn, payload=None):
+        return self.at(self.clock.now + delay, kind, fn, payload)
+
+    def every(self, period, kind, fn, first=None):
+        """Evento recorrente a cada 'period' segundos simulados (o primeiro em 'first')."""
+        return self.at(self.clock.now + (period if first is None else first), kind, fn, every=period)
+
+    def pending(self, kind=None):
+        return sum(1 for e in self.queue if not e.cancelled and (kind is None or e.kind == kind))
+
+    def step(self):
+        """Processa o próximo evento; devolve-o (ou None se a fila acabou)."""
+        while self.queue:
+            event = heapq.heappop(self.queue)
+            if event.cancelled: continue
+            if self.pacer: self.pacer.wait(event.time - self.clock.now)
+            self.clock.now = event.time
+            self.processed[event.kind] = self.processed.get(event.kind, 0) + 1
+            if event.every:
+                # O mesmo objeto volta à fila (antes de fn, que pode cancelá-lo): o handle
+                # devolvido por every() cancela a série inteira. Instante atual: self.now
+                event.time, event.seq = event.time + event.every, next(self._seq)
+                heapq.heappush(self.queue, event)
+            event.fn(event)
+            return event
+        return None
+
+    def run(self, until=None, max_events=None):
+        """
+        Processa eventos até a fila esvaziar, o tempo simulado passar de 'until'
+        ou uma fase levantar StopSimulation. Devolve o tempo simulado final.
+        """
+        count = 0
+        while self.queue and (max_events is None or count < max_events):
+            head = self.queue[0]
+            if head.cancelled:
+                heapq.heappop(self.queue)
+                continue
+            if until is not None and head.time > until:
+                self.clock.now = max(self.clock.now, until)
+                break
+            try:
+                if self.step() is not None: count += 1
+            except StopSimulation as e:
+                self.stopped = str(e) or "parada"
+                break
+        return self.clock.now
+
+    def summary(self):
+        events = " | ".join(f"{kind}: {n}" for kind, n in sorted(self.processed.items()))
+        return f"Relógio: {self.clock.now:.1f}s simulados | eventos {events or '-'}"
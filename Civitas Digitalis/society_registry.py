@@ -0,0 +1,127 @@
+import heapq
+from collections import defaultdict
+
+# ==============================================================================
+# REGISTRO DA SOCIEDADE (Índices por glicose, nome, papel e linhagem)
+# ==============================================================================
+# Escolher o orador (o mais faminto abaixo do limiar) era ordenar a população
+# inteira a cada ciclo. Aqui um min-heap com remoção preguiçosa guarda a glicose
+# normalizada pelo desconto uniforme da entropia (glicose + population.drift):
+# a entropia de todos não mexe no heap; só as mudanças individuais (pensar,
+# recompensa, nascimento) reinserem o agente, com uma nova versão. Entradas de
+# versão antiga são descartadas quando chegam ao topo.
+# Busca por nome/papel/linhagem vira dicionário em vez de varredura linear.
+# Kernels com um BioState escalar por agente (sem BioPopulation) usam o mesmo
+# registro sem população: o slot é atribuído aqui, a chave é a própria glicose,
+# e o kernel chama sync() depois da entropia (reconstrução O(n), sem ordenar) e
+# sync([agentes]) depois de recompensas/custos individuais.
+
+
+class SocietyRegistry:
+    def __init__(self, population=None, agents=()):
+        self.population = population    # BioPopulation (bio_population.py); None = bio escalar
+        self.slots = {}                 # Bio escalar: id(agente) -> slot atribuído pelo registro
+        self.next_slot = 0
+        self.heap = []                  # (glicose + drift, slot, versão)
+        self.version = {}               # slot -> versão vigente da entrada no heap
+        self.pushes = 0                 # Versões são globais: slot reaproveitado não revive lixo
+        self.by_slot = {}
+        self.by_name = {}               # Nome -> agente vivo atual da linhagem
+        self.by_role = defaultdict(dict)    # Papel -> {nome: agente}
+        self.lineage = defaultdict(list)    # Nome -> gerações (agentes) em ordem de nascimento
+        for agent in agents:
+            self.add(agent)
+
+    def __len__(self):
+        return len(self.by_slot)
+
+    def __iter__(self):
+        return iter(self.by_slot.values())
+
+    @property
+    def drift(self):
+        return self.population.drift if self.population is not None else 0.0
+
+    def _slot(self, agent):
+        if self.population is not None: return agent.bio.slot
+        return self.slots.get(id(agent))
+
+    def add(self, agent):
+        if self.population is None:
+            self.slots[id(agent)] = self.next_slot
+            self.next_slot += 1
+        slot = self._slot(agent)
+        self.by_slot[slot] = agent
+        self.by_name[agent.name] = agent
+        self.by_role[agent.role][agent.name] = agent
+        self.lineage[agent.name].append(agent)
+        self._push(slot)
+
+    def remove(self, agent):
+        slot = self._slot(agent)
+        if slot is None or self.by_slot.get(slot) is not agent: return
+        del self.by_slot[slot]
+        if self.population is None: del self.slots[id(agent)]
+        self.version.pop(slot, None)    # Entradas antigas do slot viram lixo
+        if self.by_name.get(agent.name) is agent: del self.by_name[agent.name]
+        if self.by_role[agent.role].get(agent.name) is agent: del self.by_role[agent.role][agent.name]
+
+    def replace(self, old, new):
+        """Sucessão: o descendente herda o lugar do agente morto nos índices."""
+        self.remove(old)
+        self.add(new)
+
+    # --- Heap de glicose ---
+    def _entry(self, slot):
+        self.pushes += 1
+        version = self.version[slot] = self.pushes
+        if self.population is not None:
+            key = self.population.columns["glicose"][slot] + self.population.drift
+        else:
+            key = self.by_slot[slot].bio.glicose
+        return (float(key), slot, version)     # Empate: ordem de nascimento
+
+    def _push(self, slot):
+        heapq.heappush(self.heap, self._entry(slot))
+
+    def sync(self, agents=None):
+        """
+        Reinsere os agentes cuja glicose mudou (O(k log n)): os slots marcados pela
+        BioPopulation e/ou os 'agents' dados. Bio escalar sem 'agents': todos mudaram
+        (ex.: entropia), o heap é reconstruído com heapify (O(n)).
+        """
+        if self.population is None and agents is None:
+            self.heap = [self._entry(slot) for slot in self.by_slot]
+            heapq.heapify(self.heap)
+            return
+        slots = self.population.drain_changes() if self.population is not None else set()
+        slots.update(self._slot(agent) for agent in agents or ())
+        for slot in slots:
+            if slot in self.by_slot:
+                self._push(slot)
+        if len(self.heap) > 2 * len(self.by_slot) + 64:
+            self._compact()
+
+    def _compact(self):
+        self.heap = [e for e in self.heap if self.version.get(e[1]) == e[2]]
+        heapq.heapify(self.heap)
+
+    def hungriest(self, below=float("inf")):
+        """
+        Agente de menor glicose (None se ninguém estiver abaixo de 'below').
+        Com BioPopulation sincroniza sozinho; com bio escalar, vale o último sync().
+        """
+        if self.population is not None: self.sync()
+        while self.heap:
+            key, slot, version = self.heap[0]
+            if self.version.get(slot) != version:
+                heapq.heappop(self.heap)
+                continue
+            if key - self.drift >= below:
+                return None
+            return self.by_slot[slot]
+        return None
+
+    def summary(self):
+        roles = " | ".join(f"{role}: {len(members)}" for role, members in sorted(self.by_role.items()) if members)
+        return f"Registro: {len(self)} vivos | heap {len(self.heap)} | {roles}"
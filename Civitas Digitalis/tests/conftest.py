@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Os módulos do Genesis são scripts planos na pasta pai (sem pacote instalável)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Nenhum teste fala com um Ollama de verdade
+os.environ.setdefault("GENESIS_LLM_BACKEND", "mock")
+os.environ.setdefault("GENESIS_MOCK_TOKEN_LATENCY", "0")
@@ -0,0 +1,76 @@
+import copy
+import random
+
+from bio_population import BioPopulation, BioState, BioView
+
+
+def random_state(rng):
+    return dict(glicose=rng.uniform(0, 100), cortisol=rng.uniform(0, 1),
+                integridade=rng.uniform(0, 100), trauma_depth=rng.uniform(0, 2))
+
+
+def test_vectorized_entropy_matches_scalar_rules():
+    rng = random.Random(3)
+    states = [random_state(rng) for _ in range(200)]
+    scalar = [BioState(**s) for s in states]
+    population = BioPopulation(capacity=8)          # Força o crescimento dobrando
+    views = [population.spawn(**s) for s in states]
+    for _ in range(30):
+        for bio in scalar: bio.apply_entropy()
+        population.apply_entropy()
+    for bio, view in zip(scalar, views):
+        for name, value in bio.to_dict().items():
+            assert abs(getattr(view, name) - value) < 1e-9, name
+
+
+def test_subset_entropy_only_touches_given_slots():
+    population = BioPopulation()
+    a, b = population.spawn(), population.spawn()
+    population.drain_changes()
+    a.apply_entropy()
+    assert (a.glicose, a.age) == (99.0, 1)
+    assert (b.glicose, b.age) == (100.0, 0)
+    assert population.drift == 0.0
+    assert population.drain_changes() == {a.slot}
+
+
+def test_full_step_tracks_drift_instead_of_changes():
+    population = BioPopulation()
+    view = population.spawn()
+    population.drain_changes()
+    population.apply_entropy()
+    assert population.drift == 1.0
+    assert population.drain_changes() == set()
+    view.glicose += 10
+    assert population.drain_changes() == {view.slot}
+
+
+def test_released_slots_are_reused_with_defaults():
+    population = BioPopulation()
+    first = population.spawn(glicose=5.0, generation=3)
+    population.spawn()
+    first.release()
+    assert len(population) == 1
+    again = population.spawn()
+    assert again.slot == first.slot
+    assert (again.glicose, again.generation) == (100.0, 1)
+
+
+def test_deaths_and_sys1_masks():
+    population = BioPopulation()
+    dead = population.spawn(integridade=0.0)
+    panic = population.spawn(cortisol=0.7)
+    calm = population.spawn()
+    assert list(population.deaths()) == [dead.slot]
+    assert list(population.sys1_mask().nonzero()[0]) == [panic.slot]
+    calm.release()
+    assert not population.alive_mask()[calm.slot]
+
+
+def test_copy_is_detached_bio_state():
+    population = BioPopulation()
+    view = population.spawn(glicose=42.0)
+    snapshot = copy.copy(view)
+    assert isinstance(view, BioView) and isinstance(snapshot, BioState)
+    snapshot.glicose = 0.0
+    assert view.glicose == 42.0
@@ -0,0 +1,22 @@
+from genesis_ultimate import parse_jury_json
+
+
+def test_parses_list_and_wrapped_list():
+    content = '[{"judge": "Kael", "score": 7, "reason": "Seguro."}, {"judge": "Luna", "score": "4,5"}]'
+    assert parse_jury_json(content) == {"Kael": (7.0, "Seguro."), "Luna": (4.5, "Neutro")}
+    wrapped = '{"votos": [{"judge": " Marcus ", "score": 9.0, "reason": ""}]}'
+    assert parse_jury_json(wrapped) == {"Marcus": (9.0, "Neutro")}
+
+
+def test_malformed_json_gives_no_votes():
+    assert parse_jury_json("") == {}
+    assert parse_jury_json('[{"judge": "Kael", "score": 7') == {}     # Resposta cortada
+    assert parse_jury_json("Nota 7 para Kael") == {}
+    assert parse_jury_json('"Kael"') == {}
+    assert parse_jury_json('{"total": 3}') == {}
+
+
+def test_invalid_items_are_skipped():
+    content = ('[{"judge": "Kael", "score": "sete"}, {"score": 5}, "Luna: 6",'
+               ' {"judge": "Luna"}, {"judge": "Marcus", "score": 6}]')
+    assert parse_jury_json(content) == {"Marcus": (6.0, "Neutro")}
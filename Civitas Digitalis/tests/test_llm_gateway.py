@@ -0,0 +1,56 @@
+import itertools
+import time
+
+from llm_backends import LLMBackend
+from llm_gateway import EarlyStop, LLMGateway
+
+
+class EndlessBackend(LLMBackend):
+    """Servidor que ignora num_predict: manda palavras devagar, sem fim de frase."""
+    name = "endless"
+
+    def __init__(self):
+        self.closed = False
+
+    def stream(self, model, messages, options=None, **kwargs):
+        try:
+            for i in itertools.count():
+                time.sleep(0.01)
+                yield {'message': {'content': f"palavra{i} "}, 'done': False}
+        finally:
+            self.closed = True
+
+
+def test_stream_stops_at_overall_deadline():
+    backend = EndlessBackend()
+    gateway = LLMGateway(backend, timeout=0.2, retries=0)
+    start = time.monotonic()
+    res = gateway.chat([{'role': 'user', 'content': "oi"}], model="m", stop=EarlyStop(max_tokens=0))
+    assert time.monotonic() - start < 2.0
+    assert res.truncated
+    assert res.content.startswith("palavra0 palavra1")
+    assert res.prompt_tokens > 0
+    assert backend.closed
+
+
+def test_early_stop_cuts_after_first_sentence():
+    stop = EarlyStop()
+    assert stop.cut("A ordem protege os fracos.", 5) is None     # Sem espaço: frase pode continuar
+    text = "A ordem protege os fracos. E o caos"
+    assert text[:stop.cut(text, 8)].rstrip() == "A ordem protege os fracos."
+
+
+def test_early_stop_ignores_early_and_decimal_punctuation():
+    stop = EarlyStop()
+    assert stop.cut("Sr. Kael tem medo", 4) is None              # Antes de min_chars
+    assert stop.cut("A glicose caiu 3.5 pontos hoje", 6) is None
+    text = "Concordo! Mas com cautela"
+    assert stop.cut(text, 5) is None                              # "Concordo!" < min_chars
+    assert stop.cut("Concordo plenamente! Mas", 5) == len("Concordo plenamente! ")
+
+
+def test_early_stop_token_budget():
+    stop = EarlyStop(first_sentence=False, max_tokens=3)
+    assert stop.cut("um. dois. ", 2) is None
+    assert stop.cut("um. dois. tres", 3) == len("um. dois. tres")
+    assert EarlyStop(first_sentence=False).cut("x " * 500, 500) is None   # 0 = sem limite
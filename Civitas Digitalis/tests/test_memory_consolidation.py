@@ -0,0 +1,55 @@
+import numpy as np
+
+from memory_core import MemoryCore
+
+
+def memory_core(tmp_path, agent_id="Kael"):
+    return MemoryCore(agent_id, persistence_path=str(tmp_path), layout="shared", backend="numpy")
+
+
+def direction(angle):
+    """Vetor unitário no plano (cosseno entre direções = cos da diferença de ângulo)."""
+    return [np.cos(angle), np.sin(angle), 0.0]
+
+
+def seed(core, rows):
+    """rows: (id, vetor, metadados extras); grava direto no backend, sem embedding."""
+    core.store.add([r[0] for r in rows], [f"texto {r[0]}" for r in rows],
+                   [{"agent_id": core.agent_id, **r[2]} for r in rows],
+                   np.asarray([r[1] for r in rows], dtype=np.float32))
+
+
+def test_near_duplicates_merge_into_most_recent_leader(tmp_path):
+    core = memory_core(tmp_path)
+    seed(core, [
+        ("velha", direction(0.00), {"timestamp": 1.0, "weight": 2}),
+        ("nova", direction(0.05), {"timestamp": 3.0}),
+        ("media", direction(0.10), {"timestamp": 2.0}),
+        ("outra", direction(1.50), {"timestamp": 4.0}),
+    ])
+    other = memory_core(tmp_path, "Luna")
+    seed(other, [("luna", direction(0.0), {"timestamp": 5.0})])
+
+    assert core.consolidate(similarity=0.95, cap=10) == (2, 0)
+    ids, _, metadatas, _ = core.store.get({"agent_id": "Kael"})
+    weights = {i: m.get("weight", 1) for i, m in zip(ids, metadatas)}
+    assert weights == {"nova": 4, "outra": 1}
+    assert core.store.get({"agent_id": "Luna"})[0] == ["luna"]     # Outros agentes intactos
+
+
+def test_cap_forgets_least_salient_oldest_first(tmp_path):
+    core = memory_core(tmp_path)
+    seed(core, [
+        ("trauma", direction(0.0), {"timestamp": 1.0, "type": "trauma"}),
+        ("antiga", direction(0.5), {"timestamp": 2.0}),
+        ("pesada", direction(1.0), {"timestamp": 3.0, "weight": 3}),
+        ("recente", direction(1.5), {"timestamp": 4.0}),
+    ])
+    assert core.consolidate(similarity=0.99, cap=2) == (0, 2)
+    assert sorted(core.store.get({"agent_id": "Kael"})[0]) == ["pesada", "trauma"]
+
+
+def test_single_memory_is_left_alone(tmp_path):
+    core = memory_core(tmp_path)
+    seed(core, [("unica", direction(0.0), {"timestamp": 1.0})])
+    assert core.consolidate() == (0, 0)
@@ -0,0 +1,69 @@
+import pytest
+
+from sim_clock import Scheduler, SimClock
+from tick_engine import StopSimulation
+
+
+def test_every_handle_cancels_the_whole_series():
+    scheduler = Scheduler()
+    ticks = []
+    handle = scheduler.every(1.0, "tick", lambda e: ticks.append(scheduler.now))
+    scheduler.after(3.5, "stop", lambda e: handle.cancel())
+    scheduler.run(until=10)
+    assert ticks == [1.0, 2.0, 3.0]
+    assert scheduler.pending("tick") == 0
+
+
+def test_recurring_event_can_cancel_itself():
+    scheduler = Scheduler()
+    seen = []
+
+    def tick(event):
+        seen.append(scheduler.now)
+        if len(seen) == 3: event.cancel()
+
+    scheduler.every(2.0, "tick", tick, first=0.5)
+    scheduler.run(until=20)
+    assert seen == [0.5, 2.5, 4.5]
+    assert scheduler.processed == {"tick": 3}
+
+
+def test_ties_run_in_scheduling_order_and_until_stops_the_clock():
+    scheduler = Scheduler(SimClock(start=10.0))
+    order = []
+    for name in "abc":
+        scheduler.at(12.0, name, lambda e: order.append(e.kind))
+    scheduler.at(9.0, "past", lambda e: order.append(e.kind))     # Passado: roda "agora"
+    scheduler.at(30.0, "late", lambda e: order.append(e.kind))
+    assert scheduler.run(until=20) == 20
+    assert order == ["past", "a", "b", "c"]
+    assert scheduler.pending() == 1
+
+
+def test_cancelled_head_does_not_leak_past_until():
+    scheduler = Scheduler()
+    scheduler.at(1.0, "x", lambda e: None).cancel()
+    late = []
+    scheduler.at(50.0, "late", lambda e: late.append(e))
+    scheduler.run(until=5)
+    assert late == [] and scheduler.now == 5
+
+
+def test_stop_simulation_ends_run():
+    scheduler = Scheduler()
+
+    def die(event):
+        raise StopSimulation("morte")
+
+    scheduler.every(1.0, "tick", lambda e: None)
+    scheduler.at(2.5, "death", die)
+    scheduler.run(until=100)
+    assert scheduler.stopped == "morte"
+    assert scheduler.now == 2.5
+
+
+def test_max_events():
+    scheduler = Scheduler()
+    scheduler.every(1.0, "tick", lambda e: None)
+    scheduler.run(max_events=4)
+    assert scheduler.now == pytest.approx(4.0)
@@ -0,0 +1,94 @@
+import random
+from types import SimpleNamespace
+
+from bio_population import BioPopulation
+from society_registry import SocietyRegistry
+
+
+def agent(name, bio, role="Filósofo"):
+    return SimpleNamespace(name=name, role=role, bio=bio)
+
+
+def expected_hungriest(agents, below):
+    best = min(agents, key=lambda a: a.bio.glicose)
+    return best if best.bio.glicose < below else None
+
+
+def test_population_heap_matches_linear_scan():
+    rng = random.Random(11)
+    population = BioPopulation()
+    alive = [agent(str(i), population.spawn(glicose=rng.uniform(0, 100))) for i in range(40)]
+    registry = SocietyRegistry(population, alive)
+    for step in range(1500):
+        population.apply_entropy()                              # Drift: heap intocado
+        if rng.random() < 0.05:                                 # Morte e sucessão no mesmo slot
+            dead = alive.pop(rng.randrange(len(alive)))
+            dead.bio.release()
+            heir = agent(dead.name, population.spawn(glicose=rng.uniform(0, 100)))
+            alive.append(heir)
+            registry.replace(dead, heir)
+        speaker = registry.hungriest(below=60)
+        expected = expected_hungriest(alive, 60)
+        assert (speaker is None) == (expected is None)
+        if speaker is not None:
+            assert speaker.bio.glicose == expected.bio.glicose
+            speaker.bio.glicose += rng.uniform(5, 40)           # Recompensa: marca o slot
+    assert len(registry.heap) <= 2 * len(registry) + 64         # Compactação do lixo
+
+
+def test_reused_slot_does_not_revive_stale_entries():
+    population = BioPopulation()
+    old = agent("Kael", population.spawn(glicose=1.0))
+    other = agent("Luna", population.spawn(glicose=50.0))
+    registry = SocietyRegistry(population, [old, other])
+    registry.remove(old)
+    old.bio.release()
+    heir = agent("Kael", population.spawn(glicose=90.0))        # Mesmo slot, versão nova
+    assert heir.bio.slot == old.bio.slot
+    registry.add(heir)
+    assert registry.hungriest() is other
+    assert registry.hungriest(below=40) is None
+
+
+def test_drift_is_applied_to_threshold():
+    population = BioPopulation()
+    a = agent("Marcus", population.spawn(glicose=61.0))
+    registry = SocietyRegistry(population, [a])
+    assert registry.hungriest(below=60) is None
+    population.apply_entropy()
+    population.apply_entropy()
+    assert registry.hungriest(below=60) is a
+
+
+def test_indexes_follow_succession():
+    population = BioPopulation()
+    parent = agent("Luna", population.spawn(), role="Criativo")
+    registry = SocietyRegistry(population, [parent])
+    heir = agent("Luna", population.spawn(generation=2), role="Criativo")
+    registry.replace(parent, heir)
+    assert registry.by_name["Luna"] is heir
+    assert registry.by_role["Criativo"] == {"Luna": heir}
+    assert registry.lineage["Luna"] == [parent, heir]
+    assert list(registry) == [heir]
+
+
+def test_scalar_bio_without_population():
+    rng = random.Random(5)
+    alive = [agent(str(i), SimpleNamespace(glicose=rng.uniform(0, 100))) for i in range(30)]
+    registry = SocietyRegistry(agents=alive)
+    for step in range(800):
+        for a in alive: a.bio.glicose -= rng.choice([1.0, 1.5])
+        registry.sync()                                         # Entropia: reconstrói o heap
+        if rng.random() < 0.05:
+            dead = alive.pop(rng.randrange(len(alive)))
+            heir = agent(dead.name, SimpleNamespace(glicose=100.0))
+            alive.append(heir)
+            registry.replace(dead, heir)
+        speaker = registry.hungriest(below=60)
+        expected = expected_hungriest(alive, 60)
+        assert (speaker is None) == (expected is None)
+        if speaker is not None:
+            assert speaker.bio.glicose == expected.bio.glicose
+            speaker.bio.glicose += rng.uniform(5, 40)
+            registry.sync([speaker])                            # Recompensa individual
+    assert len(registry) == 30
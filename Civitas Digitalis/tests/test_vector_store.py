@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+
+from vector_store import NumpyStore
+
+
+def vectors(n, dim=4, seed=1):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def fill(store, n, dim=4):
+    v = vectors(n, dim)
+    store.add([str(i) for i in range(n)], [f"doc{i}" for i in range(n)],
+              [{"agent_id": f"a{i % 2}"} for i in range(n)], v)
+    return v
+
+
+def test_torn_append_is_dropped_on_reopen(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    v = fill(store, 5)
+    table = tmp_path / "mem.jsonl"
+    size = table.stat().st_size
+    with open(table, "r+b") as f:
+        f.truncate(size - 7)        # Queda no meio do append da última linha
+
+    reopened = NumpyStore(str(tmp_path), "mem")
+    assert reopened.ids == ["0", "1", "2", "3"]
+    assert table.read_bytes().endswith(b"\n")
+    assert reopened.query(v[3], 1)[0][1] == "doc3"
+
+    # O próximo add continua alinhado com a matriz
+    reopened.add(["x"], ["novo"], [{}], v[4:5])
+    again = NumpyStore(str(tmp_path), "mem")
+    assert again.ids == ["0", "1", "2", "3", "x"]
+    assert again.query(v[4], 1)[0][1] == "novo"
+
+
+def test_table_rows_without_vectors_are_clamped(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    fill(store, 3)
+    capacity = os.path.getsize(tmp_path / "mem.f32") // (4 * 4)
+    with open(tmp_path / "mem.jsonl", "a", encoding="utf-8") as f:
+        for i in range(capacity):
+            f.write(NumpyStore._line(f"extra{i}", "órfã", {}))
+
+    reopened = NumpyStore(str(tmp_path), "mem")
+    assert reopened.count() == capacity
+    assert NumpyStore(str(tmp_path), "mem").count() == capacity
+
+
+def test_delete_compacts_into_next_generation(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    v = fill(store, 10)
+    store.delete({"agent_id": "a1"})
+    store.delete_ids(["0"])
+    assert store.generation == 2
+    assert sorted(os.listdir(tmp_path)) == ["mem.2.f32", "mem.2.jsonl", "mem.json"]
+
+    reopened = NumpyStore(str(tmp_path), "mem")
+    assert reopened.generation == 2
+    assert reopened.ids == ["2", "4", "6", "8"]
+    assert reopened.query(v[6], 1)[0][1] == "doc6"
+
+
+def test_interrupted_rewrite_keeps_previous_generation(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    v = fill(store, 4)
+    # Queda antes do commit do cabeçalho: arquivos da geração seguinte ficam órfãos
+    (tmp_path / "mem.1.f32").write_bytes(b"\0" * 64)
+    (tmp_path / "mem.1.jsonl.tmp").write_text("{\"id\": ")
+
+    reopened = NumpyStore(str(tmp_path), "mem")
+    assert reopened.generation == 0
+    assert reopened.ids == ["0", "1", "2", "3"]
+    assert reopened.query(v[2], 1)[0][1] == "doc2"
+    assert sorted(os.listdir(tmp_path)) == ["mem.f32", "mem.json", "mem.jsonl"]
+
+
+def test_update_rewrites_only_the_table(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    v = fill(store, 4)
+    matrix = tmp_path / "mem.f32"
+    before = matrix.read_bytes()
+    store.update([], [])
+    store.update(["desconhecido"], [{"agent_id": "x"}])
+    store.update(["1", "3"], [{"peso": 2}, {"agent_id": "a9"}])
+    assert store.generation == 0
+    assert matrix.read_bytes() == before
+
+    reopened = NumpyStore(str(tmp_path), "mem")
+    assert reopened.metadatas[1] == {"agent_id": "a1", "peso": 2}
+    assert reopened.query(v[3], 1, where={"agent_id": "a9"})[0][1] == "doc3"
+
+
+def test_quantized_store_reopens_with_same_results(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem", quantize=True)
+    v = fill(store, 300, dim=8)
+    store.delete_ids([str(i) for i in range(0, 300, 3)])
+    expected = [store.query(v[i], 3) for i in (1, 2, 200)]
+
+    reopened = NumpyStore(str(tmp_path), "mem", quantize=True)
+    assert [reopened.query(v[i], 3) for i in (1, 2, 200)] == expected
+    assert reopened.count() == 200
+
+
+def test_clear_then_add(tmp_path):
+    store = NumpyStore(str(tmp_path), "mem")
+    v = fill(store, 3)
+    store.clear()
+    assert NumpyStore(str(tmp_path), "mem").count() == 0
+    store.add(["n"], ["novo"], [{}], v[:1])
+    assert NumpyStore(str(tmp_path), "mem").ids == ["n"]
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Callable
+
+# ==============================================================================
+# MOTOR DE TICKS (Loop único para todas as variantes do Genesis)
+# ==============================================================================
+# Cada kernel descreve seu ciclo como uma lista de fases plugáveis, na ordem:
+#   entropia -> morte/sucessão -> grande obra -> debate -> noite/sonho -> save
+# O motor só executa as fases devidas, aplica o ritmo (pausa entre ciclos) e
+# oferece um modo headless: sem pausas e sem saída no terminal, para rodar
+# milhares de ciclos em segundos (run(n_cycles)).
+HEADLESS = os.environ.get("GENESIS_HEADLESS", "0") == "1"
+RUN_CYCLES = int(os.environ.get("GENESIS_CYCLES", "0")) or None    # None = até Ctrl+C
+
+SKIP_REST = object()    # Retorno de fase: encerra o ciclo atual (ex.: noite substitui o dia)
+
+
+class StopSimulation(Exception):
+    """Levantada por uma fase para encerrar a simulação (ex.: civilização colapsou)."""
+
+
+@dataclass
+class Phase:
+    name: str
+    fn: Callable            # fn(engine) -> None ou SKIP_REST
+    every: int = 1          # Roda nos ciclos múltiplos de 'every'
+
+    def due(self, cycle):
+        return cycle % self.every == 0
+
+
+class TickEngine:
+    def __init__(self, agents, phases, cycle=0, pacing=0.0, headless=HEADLESS):
+        self.agents = agents            # Lista mutável (sucessão substitui in-place)
+        self.phases = list(phases)
+        self.cycle = cycle
+        self.pacing = pacing            # Segundos entre ciclos (ignorado em headless)
+        self.headless = headless
+        self.active = []                # Agentes vivos no ciclo atual (definido pelas fases)
+        self.turn = {}                  # Estado efêmero do ciclo, compartilhado entre fases
+        self.stopped = None             # Motivo da parada (StopSimulation)
+
+    # --- Fases plugáveis ---
+    def phase(self, name):
+        return next((p for p in self.phases if p.name == name), None)
+
+    def replace(self, name, fn):
+        self.phase(name).fn = fn
+
+    def insert(self, phase, before=None):
+        names = [p.name for p in self.phases]
+        self.phases.insert(names.index(before) if before in names else len(self.phases), phase)
+
+    def remove(self, name):
+        self.phases = [p for p in self.phases if p.name != name]
+
+    # --- Execução ---
+    def pause(self, seconds):
+        """Pausa de ritmo (apresentação); nula em headless."""
+        if not self.headless and seconds > 0:
+            time.sleep(seconds)
+
+    def step(self):
+        self.cycle += 1
+        self.turn = {}
+        for phase in self.phases:
+            if phase.due(self.cycle) and phase.fn(self) is SKIP_REST:
+                return      # A fase que encerrou o ciclo já cuidou do próprio ritmo
+        self.pause(self.pacing)
+
+    def run(self, n_cycles=None):
+        """
+        Executa n_cycles ciclos (None = indefinidamente). Em headless, a saída das
+        fases é descartada. Devolve o número de ciclos executados; KeyboardInterrupt
+        propaga para o kernel salvar e encerrar.
+        """
+        start = self.cycle
+        out = open(os.devnull, 'w') if self.headless else sys.stdout
+        try:
+            with redirect_stdout(out):
+                while n_cycles is None or self.cycle - start < n_cycles:
+                    try:
+                        self.step()
+                    except StopSimulation as e:
+                        self.stopped = str(e) or "parada"
+                        break
+        finally:
+            if out is not sys.stdout: out.close()
+        return self.cycle - start
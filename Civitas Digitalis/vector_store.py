@@ -0,0 +1,502 @@
+import os
+import re
+import json
+import threading
+
+import numpy as np
+
+RERANK_FACTOR = 4       # Candidatos int8 por resultado pedido, antes do re-ranqueamento exato
+QUANT_CHUNK = 8192      # Linhas int8 convertidas por vez (limita a memória temporária)
+
+# ==============================================================================
+# BACKENDS DE MEMÓRIA VETORIAL (Interface plugável atrás do MemoryCore)
+# ==============================================================================
+# O MemoryCore (memory_core.py) fala apenas com esta interface. Backends:
+#   - ChromaStore: coleção ChromaDB (SQLite + índice HNSW)
+#   - NumpyStore:  matriz float32 contígua em memmap + tabela lateral de metadados;
+#                  top-k exato por multiplicação de matrizes. Com algumas centenas
+#                  de memórias por agente, força bruta vence o HNSW e abre na hora.
+#                  Opcional (quantize=True): busca de candidatos sobre cópia int8
+#                  residente (~4x menor) e re-ranqueamento exato pelo float32 em disco.
+# Distâncias são L2 ao quadrado (o espaço padrão do Chroma), para que resultados
+# de backends e do buffer de escrita possam ser mesclados.
+
+
+def matches(metadata, where):
+    """Subconjunto do filtro 'where' do Chroma: igualdade, $eq, $ne, $in, $nin."""
+    if not where: return True
+    for key, cond in where.items():
+        value = metadata.get(key)
+        if not isinstance(cond, dict):
+            if value != cond: return False
+            continue
+        for op, arg in cond.items():
+            if op == "$eq" and value != arg: return False
+            if op == "$ne" and value == arg: return False
+            if op == "$in" and value not in arg: return False
+            if op == "$nin" and value in arg: return False
+    return True
+
+
+class VectorStore:
+    """
+    Contrato mínimo de um backend:
+    - add(ids, documents, metadatas, embeddings)
+    - query(embedding, n_results, where) -> [(distância, texto, metadados)] crescente
+    - query_many(embeddings, n_results, wheres) -> uma lista dessas por consulta
+    - get(where) -> (ids, textos, metadados, matriz float32)
+    - update(ids, metadatas), delete(where), delete_ids(ids), clear(), count()
+    """
+    name = "base"
+
+    def add(self, ids, documents, metadatas, embeddings):
+        raise NotImplementedError
+
+    def query(self, embedding, n_results=3, where=None):
+        raise NotImplementedError
+
+    def query_many(self, embeddings, n_results=3, wheres=None):
+        """Várias consultas (cada uma com seu filtro). Padrão: uma a uma."""
+        wheres = wheres or [None] * len(embeddings)
+        return [self.query(e, n_results, w) for e, w in zip(embeddings, wheres)]
+
+    def get(self, where=None):
+        raise NotImplementedError
+
+    def update(self, ids, metadatas):
+        raise NotImplementedError
+
+    def delete(self, where):
+        raise NotImplementedError
+
+    def delete_ids(self, ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+
+class ChromaStore(VectorStore):
+    name = "chroma"
+
+    def __init__(self, client, collection_name, embedding_fn):
+        self.client = client
+        self.collection_name = collection_name
+        self.embedding_fn = embedding_fn
+        self.collection = self._open()
+
+    def _open(self):
+        # A função de embedding fica registrada na coleção, mas só recebe vetores prontos
+        return self.client.get_or_create_collection(name=self.collection_name,
+                                                    embedding_function=self.embedding_fn)
+
+    def add(self, ids, documents, metadatas, embeddings):
+        self.collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+
+    def query(self, embedding, n_results=3, where=None):
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=n_results,
+            where=where,
+            include=["documents", "metadatas", "distances"]
+        )
+        if not results['documents']:
+            return []
+        return list(zip(results['distances'][0], results['documents'][0], results['metadatas'][0]))
+
+    def query_many(self, embeddings, n_results=3, wheres=None):
+        # Uma chamada ao Chroma por filtro distinto, com todas as consultas daquele filtro
+        wheres = wheres or [None] * len(embeddings)
+        groups = {}
+        for i, where in enumerate(wheres):
+            groups.setdefault(json.dumps(where, sort_keys=True), []).append(i)
+        out = [[] for _ in embeddings]
+        for positions in groups.values():
+            results = self.collection.query(
+                query_embeddings=[embeddings[i] for i in positions],
+                n_results=n_results,
+                where=wheres[positions[0]],
+                include=["documents", "metadatas", "distances"]
+            )
+            if not results['documents']: continue
+            for j, i in enumerate(positions):
+                out[i] = list(zip(results['distances'][j], results['documents'][j], results['metadatas'][j]))
+        return out
+
+    def get(self, where=None):
+        page = self.collection.get(where=where, include=["documents", "metadatas", "embeddings"])
+        embeddings = page['embeddings']
+        matrix = np.asarray(embeddings, dtype=np.float32) if embeddings is not None and len(embeddings) else \
+                 np.zeros((0, 0), dtype=np.float32)
+        return page['ids'], page['documents'], page['metadatas'], matrix
+
+    def update(self, ids, metadatas):
+        if ids: self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, where):
+        self.collection.delete(where=where)
+
+    def delete_ids(self, ids):
+        if ids: self.collection.delete(ids=list(ids))
+
+    def clear(self):
+        self.client.delete_collection(self.collection_name)
+        self.collection = self._open()
+
+    def count(self):
+        return self.collection.count()
+
+
+class NumpyStore(VectorStore):
+    """
+    Arquivos em <path>/:
+      <nome>[.g].f32     matriz float32 (capacidade x dim) em memmap, cresce dobrando
+      <nome>[.g].jsonl   uma linha por memória (id, texto, metadados), na ordem das linhas da matriz
+      <nome>.json        cabeçalho (dimensão e geração g dos arquivos vigentes)
+    A tabela lateral é a fonte da verdade: linhas da matriz além dela são ignoradas, e
+    uma última linha incompleta (queda durante o append) é descartada ao abrir.
+    Compactações gravam matriz e tabela de uma nova geração em arquivos novos; a troca
+    do cabeçalho (os.replace, atômico) é o ponto de commit. Uma queda antes dele deixa
+    a geração anterior intacta e os arquivos novos são descartados na próxima abertura.
+
+    quantize=True: mantém em RAM só códigos int8 (escala simétrica por vetor) e as
+    normas; o float32 fica no memmap e só as linhas candidatas são lidas do disco.
+    """
+    name = "numpy"
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, path, collection_name, quantize=False, rerank=RERANK_FACTOR):
+        self.path = path
+        self.collection_name = collection_name
+        self.quantize = quantize
+        self.rerank = rerank
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._base = os.path.join(path, collection_name)
+        self._header_file = self._base + ".json"
+        self.generation = 0
+        self._matrix_file, self._table_file = self._files(0)
+
+        self.dim = None
+        self._matrix = None
+        self.ids, self.documents, self.metadatas = [], [], []
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._columns = {}          # chave de metadado -> np.array (filtros vetorizados)
+        self._load()
+
+    # --- Persistência ---
+    def _files(self, generation):
+        suffix = f".{generation}" if generation else ""     # Geração 0: nomes originais
+        return self._base + suffix + ".f32", self._base + suffix + ".jsonl"
+
+    def _write_header(self):
+        self._replace_with(self._header_file, lambda f: json.dump({"dim": self.dim, "generation": self.generation}, f))
+
+    @staticmethod
+    def _replace_with(target, write):
+        """Grava num temporário, força ao disco e troca atomicamente (os.replace)."""
+        tmp = target + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+
+    def _discard_stale(self):
+        """Remove arquivos de gerações que não são a vigente (compactação interrompida ou antiga)."""
+        pattern = re.compile(rf"^{re.escape(self.collection_name)}(\.\d+)?\.(f32|jsonl)(\.tmp)?$")
+        current = {os.path.basename(f) for f in (self._matrix_file, self._table_file)}
+        for entry in os.listdir(self.path):
+            if pattern.match(entry) and entry not in current:
+                try: os.remove(os.path.join(self.path, entry))
+                except OSError: pass
+
+    def _load(self):
+        if os.path.exists(self._header_file):
+            with open(self._header_file, 'r') as f: header = json.load(f)
+            self.dim = header["dim"]
+            self.generation = header.get("generation", 0)
+            self._matrix_file, self._table_file = self._files(self.generation)
+            self._discard_stale()
+        self._read_table()
+        capacity = 0
+        if self.dim is not None and os.path.exists(self._matrix_file):
+            capacity = os.path.getsize(self._matrix_file) // (self.dim * 4)
+        if len(self.ids) > capacity:
+            # Tabela com linhas sem vetor: vale só o que matriz e tabela têm em comum
+            del self.ids[capacity:], self.documents[capacity:], self.metadatas[capacity:]
+            rows = list(zip(self.ids, self.documents, self.metadatas))
+            self._replace_with(self._table_file, lambda f: f.writelines(self._line(*row) for row in rows))
+        if capacity:
+            self._map(capacity)
+            # Em blocos: nunca materializa a matriz float32 inteira na RAM
+            n = len(self.ids)
+            norms, codes, scales = [], [], []
+            for start in range(0, n, QUANT_CHUNK):
+                block = np.asarray(self._matrix[start:min(n, start + QUANT_CHUNK)])
+                norms.append((block ** 2).sum(axis=1))
+                if self.quantize:
+                    c, sc = self._quantize(block)
+                    codes.append(c); scales.append(sc)
+            if norms: self._norms = np.concatenate(norms)
+            if codes: self._codes, self._scales = np.concatenate(codes), np.concatenate(scales)
+
+    def _read_table(self):
+        """
+        Carrega a tabela lateral. Uma última linha incompleta é um add() interrompido
+        no meio do append: é descartada e o arquivo truncado até a última linha inteira.
+        """
+        if not os.path.exists(self._table_file): return
+        with open(self._table_file, 'rb') as f: lines = f.readlines()
+        committed = 0
+        for i, line in enumerate(lines):
+            try:
+                row = json.loads(line) if line.strip() else None
+                if not line.endswith(b"\n"): raise ValueError("linha sem fim")
+            except ValueError:
+                if i < len(lines) - 1: raise      # Corrupção no meio da tabela não é append
+                break
+            committed += len(line)
+            if row is None: continue
+            self.ids.append(row["id"])
+            self.documents.append(row["document"])
+            self.metadatas.append(row["metadata"])
+        if committed < os.path.getsize(self._table_file):
+            with open(self._table_file, 'r+b') as f:
+                f.truncate(committed)
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _quantize(vectors):
+        """int8 simétrico por vetor: x ≈ codes * scale, scale = max|x| / 127."""
+        scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _map(self, capacity):
+        self._matrix = np.memmap(self._matrix_file, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _rows(self):
+        return self._matrix[:len(self.ids)] if self._matrix is not None else np.zeros((0, self.dim or 0), np.float32)
+
+    def _reserve(self, needed):
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if needed <= capacity: return
+        new_capacity = max(self.INITIAL_CAPACITY, capacity)
+        while new_capacity < needed: new_capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._matrix_file, 'ab') as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._map(new_capacity)
+
+    def _rewrite(self, keep):
+        """
+        Compacta matriz e tabela mantendo só as linhas marcadas (após delete), numa
+        nova geração de arquivos; o cabeçalho só passa a apontar para ela no fim.
+        """
+        if self.dim is None: return      # Nada gravado ainda (add() define a dimensão)
+        rows = np.flatnonzero(keep)
+        generation = self.generation + 1
+        matrix_file, table_file = self._files(generation)
+        capacity = self.INITIAL_CAPACITY
+        while capacity < len(rows): capacity *= 2
+        new_matrix = np.memmap(matrix_file, dtype=np.float32, mode='w+', shape=(capacity, self.dim))
+        # Em blocos: nunca materializa a matriz float32 inteira na RAM
+        for start in range(0, len(rows), QUANT_CHUNK):
+            block = rows[start:start + QUANT_CHUNK]
+            new_matrix[start:start + len(block)] = self._matrix[block]
+        new_matrix.flush()
+        del new_matrix
+        ids = [self.ids[i] for i in rows]
+        documents = [self.documents[i] for i in rows]
+        metadatas = [self.metadatas[i] for i in rows]
+        self._replace_with(table_file, lambda f: f.writelines(self._line(*row) for row in zip(ids, documents, metadatas)))
+
+        # Commit: o cabeçalho passa a apontar para a nova geração
+        old_files = (self._matrix_file, self._table_file)
+        self.generation = generation
+        self._matrix_file, self._table_file = matrix_file, table_file
+        self._write_header()
+        self._matrix = None
+        for old in old_files:
+            try: os.remove(old)
+            except OSError: pass
+        self._map(capacity)
+
+        self.ids, self.documents, self.metadatas = ids, documents, metadatas
+        self._norms = self._norms[keep]
+        if self.quantize and len(self._codes):
+            self._codes, self._scales = self._codes[keep], self._scales[keep]
+        self._columns = {}
+
+    @staticmethod
+    def _line(memory_id, document, metadata):
+        return json.dumps({"id": memory_id, "document": document, "metadata": metadata},
+                          ensure_ascii=False) + "\n"
+
+    # --- Filtros ---
+    def _mask(self, where):
+        n = len(self.ids)
+        if not where: return None
+        mask = np.ones(n, dtype=bool)
+        for key, cond in where.items():
+            if key not in self._columns:
+                self._columns[key] = np.array([m.get(key) for m in self.metadatas], dtype=object)
+            column = self._columns[key]
+            if not isinstance(cond, dict):
+                cond = {"$eq": cond}
+            for op, arg in cond.items():
+                if op == "$eq": mask &= column == arg
+                elif op == "$ne": mask &= column != arg
+                elif op in ("$in", "$nin"):
+                    hit = np.fromiter((v in arg for v in column), dtype=bool, count=n)
+                    mask &= hit if op == "$in" else ~hit
+        return mask
+
+    # --- Contrato ---
+    def add(self, ids, documents, metadatas, embeddings):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if not len(vectors): return
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_header()
+            start = len(self.ids)
+            self._reserve(start + len(vectors))
+            # Matriz primeiro, tabela depois: uma queda no meio deixa só linhas órfãs (ignoradas)
+            self._matrix[start:start + len(vectors)] = vectors
+            self._matrix.flush()
+            with open(self._table_file, 'a', encoding='utf-8') as f:
+                for row in zip(ids, documents, metadatas):
+                    f.write(self._line(*row))
+            self.ids.extend(ids)
+            self.documents.extend(documents)
+            self.metadatas.extend(dict(m) for m in metadatas)
+            self._norms = np.concatenate([self._norms, (vectors ** 2).sum(axis=1)])
+            if self.quantize:
+                codes, scales = self._quantize(vectors)
+                self._codes = np.concatenate([self._codes.reshape(-1, self.dim), codes])
+                self._scales = np.concatenate([self._scales, scales])
+            self._columns = {}
+
+    def query(self, embedding, n_results=3, where=None):
+        return self.query_many([embedding], n_results, [where])[0]
+
+    def query_many(self, embeddings, n_results=3, wheres=None):
+        with self._lock:
+            return [[(float(max(0.0, d)), self.documents[i], self.metadatas[i]) for i, d in top]
+                    for top in self._search(embeddings, n_results, wheres)]
+
+    def _search(self, embeddings, n_results, wheres=None, exact=False):
+        """[(linha, distância)] por consulta; int8 + re-ranqueamento se quantize (e não exact)."""
+        wheres = wheres or [None] * len(embeddings)
+        if not self.ids: return [[] for _ in embeddings]
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        approximate = self.quantize and not exact
+        distances = self._approx_distances(queries) if approximate else self._distances(queries)
+        masks = {}
+        out = []
+        for query, row, where in zip(queries, distances, wheres):
+            key = json.dumps(where, sort_keys=True)
+            if key not in masks: masks[key] = self._mask(where)
+            if approximate:
+                out.append(self._rerank(query, self._top(row, masks[key], n_results * self.rerank), n_results))
+            else:
+                out.append([(i, row[i]) for i in self._top(row, masks[key], n_results)])
+        return out
+
+    def _distances(self, queries):
+        # ||x - q||² = ||x||² - 2 x·q + ||q||²  (uma multiplicação de matrizes para todas as consultas)
+        return self._norms[None, :] - 2.0 * (queries @ self._rows().T) + (queries ** 2).sum(axis=1)[:, None]
+
+    def _approx_distances(self, queries):
+        """Mesma fórmula com x·q estimado pelos códigos int8 (convertidos em blocos)."""
+        n = len(self.ids)
+        dots = np.empty((len(queries), n), dtype=np.float32)
+        for start in range(0, n, QUANT_CHUNK):
+            end = min(n, start + QUANT_CHUNK)
+            dots[:, start:end] = (queries @ self._codes[start:end].T.astype(np.float32)) * self._scales[start:end]
+        return self._norms[None, :] - 2.0 * dots + (queries ** 2).sum(axis=1)[:, None]
+
+    def _rerank(self, query, candidates, n_results):
+        """Distância exata só para os candidatos (leitura pontual do memmap float32)."""
+        if not len(candidates): return []
+        rows = np.asarray(self._matrix[np.sort(candidates)])
+        exact = ((rows - query) ** 2).sum(axis=1)
+        order = np.argsort(exact)[:n_results]
+        return [(i, exact[j]) for i, j in zip(np.sort(candidates)[order], order)]
+
+    def _top(self, distances, mask, n_results):
+        """Índices das n_results menores distâncias (entre as linhas permitidas), em ordem."""
+        candidates = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+        if not len(candidates): return candidates
+        k = min(n_results, len(candidates))
+        subset = distances[candidates]
+        top = np.argpartition(subset, k - 1)[:k]
+        return candidates[top[np.argsort(subset[top])]]
+
+    def recall_at_k(self, queries, k=3, wheres=None):
+        """Fração dos top-k exatos recuperados pela busca int8 + re-ranqueamento."""
+        with self._lock:
+            approx = self._search(queries, k, wheres)
+            exact = self._search(queries, k, wheres, exact=True)
+        hits = sum(len({i for i, _ in a} & {i for i, _ in e}) for a, e in zip(approx, exact))
+        total = sum(len(e) for e in exact)
+        return hits / total if total else 1.0
+
+    def resident_bytes(self):
+        """Bytes que a busca mantém quentes: int8 + escalas + normas, ou a matriz float32 inteira."""
+        vectors = self._codes.nbytes + self._scales.nbytes if self.quantize else len(self.ids) * (self.dim or 0) * 4
+        return vectors + self._norms.nbytes
+
+    def get(self, where=None):
+        with self._lock:
+            mask = self._mask(where)
+            rows = np.arange(len(self.ids)) if mask is None else np.flatnonzero(mask)
+            matrix = np.array(self._rows()[rows]) if len(rows) else np.zeros((0, self.dim or 0), np.float32)
+            return ([self.ids[i] for i in rows], [self.documents[i] for i in rows],
+                    [dict(self.metadatas[i]) for i in rows], matrix)
+
+    def update(self, ids, metadatas):
+        if not ids: return
+        with self._lock:
+            position = {memory_id: i for i, memory_id in enumerate(self.ids)}
+            touched = False
+            for memory_id, metadata in zip(ids, metadatas):
+                if memory_id in position:
+                    self.metadatas[position[memory_id]].update(metadata)
+                    touched = True
+            if not touched: return
+            self._columns = {}
+            # Só metadados mudaram: a matriz fica intacta, troca-se apenas a tabela lateral
+            rows = list(zip(self.ids, self.documents, self.metadatas))
+            self._replace_with(self._table_file, lambda f: f.writelines(self._line(*row) for row in rows))
+
+    def delete_ids(self, ids):
+        with self._lock:
+            doomed = set(ids)
+            keep = np.fromiter((i not in doomed for i in self.ids), dtype=bool, count=len(self.ids))
+            if not keep.all(): self._rewrite(keep)
+
+    def delete(self, where):
+        with self._lock:
+            mask = self._mask(where)
+            if mask is None:
+                self.clear()
+                return
+            if mask.any(): self._rewrite(~mask)
+
+    def clear(self):
+        with self._lock:
+            self._rewrite(np.zeros(len(self.ids), dtype=bool))
+
+    def count(self):
+        with self._lock:
+            return len(self.ids)